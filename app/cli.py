@@ -0,0 +1,141 @@
+"""
+Command line tools of the tickets database.
+
+Usage:
+    python -m app.cli import tickets.ndjson [--reject-duplicates] [--batch-size 1000]
+    cat tickets.ndjson | python -m app.cli import -
+    python -m app.cli rebuild-stats
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import AsyncIterator, BinaryIO, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Row
+
+from app.config.settings import TICKETS_IMPORT_BATCH_SIZE
+from app.crud import imports
+from app.db.schema import (
+    create_schema,
+    rebuild_ticket_counters,
+    rebuild_ticket_rollups,
+)
+from app.db.sqlite import close_sqlite_connection, create_sqlite_connection, database
+from app.schemas.tickets import TicketImportResponse
+
+READ_CHUNK_BYTES = 65536
+
+
+async def read_chunks(file: BinaryIO) -> AsyncIterator[bytes]:
+    # The blocking reads run in a thread, so the inserts don't wait for them
+    while chunk := await asyncio.to_thread(file.read, READ_CHUNK_BYTES):
+        yield chunk
+
+
+async def import_file(
+    file: BinaryIO,
+    reject_duplicates: bool = False,
+    batch_size: int = TICKETS_IMPORT_BATCH_SIZE,
+) -> TicketImportResponse:
+    """
+    Import the tickets of an NDJSON file (see imports.import_tickets).
+
+    Args:
+        file (BinaryIO): The NDJSON file, opened in binary mode.
+        reject_duplicates (bool): To reject the tickets whose title is used.
+        batch_size (int): The maximum number of tickets per transaction.
+
+    Returns:
+        TicketImportResponse: The import report.
+    """
+    async with database.async_session() as db:
+        return await imports.import_tickets(
+            db,
+            read_chunks(file),
+            reject_duplicates=reject_duplicates,
+            batch_size=batch_size,
+        )
+
+
+async def run_import(args: argparse.Namespace):
+    if args.file == "-":
+        result = await import_file(
+            sys.stdin.buffer, args.reject_duplicates, args.batch_size
+        )
+    else:
+        with open(args.file, "rb") as file:
+            result = await import_file(file, args.reject_duplicates, args.batch_size)
+    print(result.model_dump_json(indent=2))
+
+
+def rebuild_stats(connection: Connection) -> List[Row]:
+    """
+    Recompute the counters and the rollups of GET /tickets/stats from the tickets
+    (e.g. after writing the database with the triggers dropped). The rollups of
+    the deleted tickets are lost.
+
+    Returns:
+        List[Row]: The number of buckets and of created and closed tickets of
+        every period.
+    """
+    rebuild_ticket_counters(connection)
+    rebuild_ticket_rollups(connection)
+    return connection.execute(
+        text(
+            "SELECT period, count(*), sum(created), sum(closed) "
+            "FROM ticket_rollups GROUP BY period ORDER BY period"
+        )
+    ).all()
+
+
+async def run_rebuild_stats(args: argparse.Namespace):
+    async with database.engine.begin() as conn:
+        periods = await conn.run_sync(rebuild_stats)
+    for period, buckets, created, closed in periods:
+        print(f"{period}: {buckets} buckets, {created} created, {closed} closed")
+
+
+async def run(args: argparse.Namespace):
+    await create_sqlite_connection()
+    try:
+        async with database.engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        await args.command(args)
+    finally:
+        await close_sqlite_connection()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tickets database tools")
+    commands = parser.add_subparsers(required=True)
+
+    import_parser = commands.add_parser(
+        "import", help="Import tickets from an NDJSON file (one ticket per line)"
+    )
+    import_parser.add_argument("file", help="The NDJSON file, or - for stdin")
+    import_parser.add_argument(
+        "--reject-duplicates",
+        action="store_true",
+        help="Reject the tickets whose title is already used",
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=TICKETS_IMPORT_BATCH_SIZE,
+        help="Number of tickets inserted per transaction",
+    )
+    import_parser.set_defaults(command=run_import)
+
+    rebuild_parser = commands.add_parser(
+        "rebuild-stats",
+        help="Recompute the ticket counters and the rollups of GET /tickets/stats",
+    )
+    rebuild_parser.set_defaults(command=run_rebuild_stats)
+
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
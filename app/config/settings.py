@@ -20,3 +20,159 @@ def get_database_url():
 
 
 SQLITE_DATABASE_URL = get_database_url()
+
+# SQLite storage profiles: PRAGMAs executed on every new connection.
+# "default" keeps SQLite's built-in behaviour (rollback journal, full fsync).
+# "production" enables WAL so readers never block the writer, relaxes fsync to
+# checkpoints (synchronous=NORMAL is still durable across crashes in WAL mode),
+# waits on the write lock instead of failing with "database is locked", and
+# gives every connection a larger page cache and memory-mapped reads.
+SQLITE_STORAGE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def get_storage_profile():
+    profile_name = os.getenv("SQLITE_STORAGE_PROFILE", "production")
+    if profile_name not in SQLITE_STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown SQLITE_STORAGE_PROFILE: {profile_name}. "
+            f"Available profiles: {', '.join(SQLITE_STORAGE_PROFILES)}"
+        )
+    pragmas = dict(SQLITE_STORAGE_PROFILES[profile_name])
+    # Every PRAGMA can be overridden on its own, e.g. SQLITE_BUSY_TIMEOUT=10000
+    for pragma in SQLITE_STORAGE_PROFILES["production"]:
+        value = os.getenv(f"SQLITE_{pragma.upper()}")
+        if value is not None:
+            pragmas[pragma] = value
+    return pragmas
+
+
+SQLITE_PRAGMAS = get_storage_profile()
+
+
+def get_positive_int(name: str, default: str) -> int:
+    # A batch or chunk size below 1 would never finish a loop over the tickets
+    value = int(os.getenv(name, default))
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1, got {value}.")
+    return value
+
+
+# Pool of read-only connections to the database file. Writes always go through
+# a single serialized connection, since SQLite allows only one writer at a time.
+# (Both are ignored for the in-memory database, which shares one connection.)
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "5"))
+SQLITE_READ_MAX_OVERFLOW = int(os.getenv("SQLITE_READ_MAX_OVERFLOW", "10"))
+
+# Maximum number of tickets created by one POST /tickets/bulk request
+TICKETS_BULK_MAX_ITEMS = get_positive_int("TICKETS_BULK_MAX_ITEMS", "1000")
+
+# Number of tickets deleted per transaction by DELETE /tickets (the write lock
+# is released between batches, so the other writers can interleave)
+TICKETS_DELETE_BATCH_SIZE = get_positive_int("TICKETS_DELETE_BATCH_SIZE", "1000")
+
+# Number of finished background jobs (e.g. DELETE /tickets?run_async=true)
+# whose progress is kept in memory
+TICKETS_JOBS_HISTORY = int(os.getenv("TICKETS_JOBS_HISTORY", "100"))
+
+# Maximum number of ticket IDs resolved by one POST /tickets/batch-get request
+TICKETS_BATCH_GET_MAX_IDS = get_positive_int("TICKETS_BATCH_GET_MAX_IDS", "500")
+
+# Number of rows fetched from the database (and encoded) at a time by
+# GET /tickets/export, which streams the tickets in constant memory
+TICKETS_EXPORT_CHUNK_SIZE = get_positive_int("TICKETS_EXPORT_CHUNK_SIZE", "1000")
+
+# POST /tickets/import (and the import CLI): number of lines inserted per
+# transaction, maximum size of a line, and number of rejected lines reported
+TICKETS_IMPORT_BATCH_SIZE = get_positive_int("TICKETS_IMPORT_BATCH_SIZE", "1000")
+TICKETS_IMPORT_MAX_LINE_BYTES = get_positive_int(
+    "TICKETS_IMPORT_MAX_LINE_BYTES", "65536"
+)
+TICKETS_IMPORT_MAX_REJECTED = int(os.getenv("TICKETS_IMPORT_MAX_REJECTED", "100"))
+
+# In-process cache of the tickets read by GET /tickets/{ticket_id}: maximum
+# number of tickets (least recently used evicted first) and time to live
+TICKETS_CACHE_ENABLED = os.getenv("TICKETS_CACHE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TICKETS_CACHE_SIZE = int(os.getenv("TICKETS_CACHE_SIZE", "10000"))
+TICKETS_CACHE_TTL = float(os.getenv("TICKETS_CACHE_TTL", "60"))
+
+# Cache of the serialized GET /tickets/ pages, keyed by query parameters and
+# data version: maximum number of pages, and time to live (a write changes the
+# version, so the TTL only frees the pages of the outdated versions)
+TICKETS_PAGE_CACHE_ENABLED = os.getenv(
+    "TICKETS_PAGE_CACHE_ENABLED", "true"
+).lower() in ("1", "true", "yes")
+TICKETS_PAGE_CACHE_SIZE = int(os.getenv("TICKETS_PAGE_CACHE_SIZE", "256"))
+TICKETS_PAGE_CACHE_TTL = float(os.getenv("TICKETS_PAGE_CACHE_TTL", "300"))
+
+# Group commit of the single-ticket writes (POST /tickets/, PUT /tickets/{id},
+# PATCH /tickets/{id}/close): the concurrent writes are queued and committed
+# together, in one transaction per interval (milliseconds) or per batch
+TICKETS_GROUP_COMMIT = os.getenv("TICKETS_GROUP_COMMIT", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TICKETS_GROUP_COMMIT_INTERVAL_MS = float(
+    os.getenv("TICKETS_GROUP_COMMIT_INTERVAL_MS", "5")
+)
+TICKETS_GROUP_COMMIT_MAX_BATCH = get_positive_int(
+    "TICKETS_GROUP_COMMIT_MAX_BATCH", "100"
+)
+
+# Write-behind mode of the single-ticket writes (POST /tickets/, PUT
+# /tickets/{id}, PATCH /tickets/{id}/close): the writes are appended to a local
+# journal and acknowledged with 202, then applied to SQLite in batches (every
+# interval, in milliseconds, at most batch size writes per transaction). The
+# journal is replayed at startup; with fsync, every append is flushed to disk
+TICKETS_WRITE_BEHIND = os.getenv("TICKETS_WRITE_BEHIND", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+TICKETS_WRITE_BEHIND_JOURNAL = os.getenv(
+    "TICKETS_WRITE_BEHIND_JOURNAL",
+    os.getenv("SQLITE_DATABASE_PATH", "./data/app.db") + ".journal",
+)
+TICKETS_WRITE_BEHIND_INTERVAL_MS = float(
+    os.getenv("TICKETS_WRITE_BEHIND_INTERVAL_MS", "50")
+)
+TICKETS_WRITE_BEHIND_BATCH_SIZE = get_positive_int(
+    "TICKETS_WRITE_BEHIND_BATCH_SIZE", "1000"
+)
+TICKETS_WRITE_BEHIND_FSYNC = os.getenv(
+    "TICKETS_WRITE_BEHIND_FSYNC", "false"
+).lower() in ("1", "true", "yes")
+
+# Maximum number of hours or days returned by GET /tickets/stats
+TICKETS_STATS_MAX_BUCKETS = get_positive_int("TICKETS_STATS_MAX_BUCKETS", "1000")
+
+# Time to live of the columnar snapshot of the tickets behind GET
+# /tickets/reports/*, in seconds (a write changes the data version, so the TTL
+# only frees the memory of a snapshot no longer requested)
+TICKETS_REPORTS_SNAPSHOT_TTL = float(os.getenv("TICKETS_REPORTS_SNAPSHOT_TTL", "300"))
+# Number of rows fetched and converted to arrays at a time when loading it
+TICKETS_REPORTS_SNAPSHOT_CHUNK_SIZE = get_positive_int(
+    "TICKETS_REPORTS_SNAPSHOT_CHUNK_SIZE", "10000"
+)
+
+# Idempotency-Key header of POST /tickets/ and PATCH /tickets/{id}/close: time
+# to live of a stored response (in seconds), and number of responses cached in
+# memory in front of their table
+TICKETS_IDEMPOTENCY_TTL = float(os.getenv("TICKETS_IDEMPOTENCY_TTL", "86400"))
+TICKETS_IDEMPOTENCY_CACHE_SIZE = int(
+    os.getenv("TICKETS_IDEMPOTENCY_CACHE_SIZE", "10000")
+)
@@ -0,0 +1,101 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.config.settings import (
+    TICKETS_CACHE_ENABLED,
+    TICKETS_CACHE_SIZE,
+    TICKETS_CACHE_TTL,
+    TICKETS_IDEMPOTENCY_CACHE_SIZE,
+    TICKETS_IDEMPOTENCY_TTL,
+    TICKETS_PAGE_CACHE_ENABLED,
+    TICKETS_PAGE_CACHE_SIZE,
+    TICKETS_PAGE_CACHE_TTL,
+    TICKETS_REPORTS_SNAPSHOT_TTL,
+)
+from app.schemas.tickets import CacheStats
+
+
+class LRUCache:
+    """
+    In-process cache with a bounded size (the least recently used entry is
+    evicted first) and a time to live.
+
+    Every invalidation bumps the generation of the cache: a value read from the
+    database before an invalidation is not stored by set(), so a read racing
+    with a write can't cache the old value after the write.
+    """
+
+    def __init__(self, max_size: int, ttl: float, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.enabled = enabled and max_size > 0
+        self.entries: OrderedDict = OrderedDict()
+        self.generation = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        entry = self.entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """Store a value, unless the cache was invalidated since generation."""
+        if not self.enabled or generation not in (None, self.generation):
+            return
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        self.generation += 1
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        self.generation += 1
+        self.entries.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        lookups = self.hits + self.misses
+        return CacheStats(
+            enabled=self.enabled,
+            size=len(self.entries),
+            max_size=self.max_size,
+            ttl=self.ttl,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            hit_ratio=self.hits / lookups if lookups else None,
+        )
+
+
+# The tickets read by get_ticket_by_id, by UUID
+ticket_cache = LRUCache(
+    TICKETS_CACHE_SIZE, TICKETS_CACHE_TTL, enabled=TICKETS_CACHE_ENABLED
+)
+# The serialized GET /tickets/ pages, by ETag (query parameters and data version:
+# a write changes the keys, and the pages of the old versions are evicted)
+page_cache = LRUCache(
+    TICKETS_PAGE_CACHE_SIZE, TICKETS_PAGE_CACHE_TTL, enabled=TICKETS_PAGE_CACHE_ENABLED
+)
+
+# The columnar snapshot of the tickets of the reports, by data version (only the
+# latest one is kept)
+snapshot_cache = LRUCache(1, TICKETS_REPORTS_SNAPSHOT_TTL)
+
+# The responses stored for the Idempotency-Key headers, in front of their table
+idempotency_cache = LRUCache(TICKETS_IDEMPOTENCY_CACHE_SIZE, TICKETS_IDEMPOTENCY_TTL)
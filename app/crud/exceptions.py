@@ -24,6 +24,36 @@ class InvalidUUIDError(ValueError):
     pass
 
 
+class MissingValueError(ValueError):
+    """Raised when a new ticket lacks the value of a NOT NULL column."""
+
+    pass
+
+
+class InvalidCursorError(ValueError):
+    """Raised when the pagination cursor of the tickets list is invalid."""
+
+    pass
+
+
+class InvalidSearchQueryError(ValueError):
+    """Raised when the full-text search query doesn't contain any term."""
+
+    pass
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an Idempotency-Key is sent again with a different request."""
+
+    pass
+
+
+class VersionConflictError(Exception):
+    """Raised when a conditional write expects another version of the ticket."""
+
+    pass
+
+
 class AlreadyClosedError(Exception):
     """Raised when we try to close a closed ticket."""
 
@@ -0,0 +1,96 @@
+import csv
+import io
+import zlib
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import sessionmaker
+
+from app.crud import tickets_crud
+from app.schemas.tickets import ExportFormat, TicketFilter, TicketOut
+
+EXPORT_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+    "updated_at",
+    "version",
+]
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+def encode_ndjson(rows: List[Row]) -> str:
+    # The same JSON as a ticket of the API, one ticket per line
+    return "".join(
+        TicketOut.model_validate(row._mapping).model_dump_json() + "\n" for row in rows
+    )
+
+
+def encode_csv(rows: List[Row]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        ticket = TicketOut.model_validate(row._mapping)
+        writer.writerow(
+            [
+                ticket.id,
+                ticket.title,
+                ticket.description,
+                ticket.status.value,
+                ticket.created_at.isoformat(),
+                ticket.updated_at.isoformat(),
+                ticket.version,
+            ]
+        )
+    return buffer.getvalue()
+
+
+def csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_COLUMNS)
+    return buffer.getvalue()
+
+
+async def export_tickets(
+    session_factory: sessionmaker,
+    export_format: ExportFormat = ExportFormat.ndjson,
+    filters: Optional[TicketFilter] = None,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Encode the tickets as NDJSON or CSV, chunk by chunk, while they are streamed
+    from the database (see tickets_crud.stream_tickets).
+
+    The export opens its own session: it runs while the response is sent, after
+    the session of the request has been closed.
+
+    Args:
+        session_factory (sessionmaker): The factory of the read-only sessions.
+        export_format (ExportFormat): NDJSON (one JSON ticket per line) or CSV.
+        filters (TicketFilter, optional): Filters of the tickets.
+        compress (bool): If True, the chunks are a gzip stream.
+
+    Yields:
+        bytes: The next chunk of the export.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    if export_format == ExportFormat.csv:
+        yield encode(csv_header())
+    encoder = encode_csv if export_format == ExportFormat.csv else encode_ndjson
+    async with session_factory() as db:
+        async for rows in tickets_crud.stream_tickets(db, filters=filters):
+            chunk = encode(encoder(rows))
+            if chunk:
+                yield chunk
+    if compressor:
+        yield compressor.flush()
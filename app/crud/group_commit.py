@@ -0,0 +1,197 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import (
+    TICKETS_GROUP_COMMIT_INTERVAL_MS,
+    TICKETS_GROUP_COMMIT_MAX_BATCH,
+)
+from app.crud import tickets_crud
+from app.crud.exceptions import (
+    AlreadyClosedError,
+    DuplicateTitleException,
+    InvalidCloseTransitionError,
+    InvalidUUIDError,
+    MissingValueError,
+    NotFoundError,
+    VersionConflictError,
+)
+
+# The errors of a write that didn't change anything: the other writes of the
+# batch are still committed
+WRITE_ERRORS = (
+    AlreadyClosedError,
+    DuplicateTitleException,
+    InvalidCloseTransitionError,
+    InvalidUUIDError,
+    MissingValueError,
+    NotFoundError,
+    VersionConflictError,
+)
+
+# A queued write: the tickets_crud function, its arguments, and the future of
+# the caller
+Write = Tuple[Callable[..., Awaitable[Any]], dict, asyncio.Future]
+
+
+class GroupCommitWriter:
+    """
+    Writer task coalescing the concurrent single-ticket writes into shared
+    transactions: SQLite serializes the transactions anyway, so a commit (and
+    its fsync) for a batch of writes costs about the same as for one write.
+
+    The first queued write opens a batch, which is flushed once max_batch
+    writes are queued or interval seconds later. The writes of a batch run one
+    after the other in one transaction, and each caller gets its own result or
+    exception once the batch is committed.
+
+    The writes don't use savepoints: a write failing with one of WRITE_ERRORS
+    changed nothing (its statement matched no row), and any other error rolls
+    back the batch, whose writes are then retried one transaction each, so a
+    failing write doesn't fail the others.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        interval: float = TICKETS_GROUP_COMMIT_INTERVAL_MS / 1000,
+        max_batch: int = TICKETS_GROUP_COMMIT_MAX_BATCH,
+    ):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.max_batch = max(max_batch, 1)
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+        self.batches = self.writes = 0
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Flush the queued writes, then stop the writer task."""
+        if self.task is not None:
+            await self.queue.put(None)
+            await self.task
+            self.task = None
+
+    async def submit(self, write: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        """
+        Queue a write, and wait for its transaction to be committed.
+
+        Args:
+            write (Callable): A tickets_crud write accepting db and commit
+                (e.g. tickets_crud.create_ticket).
+            **kwargs: The other arguments of the write.
+
+        Returns:
+            Any: The result of the write.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((write, kwargs, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self.queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.interval
+            while len(batch) < self.max_batch:
+                try:
+                    write = self.queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        write = await asyncio.wait_for(self.queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if write is None:
+                    stopping = True
+                    break
+                batch.append(write)
+            await self.flush(batch)
+
+    async def flush(self, batch: List[Write]):
+        results = []
+        try:
+            async with self.session_factory() as db:
+                for write, kwargs, future in batch:
+                    try:
+                        results.append(await write(db=db, commit=False, **kwargs))
+                    except WRITE_ERRORS as e:
+                        results.append(e)
+                await db.commit()
+        except Exception:
+            await self.flush_one_by_one(batch)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        tickets_crud.tickets_written(
+            *(result.id for result in results if not isinstance(result, Exception))
+        )
+        for (_, _, future), result in zip(batch, results):
+            set_result(future, result)
+
+    async def flush_one_by_one(self, batch: List[Write]):
+        for write, kwargs, future in batch:
+            try:
+                async with self.session_factory() as db:
+                    result = await write(db=db, **kwargs)
+            except Exception as e:
+                result = e
+            self.batches += 1
+            self.writes += 1
+            set_result(future, result)
+
+
+def set_result(future: asyncio.Future, result: Any):
+    # The caller may be gone (e.g. a cancelled request)
+    if future.done():
+        return
+    if isinstance(result, Exception):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+# The writer of the process, when TICKETS_GROUP_COMMIT is enabled
+writer: Optional[GroupCommitWriter] = None
+
+
+def start_group_commit(session_factory: sessionmaker, **kwargs) -> GroupCommitWriter:
+    global writer
+    writer = GroupCommitWriter(session_factory, **kwargs)
+    writer.start()
+    return writer
+
+
+async def stop_group_commit():
+    global writer
+    if writer is not None:
+        await writer.stop()
+        writer = None
+
+
+async def write_ticket(db, write: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+    """
+    Run a single-ticket write of tickets_crud: queued to the group commit
+    writer when it is started, else in its own transaction on db.
+
+    Args:
+        db (AsyncSession): The session of the request.
+        write (Callable): The tickets_crud write (e.g. tickets_crud.create_ticket).
+        **kwargs: The other arguments of the write.
+
+    Returns:
+        Any: The result of the write.
+    """
+    if writer is not None:
+        return await writer.submit(write, **kwargs)
+    return await write(db=db, **kwargs)
@@ -0,0 +1,143 @@
+import hashlib
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import TICKETS_IDEMPOTENCY_TTL
+from app.crud import tickets_crud
+from app.crud.cache import idempotency_cache
+from app.crud.exceptions import IdempotencyKeyReusedError
+from app.models.models import IdempotencyKey
+
+# Minimum time between two purges of the expired keys, in seconds
+PURGE_INTERVAL = 60
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: int
+    response: str
+    expires_at: datetime
+
+
+next_purge = 0.0
+
+
+def request_fingerprint(*parts: Any) -> str:
+    return hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=16
+    ).hexdigest()
+
+
+async def get_stored_response(db: AsyncSession, key: str) -> Optional[StoredResponse]:
+    """
+    Get the response stored for an Idempotency-Key, from the cache, else from
+    the idempotency_keys table (a lookup by primary key).
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        key (str): The Idempotency-Key.
+
+    Returns:
+        Optional[StoredResponse]: The response, or None if the key is unknown or
+        expired.
+    """
+    now = datetime.utcnow()
+    stored = idempotency_cache.get(key)
+    if stored is None:
+        result = await db.execute(
+            select(
+                IdempotencyKey.fingerprint,
+                IdempotencyKey.status_code,
+                IdempotencyKey.response,
+                IdempotencyKey.expires_at,
+            ).where(IdempotencyKey.key == key, IdempotencyKey.expires_at > now)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        stored = StoredResponse(*row)
+        idempotency_cache.set(key, stored)
+    return stored if stored.expires_at > now else None
+
+
+def check_fingerprint(stored: StoredResponse, key: str, fingerprint: str):
+    if stored.fingerprint != fingerprint:
+        raise IdempotencyKeyReusedError(
+            f"The Idempotency-Key {key} was already used by a different request."
+        )
+    return stored
+
+
+async def purge_expired_keys(db: AsyncSession, now: datetime):
+    global next_purge
+    if time.monotonic() < next_purge:
+        return
+    next_purge = time.monotonic() + PURGE_INTERVAL
+    await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+
+
+async def run_once(
+    db: AsyncSession,
+    key: str,
+    fingerprint: str,
+    write: Callable[..., Awaitable[Any]],
+    status_code: int,
+    **kwargs,
+) -> Tuple[StoredResponse, bool]:
+    """
+    Run a single-ticket write of tickets_crud once per Idempotency-Key.
+
+    The first request runs the write without committing it (commit=False), and
+    stores its response in the same transaction, so the ticket is never written
+    without its key (nor the key without its ticket). The retries get the stored
+    response, without reading the tickets table. Two concurrent requests with
+    the same key conflict on the primary key: the second one is rolled back,
+    and gets the response of the first one.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        key (str): The Idempotency-Key.
+        fingerprint (str): The hash of the request (see request_fingerprint).
+        write (Callable): The tickets_crud write (e.g. tickets_crud.create_ticket).
+        status_code (int): The status code of the response of the write.
+        **kwargs: The other arguments of the write.
+
+    Returns:
+        Tuple[StoredResponse, bool]: The response, and True if it is a replay.
+
+    Raises:
+        IdempotencyKeyReusedError: If the key was used by a different request.
+    """
+    stored = await get_stored_response(db, key)
+    if stored is not None:
+        return check_fingerprint(stored, key, fingerprint), True
+
+    ticket = await write(db=db, commit=False, **kwargs)
+    now = datetime.utcnow()
+    stored = StoredResponse(
+        fingerprint=fingerprint,
+        status_code=status_code,
+        response=ticket.model_dump_json(),
+        expires_at=now + timedelta(seconds=TICKETS_IDEMPOTENCY_TTL),
+    )
+    try:
+        await db.execute(
+            insert(IdempotencyKey).values(key=key, created_at=now, **stored._asdict())
+        )
+        await purge_expired_keys(db, now)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        stored = await get_stored_response(db, key)
+        if stored is None:
+            raise
+        return check_fingerprint(stored, key, fingerprint), True
+
+    tickets_crud.tickets_written(ticket.id)
+    idempotency_cache.set(key, stored)
+    return stored, False
@@ -0,0 +1,142 @@
+import json
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import (
+    TICKETS_IMPORT_BATCH_SIZE,
+    TICKETS_IMPORT_MAX_LINE_BYTES,
+    TICKETS_IMPORT_MAX_REJECTED,
+)
+from app.crud import tickets_crud
+from app.schemas.tickets import (
+    BulkItemStatus,
+    TicketCreate,
+    TicketImportRejectedLine,
+    TicketImportResponse,
+)
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = TICKETS_IMPORT_MAX_LINE_BYTES
+) -> AsyncIterator[Optional[bytes]]:
+    """
+    Split a stream of bytes into lines, holding at most one line in memory.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The stream (e.g. the request body).
+        max_line_bytes (int): The maximum size of a line.
+
+    Yields:
+        Optional[bytes]: The next line (without the newline), or None for a
+        line longer than max_line_bytes (which is skipped).
+    """
+    buffer = b""
+    too_long = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield None if too_long or len(line) > max_line_bytes else line
+            too_long = False
+        if len(buffer) > max_line_bytes:
+            # Drop the beginning of the line instead of buffering it
+            too_long = True
+            buffer = b""
+    if buffer or too_long:
+        yield None if too_long else buffer
+
+
+def parse_line(line: Optional[bytes], max_line_bytes: int) -> TicketCreate:
+    if line is None:
+        raise ValueError(f"The line is longer than {max_line_bytes} bytes")
+    try:
+        return TicketCreate.model_validate(json.loads(line))
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(map(str, error['loc'])) or 'ticket'}: {error['msg']}"
+            for error in e.errors()
+        )
+        raise ValueError(errors)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON: {e}")
+
+
+async def import_tickets(
+    db: AsyncSession,
+    chunks: AsyncIterator[bytes],
+    reject_duplicates: bool = False,
+    batch_size: int = TICKETS_IMPORT_BATCH_SIZE,
+    max_line_bytes: int = TICKETS_IMPORT_MAX_LINE_BYTES,
+) -> TicketImportResponse:
+    """
+    Import tickets from an NDJSON stream (one TicketCreate per line).
+
+    The lines are parsed while the stream is read, and the valid tickets are
+    inserted every batch_size lines (see tickets_crud.create_tickets), each
+    batch in its own transaction. The next chunk is only read once the batch
+    is inserted, so a fast sender is slowed down to the insert rate and the
+    memory is bounded by one batch.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        chunks (AsyncIterator[bytes]): The NDJSON stream.
+        reject_duplicates (bool): To reject the tickets whose title is used.
+        batch_size (int): The maximum number of tickets per transaction.
+        max_line_bytes (int): The maximum size of a line.
+
+    Returns:
+        TicketImportResponse: The number of imported and rejected lines, the
+        first rejected lines with the reason why, and the import rate.
+    """
+    start = time.perf_counter()
+    lines = imported = rejected = 0
+    rejected_lines: List[TicketImportRejectedLine] = []
+    batch: List[Tuple[int, TicketCreate]] = []
+
+    def reject(line_number: int, detail: str):
+        nonlocal rejected
+        rejected += 1
+        if len(rejected_lines) < TICKETS_IMPORT_MAX_REJECTED:
+            rejected_lines.append(
+                TicketImportRejectedLine(line=line_number, detail=detail)
+            )
+
+    async def insert_batch():
+        nonlocal imported
+        result = await tickets_crud.create_tickets(
+            db, [ticket for _, ticket in batch], reject_duplicates=reject_duplicates
+        )
+        imported += result.created
+        for item in result.results:
+            if item.status != BulkItemStatus.created:
+                reject(batch[item.index][0], item.detail)
+        batch.clear()
+
+    line_number = 0
+    async for line in iter_lines(chunks, max_line_bytes):
+        line_number += 1
+        if line is not None and not line.strip():
+            continue
+        lines += 1
+        try:
+            batch.append((line_number, parse_line(line, max_line_bytes)))
+        except ValueError as e:
+            reject(line_number, str(e))
+            continue
+        if len(batch) >= batch_size:
+            await insert_batch()
+    if batch:
+        await insert_batch()
+
+    seconds = time.perf_counter() - start
+    return TicketImportResponse(
+        lines=lines,
+        imported=imported,
+        rejected=rejected,
+        rejected_lines=sorted(rejected_lines, key=lambda rejected: rejected.line),
+        seconds=round(seconds, 3),
+        rows_per_second=round(imported / seconds, 1) if seconds else 0.0,
+    )
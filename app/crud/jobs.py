@@ -0,0 +1,93 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Set
+from uuid import UUID
+
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import TICKETS_DELETE_BATCH_SIZE, TICKETS_JOBS_HISTORY
+from app.crud import tickets_crud
+from app.crud.exceptions import NotFoundError
+from app.schemas.tickets import JobState, TicketJob
+
+# The jobs of this process, the oldest first (only the last finished ones are kept)
+jobs: Dict[UUID, TicketJob] = OrderedDict()
+# References to the running tasks, so they aren't garbage collected
+running_tasks: Set[asyncio.Task] = set()
+
+
+def forget_finished_jobs():
+    finished = [job.id for job in jobs.values() if job.state != JobState.running]
+    for job_id in finished[: max(len(finished) - TICKETS_JOBS_HISTORY, 0)]:
+        del jobs[job_id]
+
+
+async def run_delete_job(
+    job: TicketJob, session_factory: sessionmaker, force_delete: bool, batch_size: int
+):
+    def on_progress(deleted: int):
+        job.deleted = deleted
+
+    try:
+        async with session_factory() as db:
+            result = await tickets_crud.delete_tickets(
+                db,
+                force_delete=force_delete,
+                batch_size=batch_size,
+                on_progress=on_progress,
+            )
+        job.deleted = result["delete_count"]
+        job.total_count = result["total_count"]
+        job.state = JobState.done
+    except Exception as e:
+        job.error = str(e)
+        job.state = JobState.failed
+    job.finished_at = datetime.now(timezone.utc)
+    forget_finished_jobs()
+
+
+def start_delete_job(
+    session_factory: sessionmaker,
+    force_delete: bool = False,
+    batch_size: int = TICKETS_DELETE_BATCH_SIZE,
+) -> TicketJob:
+    """
+    Start deleting the tickets (see tickets_crud.delete_tickets) in a background
+    task, with its own database session.
+
+    Args:
+        session_factory (sessionmaker): The factory of the writer sessions.
+        force_delete (bool): If True, delete all tickets regardless of status.
+        batch_size (int): The maximum number of tickets deleted per transaction.
+
+    Returns:
+        TicketJob: The job, whose progress is updated after every batch.
+    """
+    job = TicketJob(id=uuid.uuid4(), created_at=datetime.now(timezone.utc))
+    jobs[job.id] = job
+    task = asyncio.create_task(
+        run_delete_job(job, session_factory, force_delete, batch_size)
+    )
+    running_tasks.add(task)
+    task.add_done_callback(running_tasks.discard)
+    return job
+
+
+def get_job(job_id: UUID) -> TicketJob:
+    """
+    Get the progress of a background job.
+
+    Args:
+        job_id (UUID): The ID of the job.
+
+    Returns:
+        TicketJob: The job.
+
+    Raises:
+        NotFoundError: If the job doesn't exist (or was forgotten).
+    """
+    if job_id not in jobs:
+        raise NotFoundError("Job", job_id)
+    return jobs[job_id]
@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+from sqlalchemy import String, func, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import TICKETS_REPORTS_SNAPSHOT_CHUNK_SIZE
+from app.crud import tickets_crud
+from app.crud.cache import snapshot_cache
+from app.models.models import Ticket, TicketTransition
+from app.schemas.tickets import (
+    BacklogAgeBucket,
+    BacklogAgeReport,
+    StatusTransitionCount,
+    StatusTransitionsReport,
+    TicketStatus,
+    TimeToClosePercentile,
+    TimeToCloseReport,
+)
+
+# The raw stored values (no Enum nor DateTime conversion per row): the status
+# names, and the "YYYY-MM-DD HH:MM:SS.ffffff" dates, parsed by NumPy at once
+SNAPSHOT_QUERY = select(
+    type_coerce(Ticket.status, String),
+    type_coerce(Ticket.created_at, String),
+    type_coerce(func.coalesce(Ticket.updated_at, Ticket.created_at), String),
+)
+
+ONE_SECOND = np.timedelta64(1, "s")
+ONE_HOUR = np.timedelta64(1, "h")
+
+
+class TicketSnapshot(NamedTuple):
+    """The columns of all the tickets, one NumPy array per column."""
+
+    status: np.ndarray
+    created_at: np.ndarray
+    updated_at: np.ndarray
+
+
+# Serializes the loads of the snapshot: the concurrent requests of a new data
+# version wait for the first one to load it, instead of scanning the table too
+snapshot_lock = asyncio.Lock()
+
+
+def build_snapshot(rows: Sequence[tuple]) -> TicketSnapshot:
+    statuses, created_at, updated_at = zip(*rows) if rows else ((), (), ())
+    return TicketSnapshot(
+        status=np.array(statuses, dtype=str),
+        created_at=np.array(created_at, dtype="datetime64[us]"),
+        updated_at=np.array(updated_at, dtype="datetime64[us]"),
+    )
+
+
+def concatenate_snapshots(chunks: Sequence[TicketSnapshot]) -> TicketSnapshot:
+    if not chunks:
+        return build_snapshot([])
+    return TicketSnapshot(*(np.concatenate(columns) for columns in zip(*chunks)))
+
+
+async def load_snapshot(db: AsyncSession, chunk_size: int) -> TicketSnapshot:
+    # The rows are fetched chunk by chunk, and every chunk is converted in a
+    # worker thread: the event loop serves the other requests in between
+    result = await db.stream(SNAPSHOT_QUERY.execution_options(yield_per=chunk_size))
+    chunks = []
+    async for rows in result.partitions():
+        chunks.append(await asyncio.to_thread(build_snapshot, rows))
+    return await asyncio.to_thread(concatenate_snapshots, chunks)
+
+
+async def get_snapshot(
+    db: AsyncSession, chunk_size: int = TICKETS_REPORTS_SNAPSHOT_CHUNK_SIZE
+) -> TicketSnapshot:
+    """
+    Get the columnar snapshot of the tickets, loaded once per data version.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        chunk_size (int): The number of rows loaded at a time.
+
+    Returns:
+        TicketSnapshot: The status, creation and update date of every ticket.
+    """
+    # As for the pages, the version is read before the tickets: a snapshot
+    # racing with a write is stored under the outdated version
+    version = await tickets_crud.get_data_version(db)
+    snapshot = snapshot_cache.get(version)
+    if snapshot is not None:
+        return snapshot
+    async with snapshot_lock:
+        snapshot = snapshot_cache.get(version)
+        if snapshot is None:
+            snapshot = await load_snapshot(db, chunk_size)
+            snapshot_cache.set(version, snapshot)
+    return snapshot
+
+
+def time_to_close(
+    snapshot: TicketSnapshot, percentiles: Sequence[float]
+) -> TimeToCloseReport:
+    closed = snapshot.status == TicketStatus.closed.name
+    seconds = (snapshot.updated_at[closed] - snapshot.created_at[closed]) / ONE_SECOND
+    if not seconds.size:
+        return TimeToCloseReport(closed=0, percentiles=[])
+    values = np.percentile(seconds, percentiles)
+    return TimeToCloseReport(
+        closed=int(seconds.size),
+        mean_seconds=float(seconds.mean()),
+        max_seconds=float(seconds.max()),
+        percentiles=[
+            TimeToClosePercentile(percentile=percentile, seconds=float(value))
+            for percentile, value in zip(percentiles, values)
+        ],
+    )
+
+
+def backlog_age(
+    snapshot: TicketSnapshot, edges: Sequence[float], now: datetime
+) -> BacklogAgeReport:
+    edges = sorted(set(edges))
+    hours = (np.datetime64(now, "us") - snapshot.created_at) / ONE_HOUR
+    # The bucket of every ticket: 0 below the first edge, len(edges) above the last
+    buckets = np.digitize(hours, edges)
+    counts = {
+        status: np.bincount(
+            buckets[snapshot.status == status.name], minlength=len(edges) + 1
+        )
+        for status in (TicketStatus.open, TicketStatus.stalled)
+    }
+    bounds = zip([0.0, *edges], [*edges, None])
+    return BacklogAgeReport(
+        as_of=now,
+        total=int(sum(count.sum() for count in counts.values())),
+        buckets=[
+            BacklogAgeBucket(
+                min_hours=min_hours,
+                max_hours=max_hours,
+                open=int(counts[TicketStatus.open][index]),
+                stalled=int(counts[TicketStatus.stalled][index]),
+            )
+            for index, (min_hours, max_hours) in enumerate(bounds)
+        ],
+    )
+
+
+async def get_time_to_close_report(
+    db: AsyncSession, percentiles: Sequence[float] = (50, 90, 95, 99)
+) -> TimeToCloseReport:
+    """
+    Get the percentiles of the time to close of the closed tickets (the time
+    between their creation and their last update).
+
+    The snapshot is loaded once per data version, chunk by chunk, and the
+    percentiles are computed by NumPy in a worker thread, so the event loop
+    keeps serving the other requests.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        percentiles (Sequence[float]): The percentiles, between 0 and 100.
+
+    Returns:
+        TimeToCloseReport: The number of closed tickets, the mean and maximum
+        time to close, and the requested percentiles, in seconds.
+    """
+    snapshot = await get_snapshot(db)
+    return await asyncio.to_thread(time_to_close, snapshot, list(percentiles))
+
+
+async def get_backlog_age_report(
+    db: AsyncSession, edges: Sequence[float] = (1, 24, 168, 720)
+) -> BacklogAgeReport:
+    """
+    Get the histogram of the age of the open and stalled tickets.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        edges (Sequence[float]): The bounds of the buckets, in hours.
+
+    Returns:
+        BacklogAgeReport: The number of open and stalled tickets per bucket of
+        age, the last bucket holding the tickets older than the last edge.
+    """
+    snapshot = await get_snapshot(db)
+    return await asyncio.to_thread(
+        backlog_age, snapshot, list(edges), datetime.utcnow()
+    )
+
+
+async def get_status_transitions_report(db: AsyncSession) -> StatusTransitionsReport:
+    """
+    Get the number of status changes of the tickets, per previous and new status.
+
+    They are read from the ticket_transitions table, counted by a trigger on
+    every status change, so a deleted ticket keeps its transitions.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+
+    Returns:
+        StatusTransitionsReport: The transitions, the most frequent first.
+    """
+    result = await db.execute(
+        select(
+            TicketTransition.from_status,
+            TicketTransition.to_status,
+            TicketTransition.count,
+        )
+        .where(TicketTransition.count > 0)
+        .order_by(
+            TicketTransition.count.desc(),
+            TicketTransition.from_status,
+            TicketTransition.to_status,
+        )
+    )
+    transitions: List[StatusTransitionCount] = [
+        StatusTransitionCount(from_status=from_status, to_status=to_status, count=count)
+        for from_status, to_status, count in result
+    ]
+    return StatusTransitionsReport(
+        total=sum(transition.count for transition in transitions),
+        transitions=transitions,
+    )
@@ -1,24 +1,142 @@
-from typing import Optional
+import asyncio
+import base64
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+from itertools import groupby
+from typing import AsyncIterator, Callable, Collection, Dict, List, Optional
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import (
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config.settings import (
+    TICKETS_BULK_MAX_ITEMS,
+    TICKETS_DELETE_BATCH_SIZE,
+    TICKETS_EXPORT_CHUNK_SIZE,
+)
+from app.crud.cache import ticket_cache
 from app.crud.exceptions import (
     AlreadyClosedError,
     DuplicateTitleException,
     InvalidCloseTransitionError,
+    InvalidCursorError,
+    InvalidSearchQueryError,
     InvalidUUIDError,
+    MissingValueError,
     NotFoundError,
+    VersionConflictError,
 )
-from app.models.models import Ticket
+from app.models.models import Ticket, TicketCounter, TicketRollup, TicketsVersion
 from app.schemas.tickets import (
+    BulkItemStatus,
+    SkipReason,
+    StatsPeriod,
+    TicketBatchGetResponse,
+    TicketBulkCreateItem,
+    TicketBulkCreateResponse,
+    TicketBulkUpdateResponse,
+    TicketCreate,
+    TicketFilter,
     TicketOut,
+    TicketSelection,
+    TicketSkipped,
+    TicketSort,
     TicketsResponseList,
+    TicketStats,
+    TicketStatsBucket,
     TicketStatus,
     TicketUpdate,
+    TicketWrite,
+    WriteOperation,
 )
 
+TICKET_COLUMNS = Ticket.__table__.c
+# The columns of a ticket, in the order of the TicketOut fields (the read fast
+# path returns them as plain dicts, with the same JSON shape as TicketOut)
+TICKET_OUT_COLUMNS = [TICKET_COLUMNS[field] for field in TicketOut.model_fields]
+TICKETS_FTS = table("tickets_fts", literal_column("rowid"))
+TICKET_ROWID = literal_column("tickets.rowid")
+# The columns a new ticket must have a value for (checked before the INSERT, so
+# a missing value is rejected like the other invalid values, not by SQLite)
+TICKET_REQUIRED_COLUMNS = [
+    column.name for column in TICKET_COLUMNS if not column.nullable
+]
+# The format of the ticket_rollups buckets (see app.db.schema.ROLLUP_BUCKETS)
+ROLLUP_BUCKET_FORMATS = {StatsPeriod.hour: "%Y-%m-%d %H", StatsPeriod.day: "%Y-%m-%d"}
+
+
+def new_ticket_values(
+    title: str,
+    description: Optional[str] = None,
+    status: Optional[TicketStatus] = None,
+) -> dict:
+    """
+    Build the column values of a new ticket (the ID and dates are generated here
+    so that the inserted row doesn't need to be read back).
+
+    Raises:
+        MissingValueError: If a NOT NULL column has no value (e.g. description).
+    """
+    now = datetime.utcnow()
+    values = {
+        "id": uuid.uuid4(),
+        "title": title,
+        "description": description,
+        "status": status or TicketStatus.open,
+        "created_at": now,
+        "updated_at": now,
+        "version": 1,
+    }
+    for column in TICKET_REQUIRED_COLUMNS:
+        if values[column] is None:
+            raise MissingValueError(f"The {column} of the ticket is required.")
+    return values
+
+
+async def get_data_version(db: AsyncSession) -> str:
+    """
+    Get the version of the tickets data: a response computed at a version is
+    still valid while it doesn't change.
+
+    It is bumped by triggers on every write of the tickets table, whatever the
+    process performing it (e.g. the import CLI), and read by a primary key
+    lookup.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+
+    Returns:
+        str: The random nonce of the database and the number of writes.
+    """
+    result = await db.execute(
+        select(TicketsVersion.nonce, TicketsVersion.counter).where(
+            TicketsVersion.id == 1
+        )
+    )
+    nonce, counter = result.one()
+    return f"{nonce}-{counter}"
+
+
+def tickets_written(*ticket_uuids: UUID):
+    """Invalidate the cached reads of the tickets written by a committed transaction."""
+    ticket_cache.invalidate(*ticket_uuids)
+
 
 async def create_ticket(
     db: AsyncSession,
@@ -26,63 +144,467 @@ async def create_ticket(
     description: Optional[str] = None,
     status: Optional[TicketStatus] = None,
     reject_duplicates: Optional[bool] = False,
+    commit: bool = True,
 ) -> TicketOut:
     """
     Create a new ticket in the database.
 
+    With reject_duplicates, the existence check and the insertion are a single
+    conditional INSERT ... SELECT ... WHERE NOT EXISTS statement, served by the
+    title index. SQLite runs it under its write lock, so two concurrent requests
+    can't both insert the same title.
+
     Args:
         db (AsyncSession): The async SQLAlchemy database session.
         title (str): The title of the ticket.
         description (str): The description of the ticket (Optional).
         status (TicketStatus): The status of the ticket (Optional).
         reject_duplicates (bool) : To avoid creating duplicate tickets (same title).
+        commit (bool): If False, the ticket is written in the transaction of the
+            caller, which commits it (see group_commit).
 
     Returns:
         TicketOut: The created ticket as a Pydantic model.
+
+    Raises:
+        MissingValueError: If the ticket has no description.
+        DuplicateTitleException: If the title is used and reject_duplicates.
     """
-    new_ticket = Ticket(
-        title=title,
-        description=description,
-        status=status,
-    )
-    existing_tickets = await db.execute(select(Ticket).where(Ticket.title == title))
-    duplicate = existing_tickets.scalars().first()
-    if reject_duplicates and duplicate:
+    values = new_ticket_values(title, description, status)
+    if reject_duplicates:
+        query = insert(Ticket.__table__).from_select(
+            list(values),
+            select(
+                *(
+                    literal(value, TICKET_COLUMNS[key].type)
+                    for key, value in values.items()
+                )
+            ).where(~exists().where(Ticket.title == title)),
+        )
+    else:
+        query = insert(Ticket.__table__).values(values)
+
+    result = await db.execute(query.returning(*TICKET_COLUMNS))
+    created_ticket = result.first()
+    if created_ticket is None:
+        if commit:
+            await db.rollback()
         raise DuplicateTitleException("ticket", title)
-    db.add(new_ticket)
+    if commit:
+        await db.commit()
+    return TicketOut.model_validate(created_ticket._mapping)
+
+
+async def begin_immediate(db: AsyncSession):
+    """
+    Start the transaction of the session with the write lock of the database.
+
+    pysqlite only sends BEGIN before the first write statement, so the reads
+    before it (e.g. a duplicates check) run outside the transaction, and another
+    connection (e.g. the import CLI) could write in between.
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    if not raw_connection.driver_connection.in_transaction:
+        await db.execute(text("BEGIN IMMEDIATE"))
+
+
+async def create_tickets(
+    db: AsyncSession,
+    tickets: List[TicketCreate],
+    reject_duplicates: Optional[bool] = False,
+) -> TicketBulkCreateResponse:
+    """
+    Create several tickets in one transaction, with a single executemany INSERT.
+
+    With reject_duplicates, the titles already used are found with one
+    SELECT ... WHERE title IN (...) against the table, and within the batch
+    the first ticket with a title wins. The transaction takes the write lock
+    before the check (BEGIN IMMEDIATE), so no other write, from this process or
+    another one, can interleave between the check and the insert.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        tickets (List[TicketCreate]): The tickets to create.
+        reject_duplicates (bool) : To avoid creating duplicate tickets (same title).
+
+    A ticket without a value for a NOT NULL column (e.g. description) is
+    rejected as invalid, and the other ones are still created.
+
+    Returns:
+        TicketBulkCreateResponse: The number of created and rejected tickets,
+        and the result of each ticket (in the order of the request).
+    """
+    used_titles = set()
+    if reject_duplicates:
+        await begin_immediate(db)
+        titles = {ticket.title for ticket in tickets}
+        result = await db.execute(
+            select(Ticket.title).where(Ticket.title.in_(titles)).distinct()
+        )
+        used_titles = set(result.scalars())
+
+    results = []
+    rows = []
+    for index, ticket in enumerate(tickets):
+        try:
+            values = new_ticket_values(ticket.title, ticket.description, ticket.status)
+        except MissingValueError as e:
+            results.append(
+                TicketBulkCreateItem(
+                    index=index, status=BulkItemStatus.invalid, detail=str(e)
+                )
+            )
+            continue
+        if ticket.title in used_titles:
+            results.append(
+                TicketBulkCreateItem(
+                    index=index,
+                    status=BulkItemStatus.duplicate,
+                    detail=str(DuplicateTitleException("ticket", ticket.title)),
+                )
+            )
+            continue
+        if reject_duplicates:
+            used_titles.add(ticket.title)
+        rows.append(values)
+        results.append(
+            TicketBulkCreateItem(
+                index=index,
+                status=BulkItemStatus.created,
+                ticket=TicketOut.model_validate(values),
+            )
+        )
+
+    if rows:
+        await db.execute(insert(Ticket.__table__), rows)
     await db.commit()
-    await db.refresh(new_ticket)
-    return TicketOut.from_orm(new_ticket)
+    return TicketBulkCreateResponse(
+        created=len(rows), rejected=len(tickets) - len(rows), results=results
+    )
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    The smallest string above all the strings starting with prefix, or None
+    if there is none (a prefix made of U+10FFFF only).
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    next_code = ord(prefix[-1]) + 1
+    if 0xD800 <= next_code <= 0xDFFF:
+        # The surrogates can't be encoded in UTF-8: skip to the next character
+        next_code = 0xE000
+    return prefix[:-1] + chr(next_code)
+
+
+def filter_tickets(query, filters: Optional[TicketFilter] = None):
+    """
+    Add the WHERE clauses of the tickets filters to a query.
+
+    The title prefix is a range on the title (instead of LIKE 'prefix%'),
+    so it is served by the title index.
+    """
+    if filters is None:
+        return query
+    if filters.status is not None:
+        query = query.where(Ticket.status == filters.status)
+    if filters.created_after is not None:
+        query = query.where(Ticket.created_at >= filters.created_after)
+    if filters.created_before is not None:
+        query = query.where(Ticket.created_at < filters.created_before)
+    if filters.updated_after is not None:
+        query = query.where(Ticket.updated_at >= filters.updated_after)
+    if filters.updated_before is not None:
+        query = query.where(Ticket.updated_at < filters.updated_before)
+    if filters.title_prefix:
+        query = query.where(Ticket.title >= filters.title_prefix)
+        prefix_end = prefix_upper_bound(filters.title_prefix)
+        if prefix_end is not None:
+            query = query.where(Ticket.title < prefix_end)
+    return query
+
+
+def encode_cursor(sort: TicketSort, ticket) -> str:
+    """
+    Encode the position of a ticket in the (sort column, id) ordering
+    as an opaque cursor.
+    """
+    sort_value = getattr(ticket, sort.column)
+    position = json.dumps([sort.value, sort_value.isoformat(), str(ticket.id)])
+    return base64.urlsafe_b64encode(position.encode()).decode()
+
+
+def encode_selection_cursor(rowid: int) -> str:
+    """Encode the position of the last ticket processed of a filter selection."""
+    return base64.urlsafe_b64encode(json.dumps(["rowid", rowid]).encode()).decode()
+
+
+def decode_selection_cursor(cursor: str) -> int:
+    try:
+        kind, rowid = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise InvalidCursorError(f"Invalid selection cursor: {cursor}")
+    if kind != "rowid" or not isinstance(rowid, int):
+        raise InvalidCursorError(f"Invalid selection cursor: {cursor}")
+    return rowid
+
+
+def decode_cursor(cursor: str, sort: TicketSort) -> tuple:
+    """
+    :param cursor: the cursor returned as next_cursor by get_all_tickets.
+    :param sort: the sort of the requested page, which must match the cursor.
+    :return: (sort_value, ticket_uuid)
+    """
+    try:
+        cursor_sort, sort_value, ticket_id = json.loads(
+            base64.urlsafe_b64decode(cursor)
+        )
+        position = datetime.fromisoformat(sort_value), UUID(ticket_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}")
+    if cursor_sort != sort.value:
+        raise InvalidCursorError(
+            f"The pagination cursor was created with sort={cursor_sort}, "
+            f"not sort={sort.value}"
+        )
+    return position
+
+
+async def count_tickets(db: AsyncSession, status: Optional[TicketStatus] = None) -> int:
+    """
+    Get the number of tickets (of a status) from the maintained counters,
+    instead of counting the rows of the tickets table.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        status (TicketStatus): Only count the tickets of this status (Optional).
+
+    Returns:
+        int: The number of tickets.
+    """
+    query = select(func.coalesce(func.sum(TicketCounter.count), 0))
+    if status is not None:
+        query = query.where(TicketCounter.status == status)
+    return await db.scalar(query)
+
+
+def rollup_bucket(period: StatsPeriod, date: datetime) -> str:
+    # The buckets are prefixes of the stored dates, which are naive UTC dates
+    if date.tzinfo is not None:
+        date = date.astimezone(timezone.utc).replace(tzinfo=None)
+    return date.strftime(ROLLUP_BUCKET_FORMATS[period])
+
+
+async def get_ticket_stats(
+    db: AsyncSession,
+    period: StatsPeriod = StatsPeriod.day,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 48,
+) -> TicketStats:
+    """
+    Get the number of tickets per status, and the number of tickets created and
+    closed per hour or per day, from the counters and the rollups maintained by
+    the triggers (a primary key range, whatever the number of tickets).
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        period (StatsPeriod): The length of the buckets (hour or day).
+        since (datetime): The first bucket is the one of this date (Optional).
+        until (datetime): The last bucket is the one of this date (Optional).
+        limit (int): The maximum number of buckets (the most recent ones).
+
+    Returns:
+        TicketStats: The counts by status, and the buckets with tickets, the
+        oldest first.
+    """
+    result = await db.execute(select(TicketCounter.status, TicketCounter.count))
+    by_status = {status: 0 for status in TicketStatus}
+    by_status.update(result.all())
+
+    query = select(TicketRollup.bucket, TicketRollup.created, TicketRollup.closed)
+    query = query.where(
+        TicketRollup.period == period,
+        or_(TicketRollup.created > 0, TicketRollup.closed > 0),
+    )
+    if since is not None:
+        query = query.where(TicketRollup.bucket >= rollup_bucket(period, since))
+    if until is not None:
+        query = query.where(TicketRollup.bucket <= rollup_bucket(period, until))
+    result = await db.execute(query.order_by(TicketRollup.bucket.desc()).limit(limit))
+    buckets = [
+        TicketStatsBucket(
+            start=datetime.strptime(bucket, ROLLUP_BUCKET_FORMATS[period]),
+            created=created,
+            closed=closed,
+        )
+        for bucket, created, closed in reversed(result.all())
+    ]
+    return TicketStats(
+        total=sum(by_status.values()),
+        by_status=by_status,
+        period=period,
+        buckets=buckets,
+    )
 
 
 async def get_all_tickets(
-    db: AsyncSession, skip: int = 0, limit: int = 10
-) -> TicketsResponseList:
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    filters: Optional[TicketFilter] = None,
+    sort: TicketSort = TicketSort.created_at,
+) -> dict:
     """
-    Retrieve a paginated list of tickets from the database.
+    Retrieve a filtered and paginated list of tickets from the database,
+    ordered by creation or update date (then ID).
+
+    Pages can be selected with skip, or with the cursor returned as next_cursor
+    by the previous page. The cursor mode seeks directly to the next ticket in
+    the (date, id) indexes, so any page costs the same as the first one.
 
     Args:
         db (AsyncSession): The async SQLAlchemy database session.
         skip (int): Number of tickets to skip (for pagination). Default is 0.
         limit (int): Maximum number of tickets to return. Default is 10.
+        cursor (str): Cursor of the page to get (skip is ignored) (Optional).
+        include_total (bool): If False, the total count is not returned.
+        filters (TicketFilter): The filters of the tickets (Optional).
+        sort (TicketSort): The order of the tickets. Default is created_at.
 
     Returns:
-        TicketsResponseList: A Pydantic object containing the total count,
-        pagination info, and tickets list.
+        dict: The total count, pagination info, tickets list (as plain dicts)
+        and the cursor of the next page, with the same keys as
+        TicketsResponseList.
+    """
+    # Get the total number of tickets: the counters can only count by status
+    total = None
+    if include_total:
+        if filters is None or filters.only_status:
+            total = await count_tickets(db, filters.status if filters else None)
+        else:
+            total = await db.scalar(
+                filter_tickets(select(func.count()).select_from(Ticket), filters)
+            )
+
+    # Get paginated tickets (one more ticket tells if there is a next page)
+    sort_column = getattr(Ticket, sort.column)
+    query = filter_tickets(select(*TICKET_OUT_COLUMNS), filters)
+    if sort.descending:
+        query = query.order_by(sort_column.desc(), Ticket.id.desc())
+    else:
+        query = query.order_by(sort_column, Ticket.id)
+    if cursor is not None:
+        sort_value, ticket_uuid = decode_cursor(cursor, sort)
+        skip = 0
+        position = tuple_(
+            literal(sort_value, sort_column.type),
+            literal(ticket_uuid, Ticket.id.type),
+        )
+        if sort.descending:
+            query = query.where(tuple_(sort_column, Ticket.id) < position)
+        else:
+            query = query.where(tuple_(sort_column, Ticket.id) > position)
+    result = await db.execute(query.offset(skip).limit(limit + 1))
+    tickets = result.fetchall()
+
+    next_cursor = None
+    if len(tickets) > limit:
+        tickets = tickets[:limit]
+        if tickets:
+            next_cursor = encode_cursor(sort, tickets[-1])
+
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "results": [dict(ticket._mapping) for ticket in tickets],
+        "next_cursor": next_cursor,
+    }
+
+
+async def stream_tickets(
+    db: AsyncSession,
+    filters: Optional[TicketFilter] = None,
+    chunk_size: int = TICKETS_EXPORT_CHUNK_SIZE,
+) -> AsyncIterator[List[Row]]:
+    """
+    Stream the tickets from a server-side cursor, ordered by creation date,
+    chunk_size rows at a time: only one chunk is held in memory.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        filters (TicketFilter, optional): Filters of the tickets.
+        chunk_size (int): The number of rows fetched at a time.
+
+    Yields:
+        List[Row]: The next chunk of tickets rows.
     """
-    # Get the total number of tickets
-    total = await db.scalar(select(func.count()).select_from(Ticket))
+    query = select(*TICKET_COLUMNS).order_by(Ticket.created_at, Ticket.id)
+    if filters is not None:
+        query = filter_tickets(query, filters)
 
-    # Get paginated tickets
-    result = await db.execute(select(Ticket).offset(skip).limit(limit))
-    rows = result.fetchall()
-    tickets = [row[0] for row in rows]
+    result = await db.stream(query.execution_options(yield_per=chunk_size))
+    async for rows in result.partitions():
+        yield rows
 
+
+def build_search_query(query: str) -> str:
+    """
+    Turn a user search query into an FTS5 query: every term is quoted (so that
+    the FTS5 syntax characters are searched literally) and all the terms must
+    match. A term ending with * matches the words starting with it.
+
+    :param query: the search query, e.g. "server down*"
+    :return: the FTS5 query, e.g. '"server" "down"*'
+    """
+    terms = []
+    for term in query.split():
+        is_prefix = term.endswith("*")
+        term = term.rstrip("*").replace('"', "")
+        if term:
+            terms.append(f'"{term}"*' if is_prefix else f'"{term}"')
+    if not terms:
+        raise InvalidSearchQueryError(f"The search query has no term: {query}")
+    return " ".join(terms)
+
+
+async def search_tickets(
+    db: AsyncSession, query: str, skip: int = 0, limit: int = 10
+) -> TicketsResponseList:
+    """
+    Search the tickets by title and description in the full-text index,
+    the best matches first (bm25 ranking, a title match weighs more than a
+    description match).
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        query (str): The searched terms (a term ending with * is a prefix).
+        skip (int): Number of tickets to skip (for pagination). Default is 0.
+        limit (int): Maximum number of tickets to return. Default is 10.
+
+    Returns:
+        TicketsResponseList: A Pydantic object containing the pagination info
+        and the found tickets (the total number of matches is not counted).
+    """
+    search_query = (
+        select(*TICKET_COLUMNS)
+        .select_from(TICKETS_FTS)
+        .join(Ticket, literal_column("tickets.rowid") == TICKETS_FTS.c.rowid)
+        .where(text("tickets_fts MATCH :query"))
+        .order_by(text("bm25(tickets_fts, 10.0, 1.0)"))
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(search_query, {"query": build_search_query(query)})
     return TicketsResponseList(
-        total=total,
         skip=skip,
         limit=limit,
-        results=[TicketOut.from_orm(ticket) for ticket in tickets],
+        results=[TicketOut.model_validate(ticket._mapping) for ticket in result],
     )
 
 
@@ -98,92 +620,406 @@ def validate_uuid(ticket_id):
         raise InvalidUUIDError(f"Invalid UUID format of ticket_id: {ticket_id}")
 
 
-async def get_ticket_by_id(db: AsyncSession, ticket_id: str) -> TicketOut:
+async def get_ticket_by_id(db: AsyncSession, ticket_id: str) -> dict:
     """
     Get a ticket by its ID if it exists.
 
+    The columns are selected as a plain tuple (no ORM instance nor Pydantic
+    model), and returned as a dict with the fields of TicketOut. The ticket is
+    cached (see cache.ticket_cache) until it is written, or for the TTL.
+
     Args:
         db (AsyncSession): The async SQLAlchemy database session.
         ticket_id (str): The ticket ID.
 
     Returns:
-        TicketOut: The ticket as a Pydantic model.
+        dict: The ticket columns, with the same keys as TicketOut.
     """
     ticket_uuid = validate_uuid(ticket_id)
-    result = await db.execute(select(Ticket).where(Ticket.id == ticket_uuid))
-    ticket = result.scalar_one_or_none()
+    cached_ticket = ticket_cache.get(ticket_uuid)
+    if cached_ticket is not None:
+        return dict(cached_ticket)
+
+    generation = ticket_cache.generation
+    result = await db.execute(
+        select(*TICKET_OUT_COLUMNS).where(Ticket.id == ticket_uuid)
+    )
+    ticket = result.first()
 
     if not ticket:
         raise NotFoundError("Ticket", ticket_id)
 
-    return TicketOut.from_orm(ticket)
+    ticket = dict(ticket._mapping)
+    ticket_cache.set(ticket_uuid, ticket, generation)
+    return dict(ticket)
+
+
+async def get_tickets_by_ids(
+    db: AsyncSession,
+    ticket_ids: List[UUID],
+    queued_tickets: Optional[Dict[UUID, dict]] = None,
+) -> TicketBatchGetResponse:
+    """
+    Get several tickets by their IDs, with a single WHERE id IN (...) query.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        ticket_ids (List[UUID]): The tickets IDs.
+        queued_tickets (Dict[UUID, dict], optional): The tickets with queued
+            writes (write-behind mode), returned instead of the stored ones.
+
+    Returns:
+        TicketBatchGetResponse: The found tickets, in the order of the IDs
+        (without duplicates), and the IDs of the missing tickets.
+    """
+    ticket_ids = list(dict.fromkeys(ticket_ids))
+    queued_tickets = queued_tickets or {}
+    stored_ids = [
+        ticket_id for ticket_id in ticket_ids if ticket_id not in queued_tickets
+    ]
+    tickets = {}
+    if stored_ids:
+        result = await db.execute(
+            select(*TICKET_COLUMNS).where(Ticket.id.in_(stored_ids))
+        )
+        tickets = {ticket.id: ticket._mapping for ticket in result}
+    tickets.update(queued_tickets)
+    return TicketBatchGetResponse(
+        results=[
+            TicketOut.model_validate(tickets[ticket_id])
+            for ticket_id in ticket_ids
+            if ticket_id in tickets
+        ],
+        missing=[ticket_id for ticket_id in ticket_ids if ticket_id not in tickets],
+    )
+
+
+async def get_ticket_status(db: AsyncSession, ticket_uuid: UUID):
+    """
+    Get the status of a ticket, or None if it doesn't exist.
+    Used to explain why a conditional write didn't match any ticket.
+    """
+    return await db.scalar(select(Ticket.status).where(Ticket.id == ticket_uuid))
+
+
+async def get_ticket_state(db: AsyncSession, ticket_uuid: UUID) -> Optional[Row]:
+    """
+    Get the status and the version of a ticket, or None if it doesn't exist.
+    Used to explain why a conditional write didn't match any ticket.
+    """
+    result = await db.execute(
+        select(Ticket.status, Ticket.version).where(Ticket.id == ticket_uuid)
+    )
+    return result.first()
+
+
+def check_version(
+    ticket_id: str, version: int, expected_versions: Optional[Collection[int]]
+):
+    if expected_versions is not None and version not in expected_versions:
+        raise VersionConflictError(
+            f"Ticket {ticket_id} was modified: its version is {version}."
+        )
 
 
 async def update_ticket_by_id(
-    db: AsyncSession, ticket_id: str, update_data: TicketUpdate
+    db: AsyncSession,
+    ticket_id: str,
+    update_data: TicketUpdate,
+    commit: bool = True,
+    expected_versions: Optional[Collection[int]] = None,
 ) -> TicketOut:
     """
     Update an existing ticket in the database, if it exists.
 
+    The update increments the version of the ticket. With expected_versions,
+    the version is checked in the WHERE clause of the same UPDATE (optimistic
+    concurrency): the ticket is only read again when the UPDATE fails.
+
     Args:
         db (AsyncSession): The async SQLAlchemy database session.
         ticket_id (str): The ticket ID.
         update_data (TicketUpdate): The new data of the ticket.
+        commit (bool): If False, the ticket is written in the transaction of the
+            caller, which commits it (see group_commit).
+        expected_versions (Collection[int], optional): The versions the ticket
+            must have (e.g. from an If-Match header).
 
     Returns:
         TicketOut: The updated ticket as a Pydantic model.
+
+    Raises:
+        NotFoundError: If the ticket doesn't exist.
+        VersionConflictError: If the ticket has another version.
     """
     ticket_uuid = validate_uuid(ticket_id)
-    result = await db.execute(select(Ticket).where(Ticket.id == ticket_uuid))
-    ticket = result.scalar_one_or_none()
-
-    if not ticket:
-        raise NotFoundError("Ticket", ticket_id)
+    conditions = [Ticket.id == ticket_uuid]
+    if expected_versions is not None:
+        conditions.append(Ticket.version.in_(expected_versions))
 
     # Update only the provided fields
-    if update_data.title is not None:
-        ticket.title = update_data.title
-    if update_data.description is not None:
-        ticket.description = update_data.description
-    if update_data.status is not None:
-        ticket.status = update_data.status
+    values = update_data.model_dump(exclude_none=True)
+    if values:
+        query = (
+            update(Ticket.__table__)
+            .where(*conditions)
+            .values({**values, "version": Ticket.version + 1})
+            .returning(*TICKET_COLUMNS)
+        )
+    else:
+        query = select(*TICKET_COLUMNS).where(*conditions)
 
-    await db.commit()
-    await db.refresh(ticket)
-    return TicketOut.from_orm(ticket)
+    result = await db.execute(query)
+    ticket = result.first()
+    if not ticket:
+        # The state is read in the transaction of the failed write, before the
+        # rollback: another write can't change it in between
+        state = None
+        if expected_versions is not None:
+            state = await get_ticket_state(db, ticket_uuid)
+        if commit:
+            await db.rollback()
+        if state is None:
+            raise NotFoundError("Ticket", ticket_id)
+        check_version(ticket_id, state.version, expected_versions)
+
+    if commit:
+        await db.commit()
+        tickets_written(ticket_uuid)
+    return TicketOut.model_validate(ticket._mapping)
 
 
 async def close_ticket_by_id(
     db: AsyncSession,
     ticket_id: str,
+    commit: bool = True,
+    expected_versions: Optional[Collection[int]] = None,
 ) -> TicketOut:
     """
     Close an existing ticket in the database, if it exists.
 
+    Only an open ticket can be closed: the transition (and the version, with
+    expected_versions) is checked in the WHERE clause of the UPDATE, and the
+    ticket state is read only when it fails.
+
     Args:
         db (AsyncSession): The async SQLAlchemy database session.
         ticket_id (str): The ticket ID.
+        commit (bool): If False, the ticket is written in the transaction of the
+            caller, which commits it (see group_commit).
+        expected_versions (Collection[int], optional): The versions the ticket
+            must have (e.g. from an If-Match header).
 
     Returns:
         TicketOut: The closed ticket as a Pydantic model.
+
+    Raises:
+        NotFoundError: If the ticket doesn't exist.
+        VersionConflictError: If the ticket has another version.
+        AlreadyClosedError: If the ticket is closed.
+        InvalidCloseTransitionError: If the ticket is stalled.
     """
     ticket_uuid = validate_uuid(ticket_id)
-    result = await db.execute(select(Ticket).where(Ticket.id == ticket_uuid))
-    ticket = result.scalar_one_or_none()
+    query = update(Ticket.__table__).where(
+        Ticket.id == ticket_uuid, Ticket.status == TicketStatus.open
+    )
+    if expected_versions is not None:
+        query = query.where(Ticket.version.in_(expected_versions))
+    result = await db.execute(
+        query.values(status=TicketStatus.closed, version=Ticket.version + 1).returning(
+            *TICKET_COLUMNS
+        )
+    )
+    ticket = result.first()
 
     if not ticket:
-        raise NotFoundError("Ticket", ticket_id)
+        # Read before the rollback, as in update_ticket_by_id
+        state = await get_ticket_state(db, ticket_uuid)
+        if commit:
+            await db.rollback()
+        if state is None:
+            raise NotFoundError("Ticket", ticket_id)
+        check_version(ticket_id, state.version, expected_versions)
+        status = state.status
+        if status == TicketStatus.closed:
+            raise AlreadyClosedError("Ticket is already closed.")
+        raise InvalidCloseTransitionError("Cannot close a stalled ticket.")
 
-    if ticket.status == TicketStatus.closed:
-        raise AlreadyClosedError("Ticket is already closed.")
+    if commit:
+        await db.commit()
+        tickets_written(ticket_uuid)
+    return TicketOut.model_validate(ticket._mapping)
 
-    if ticket.status == TicketStatus.stalled:
-        raise InvalidCloseTransitionError("Cannot close a stalled ticket.")
 
-    ticket.status = TicketStatus.closed
+# Why a ticket of this status can't be closed
+CLOSE_SKIP_REASONS = {
+    TicketStatus.closed: SkipReason.already_closed,
+    TicketStatus.stalled: SkipReason.stalled,
+}
+
+
+async def update_tickets(
+    db: AsyncSession,
+    selection: TicketSelection,
+    update_data: TicketUpdate,
+    max_items: int = TICKETS_BULK_MAX_ITEMS,
+) -> TicketBulkUpdateResponse:
+    """
+    Update several tickets, selected by IDs or by filter, with one set-based
+    UPDATE ... RETURNING statement.
+
+    A filter selection is processed max_items tickets at a time (in rowid
+    order), like a selection by IDs, so the transaction and the response stay
+    bounded: the response has a next_cursor while more tickets match, to send
+    back as the cursor of the selection.
+
+    When the update closes the tickets, the same transition rules as
+    close_ticket_by_id apply: only the open tickets are closed (the status
+    guard is in the WHERE clause), the closed and stalled ones are skipped.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        selection (TicketSelection): The IDs or the filter of the tickets.
+        update_data (TicketUpdate): The new data of the tickets.
+        max_items (int): The maximum number of tickets of a filter selection
+            processed by one call.
+
+    Returns:
+        TicketBulkUpdateResponse: The updated tickets IDs, the skipped tickets
+        with the reason why, and the cursor of the next tickets of the filter.
+
+    Raises:
+        InvalidCursorError: If the cursor of the selection is invalid.
+    """
+    values = update_data.model_dump(exclude_none=True)
+    closing = values.get("status") == TicketStatus.closed
+
+    query = update(Ticket.__table__).values({**values, "version": Ticket.version + 1})
+    skipped = []
+    next_cursor = None
+    if selection.ids is not None:
+        query = query.where(Ticket.id.in_(selection.ids))
+    else:
+        # The next tickets of the filter, read before the UPDATE (which changes
+        # the status of the closed ones)
+        after = decode_selection_cursor(selection.cursor) if selection.cursor else 0
+        result = await db.execute(
+            filter_tickets(
+                select(TICKET_ROWID, Ticket.id, Ticket.status), selection.filter
+            )
+            .where(TICKET_ROWID > after)
+            .order_by(TICKET_ROWID)
+            .limit(max_items)
+        )
+        selected = result.all()
+        if len(selected) == max_items:
+            next_cursor = encode_selection_cursor(selected[-1][0])
+        query = query.where(Ticket.id.in_([row[1] for row in selected]))
+        if closing:
+            skipped = [
+                TicketSkipped(id=ticket_id, reason=CLOSE_SKIP_REASONS[status])
+                for _, ticket_id, status in selected
+                if status != TicketStatus.open
+            ]
+
+    if closing:
+        query = query.where(Ticket.status == TicketStatus.open)
+
+    result = await db.execute(query.returning(Ticket.id))
+    updated_ids = list(result.scalars())
+
+    if selection.ids is not None and len(updated_ids) < len(set(selection.ids)):
+        not_updated = set(selection.ids) - set(updated_ids)
+        result = await db.execute(
+            select(Ticket.id, Ticket.status).where(Ticket.id.in_(not_updated))
+        )
+        statuses = dict(result.all())
+        skipped = [
+            TicketSkipped(
+                id=ticket_id,
+                reason=CLOSE_SKIP_REASONS[statuses[ticket_id]]
+                if ticket_id in statuses
+                else SkipReason.not_found,
+            )
+            for ticket_id in selection.ids
+            if ticket_id in not_updated
+        ]
+
+    await db.commit()
+    ticket_cache.invalidate(*updated_ids)
+    return TicketBulkUpdateResponse(
+        updated=len(updated_ids),
+        updated_ids=updated_ids,
+        skipped=skipped,
+        next_cursor=next_cursor,
+    )
+
+
+async def close_tickets(
+    db: AsyncSession, selection: TicketSelection
+) -> TicketBulkUpdateResponse:
+    """
+    Close several open tickets, selected by IDs or by filter.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        selection (TicketSelection): The IDs or the filter of the tickets.
+
+    Returns:
+        TicketBulkUpdateResponse: The closed tickets IDs, and the skipped
+        tickets with the reason why (not found, already closed or stalled).
+    """
+    return await update_tickets(db, selection, TicketUpdate(status=TicketStatus.closed))
+
+
+async def apply_ticket_writes(db: AsyncSession, writes: List[TicketWrite]) -> int:
+    """
+    Apply the writes of the write-behind journal in one transaction.
+
+    Each write sets the values it carries (including its dates and version). An
+    update or a close only matches the version it was queued against (its own
+    version minus one), so applying a write twice, e.g. when the journal is
+    replayed after a crash that happened after the commit, changes nothing, and
+    a write queued against an outdated version can't overwrite a newer one. A
+    ticket already created is ignored. The consecutive creations are inserted
+    by one executemany.
+
+    Args:
+        db (AsyncSession): The async SQLAlchemy database session.
+        writes (List[TicketWrite]): The writes, in the order of the journal.
+
+    Returns:
+        int: The number of applied writes (the skipped updates and closes are
+        not counted).
+    """
+    applied = 0
+    for operation, group in groupby(writes, key=lambda write: write.operation):
+        group = list(group)
+        if operation == WriteOperation.create:
+            await db.execute(
+                insert(Ticket.__table__).prefix_with("OR IGNORE"),
+                [
+                    {**write.model_dump(exclude={"seq", "operation"}), "version": 1}
+                    for write in group
+                ],
+            )
+            applied += len(group)
+            continue
+        for write in group:
+            values = write.model_dump(
+                exclude={"seq", "operation", "id", "created_at"}, exclude_none=True
+            )
+            query = update(Ticket.__table__).where(Ticket.id == write.id)
+            if write.version is not None:
+                query = query.where(Ticket.version == write.version - 1)
+            if operation == WriteOperation.close:
+                query = query.where(Ticket.status == TicketStatus.open)
+            result = await db.execute(query.values(values))
+            applied += result.rowcount
+
     await db.commit()
-    await db.refresh(ticket)
-    return TicketOut.from_orm(ticket)
+    tickets_written(*(write.id for write in writes))
+    return applied
 
 
 async def delete_ticket_by_id(
@@ -202,35 +1038,64 @@ async def delete_ticket_by_id(
     """
     ticket_uuid = validate_uuid(ticket_id)
 
-    result = await db.execute(select(Ticket).where(Ticket.id == ticket_uuid))
-    ticket = result.scalar_one_or_none()
-
-    if not ticket:
-        raise NotFoundError("Ticket", ticket_id)
+    query = delete(Ticket).where(Ticket.id == ticket_uuid)
+    if not force_delete:
+        query = query.where(Ticket.status == TicketStatus.closed)
+    result = await db.execute(query.returning(Ticket.id))
 
-    if ticket.status != TicketStatus.closed and not force_delete:
+    if not result.first():
+        status = await get_ticket_status(db, ticket_uuid)
+        await db.rollback()
+        if status is None:
+            raise NotFoundError("Ticket", ticket_id)
         raise InvalidCloseTransitionError("Cannot delete not closed ticket.")
 
-    await db.delete(ticket)
     await db.commit()
+    ticket_cache.invalidate(ticket_uuid)
 
 
-async def delete_tickets(db: AsyncSession, force_delete: bool = False):
+async def delete_tickets(
+    db: AsyncSession,
+    force_delete: bool = False,
+    batch_size: int = TICKETS_DELETE_BATCH_SIZE,
+    on_progress: Optional[Callable[[int], None]] = None,
+):
     """
     Delete all tickets that are closed, or all tickets if force_delete is True.
 
+    The tickets are deleted in batches of batch_size rows, each one in its own
+    transaction, so the SQLite write lock is released between the batches and
+    the other writers can interleave.
+
     Args:
         db (AsyncSession): The async SQLAlchemy session.
         force_delete (bool): If True, delete all tickets regardless of status.
+        batch_size (int): The maximum number of tickets deleted per transaction.
+        on_progress (Callable[[int], None], optional): Called with the number
+            of deleted tickets after every batch.
 
     Returns:
         dict: total number of deleted tickets and total number of tickets.
     """
-    query = delete(Ticket)
+    batch = select(TICKET_ROWID).select_from(Ticket.__table__)
     if not force_delete:
-        query = query.where(Ticket.status == TicketStatus.closed)
+        batch = batch.where(Ticket.status == TicketStatus.closed)
+    query = delete(Ticket).where(
+        TICKET_ROWID.in_(batch.limit(batch_size).scalar_subquery())
+    )
 
-    result = await db.execute(query)
-    await db.commit()
-    total_tickets = await db.scalar(select(func.count()).select_from(Ticket))
-    return {"delete_count": result.rowcount, "total_count": total_tickets}
+    delete_count = 0
+    while True:
+        result = await db.execute(query)
+        await db.commit()
+        ticket_cache.clear()
+        delete_count += result.rowcount
+        if on_progress is not None:
+            on_progress(delete_count)
+        if result.rowcount < batch_size:
+            break
+        # Let the other requests run between two batches
+        await asyncio.sleep(0)
+
+    total_tickets = await count_tickets(db)
+    return {"delete_count": delete_count, "total_count": total_tickets}
@@ -0,0 +1,352 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Collection, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy.orm import sessionmaker
+
+from app.config.settings import (
+    TICKETS_WRITE_BEHIND_BATCH_SIZE,
+    TICKETS_WRITE_BEHIND_FSYNC,
+    TICKETS_WRITE_BEHIND_INTERVAL_MS,
+    TICKETS_WRITE_BEHIND_JOURNAL,
+)
+from app.crud import tickets_crud
+from app.crud.exceptions import AlreadyClosedError, InvalidCloseTransitionError
+from app.schemas.tickets import (
+    TicketStatus,
+    TicketUpdate,
+    TicketWrite,
+    WriteOperation,
+)
+
+
+class WriteBehindQueue:
+    """
+    Write-behind queue of the single-ticket writes.
+
+    A write is validated against the current ticket, appended to the journal (a
+    local NDJSON file, one TicketWrite per line) and acknowledged at once. The
+    drainer task applies the queued writes to SQLite in large transactions
+    (see tickets_crud.apply_ticket_writes). An acknowledged write is never
+    dropped: a batch the database rejects stays queued, and is retried.
+
+    To drain, the journal is renamed to <journal>.draining and a new journal is
+    opened for the next writes; the draining file is removed once its writes
+    are committed. At startup, the files left by a crash are replayed (the
+    writes are idempotent, so a write already committed is applied again
+    harmlessly).
+
+    Until its writes are committed, a ticket is served from an overlay of the
+    queued tickets, so a client reads its own writes by ticket ID (the lists
+    and searches only see the committed tickets). A ticket leaves the overlay
+    when its writes are committed, or when it is deleted; a write checked
+    against a ticket read from the database while one of them happened reads
+    it again.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        read_session_factory: sessionmaker,
+        path: str = TICKETS_WRITE_BEHIND_JOURNAL,
+        interval: float = TICKETS_WRITE_BEHIND_INTERVAL_MS / 1000,
+        batch_size: int = TICKETS_WRITE_BEHIND_BATCH_SIZE,
+        fsync: bool = TICKETS_WRITE_BEHIND_FSYNC,
+    ):
+        self.session_factory = session_factory
+        self.read_session_factory = read_session_factory
+        self.path = path
+        self.draining_path = f"{path}.draining"
+        self.interval = interval
+        self.batch_size = max(batch_size, 1)
+        self.fsync = fsync
+        self.seq = 0
+        # The writes of the journal, and of the draining file
+        self.entries: List[TicketWrite] = []
+        self.draining: Optional[List[TicketWrite]] = None
+        # The queued tickets by ID, with the seq of their last write
+        self.overlay: Dict[UUID, Tuple[int, dict]] = {}
+        self.file = None
+        self.lock = asyncio.Lock()
+        self.wakeup = asyncio.Event()
+        self.stopping = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.applied = self.skipped = self.replayed = 0
+        # Incremented whenever tickets leave the overlay
+        self.overlay_changes = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self.entries) + len(self.draining or [])
+
+    async def start(self):
+        """Replay the journal left by the previous process, then start draining."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        await self.replay()
+        self.file = open(self.path, "ab", buffering=0)
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Apply the queued writes, then stop the drainer task."""
+        if self.task is None:
+            return
+        self.stopping.set()
+        self.wakeup.set()
+        await self.task
+        self.task = None
+        await self.flush()
+        self.file.close()
+        if not self.pending:
+            os.remove(self.path)
+
+    async def replay(self):
+        writes = []
+        for path in (self.draining_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as file:
+                for line in file:
+                    try:
+                        writes.append(TicketWrite.model_validate_json(line))
+                    except ValidationError:
+                        # The last line may be torn by a crash during the append
+                        continue
+        await self.apply(writes)
+        self.replayed = len(writes)
+        for path in (self.draining_path, self.path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def run(self):
+        while not self.stopping.is_set():
+            await self.wakeup.wait()
+            if len(self.entries) < self.batch_size:
+                # Let the burst of writes build a larger batch
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+            self.wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Cannot apply the queued ticket writes, because of {e}")
+                await asyncio.sleep(self.interval)
+                self.wakeup.set()
+
+    async def flush(self):
+        """Apply all the queued writes (e.g. before a write that bypasses the queue)."""
+        async with self.lock:
+            while self.draining or self.entries:
+                if self.draining is None:
+                    self.rotate()
+                await self.apply(self.draining)
+                os.remove(self.draining_path)
+                self.draining = None
+
+    def rotate(self):
+        self.file.close()
+        os.replace(self.path, self.draining_path)
+        self.file = open(self.path, "ab", buffering=0)
+        self.draining, self.entries = self.entries, []
+
+    async def apply(self, writes: List[TicketWrite]):
+        for start in range(0, len(writes), self.batch_size):
+            batch = writes[start : start + self.batch_size]
+            async with self.session_factory() as db:
+                applied = await tickets_crud.apply_ticket_writes(db, batch)
+            # The writes already applied before a crash, or queued against an
+            # outdated version, are skipped
+            self.applied += applied
+            self.skipped += len(batch) - applied
+            for write in batch:
+                queued = self.overlay.get(write.id)
+                if queued is not None and queued[0] <= write.seq:
+                    del self.overlay[write.id]
+            self.overlay_changes += 1
+
+    def append(self, write: TicketWrite, ticket: dict):
+        self.seq += 1
+        write.seq = self.seq
+        self.file.write(write.model_dump_json(exclude_none=True).encode() + b"\n")
+        if self.fsync:
+            os.fsync(self.file.fileno())
+        self.entries.append(write)
+        self.overlay[write.id] = (write.seq, ticket)
+        self.wakeup.set()
+
+    def get_ticket(self, ticket_uuid: UUID) -> Optional[dict]:
+        """Get a queued ticket, or None if the ticket has no queued write."""
+        queued = self.overlay.get(ticket_uuid)
+        return dict(queued[1]) if queued is not None else None
+
+    def forget_ticket(self, ticket_uuid: UUID):
+        """
+        Remove a deleted ticket from the overlay: its writes still queued match
+        no row when they are applied.
+        """
+        self.overlay.pop(ticket_uuid, None)
+        self.overlay_changes += 1
+
+    async def current_ticket(self, ticket_id: str) -> dict:
+        ticket_uuid = tickets_crud.validate_uuid(ticket_id)
+        while True:
+            ticket = self.get_ticket(ticket_uuid)
+            if ticket is not None:
+                return ticket
+            overlay_changes = self.overlay_changes
+            async with self.read_session_factory() as db:
+                ticket = await tickets_crud.get_ticket_by_id(db, ticket_id)
+            # A write of the ticket may have been queued during the read
+            queued = self.get_ticket(ticket_uuid)
+            if queued is not None:
+                return queued
+            # Otherwise, the row read is current unless a write of the ticket
+            # was committed (or the ticket deleted) during the read
+            if self.overlay_changes == overlay_changes:
+                return ticket
+
+    def create_ticket(
+        self,
+        title: str,
+        description: Optional[str] = None,
+        status: Optional[TicketStatus] = None,
+    ) -> dict:
+        """
+        Queue the creation of a ticket.
+
+        Args:
+            title (str): The title of the ticket.
+            description (str): The description of the ticket (Optional).
+            status (TicketStatus): The status of the ticket (Optional).
+
+        Returns:
+            dict: The ticket, as it will be created.
+
+        Raises:
+            MissingValueError: If a required value is missing (checked before
+                the write is queued, so the database doesn't reject it later).
+        """
+        ticket = tickets_crud.new_ticket_values(title, description, status)
+        self.append(
+            TicketWrite(operation=WriteOperation.create, **ticket), dict(ticket)
+        )
+        return ticket
+
+    async def update_ticket(
+        self,
+        ticket_id: str,
+        update_data: TicketUpdate,
+        expected_versions: Optional[Collection[int]] = None,
+    ) -> dict:
+        """
+        Queue the update of an existing ticket.
+
+        Args:
+            ticket_id (str): The ticket ID.
+            update_data (TicketUpdate): The new data of the ticket.
+            expected_versions (Collection[int], optional): The versions the
+                ticket must have (e.g. from an If-Match header).
+
+        Returns:
+            dict: The ticket, as it will be updated.
+
+        Raises:
+            NotFoundError: If the ticket doesn't exist.
+            VersionConflictError: If the ticket has another version.
+        """
+        ticket = await self.current_ticket(ticket_id)
+        tickets_crud.check_version(ticket_id, ticket["version"], expected_versions)
+        values = update_data.model_dump(exclude_none=True)
+        if values:
+            values["updated_at"] = datetime.utcnow()
+            values["version"] = ticket["version"] + 1
+            ticket.update(values)
+            self.append(
+                TicketWrite(operation=WriteOperation.update, id=ticket["id"], **values),
+                dict(ticket),
+            )
+        return ticket
+
+    async def close_ticket(
+        self, ticket_id: str, expected_versions: Optional[Collection[int]] = None
+    ) -> dict:
+        """
+        Queue the closing of an open ticket.
+
+        Args:
+            ticket_id (str): The ticket ID.
+            expected_versions (Collection[int], optional): The versions the
+                ticket must have (e.g. from an If-Match header).
+
+        Returns:
+            dict: The ticket, as it will be closed.
+
+        Raises:
+            NotFoundError: If the ticket doesn't exist.
+            VersionConflictError: If the ticket has another version.
+            AlreadyClosedError: If the ticket is closed.
+            InvalidCloseTransitionError: If the ticket is stalled.
+        """
+        ticket = await self.current_ticket(ticket_id)
+        tickets_crud.check_version(ticket_id, ticket["version"], expected_versions)
+        if ticket["status"] == TicketStatus.closed:
+            raise AlreadyClosedError("Ticket is already closed.")
+        if ticket["status"] != TicketStatus.open:
+            raise InvalidCloseTransitionError("Cannot close a stalled ticket.")
+        ticket.update(
+            status=TicketStatus.closed,
+            updated_at=datetime.utcnow(),
+            version=ticket["version"] + 1,
+        )
+        self.append(
+            TicketWrite(
+                operation=WriteOperation.close,
+                id=ticket["id"],
+                status=ticket["status"],
+                updated_at=ticket["updated_at"],
+                version=ticket["version"],
+            ),
+            dict(ticket),
+        )
+        return ticket
+
+
+# The queue of the process, when TICKETS_WRITE_BEHIND is enabled
+queue: Optional[WriteBehindQueue] = None
+
+
+async def start_write_behind(
+    session_factory: sessionmaker, read_session_factory: sessionmaker, **kwargs
+) -> WriteBehindQueue:
+    global queue
+    queue = WriteBehindQueue(session_factory, read_session_factory, **kwargs)
+    await queue.start()
+    return queue
+
+
+async def stop_write_behind():
+    global queue
+    if queue is not None:
+        await queue.stop()
+        queue = None
+
+
+async def flush_write_behind():
+    """Apply the queued writes, if the write-behind mode is enabled."""
+    if queue is not None:
+        await queue.flush()
+
+
+def forget_ticket(ticket_uuid: UUID):
+    """Remove a deleted ticket from the queue, if the write-behind mode is enabled."""
+    if queue is not None:
+        queue.forget_ticket(ticket_uuid)
+
+
+def queued_ticket(ticket_uuid: UUID) -> Optional[dict]:
+    """Get a ticket with queued writes, if the write-behind mode is enabled."""
+    return queue.get_ticket(ticket_uuid) if queue is not None else None
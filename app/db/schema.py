@@ -0,0 +1,313 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.models.models import Base
+from app.schemas.tickets import StatsPeriod, TicketStatus
+
+# Columns added to existing tables (create_all only creates the missing tables)
+ADDED_COLUMNS = {
+    "tickets": {"version": "INTEGER NOT NULL DEFAULT 1"},
+}
+
+# Columns whose type changed, by table: SQLite can't alter a column, so the
+# tables of the existing databases are rebuilt. The ticket IDs were declared
+# UUID, a NUMERIC affinity which stores IDs such as "1234e567..." as numbers.
+RETYPED_COLUMNS = {
+    "tickets": ["id"],
+}
+
+# Indexes replaced by wider ones, dropped from the existing databases
+OBSOLETE_INDEXES = ["ix_tickets_status_created_at"]
+
+# Triggers replaced or removed, dropped from the existing databases (the
+# rollups no longer forget the deleted tickets)
+OBSOLETE_TRIGGERS = ["tickets_rollups_delete", "tickets_rollups_update"]
+
+# The counters are updated by triggers, so they change in the same transaction
+# as every write on the tickets table, whatever statement performs it.
+TICKET_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_counters_insert
+    AFTER INSERT ON tickets BEGIN
+        UPDATE ticket_counters SET count = count + 1 WHERE status = NEW.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_counters_delete
+    AFTER DELETE ON tickets BEGIN
+        UPDATE ticket_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_counters_update
+    AFTER UPDATE OF status ON tickets WHEN OLD.status <> NEW.status BEGIN
+        UPDATE ticket_counters SET count = count - 1 WHERE status = OLD.status;
+        UPDATE ticket_counters SET count = count + 1 WHERE status = NEW.status;
+    END
+    """,
+]
+
+# The version of the tickets data is bumped by triggers as well, so the writes
+# made outside the API (e.g. by the import CLI) outdate the ETags and caches.
+TICKETS_VERSION_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_version_{event.lower()}
+    AFTER {event} ON tickets BEGIN
+        UPDATE tickets_version SET counter = counter + 1 WHERE id = 1;
+    END
+    """
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+# The status changes are counted by a trigger too. Unlike the counters, they
+# are a history: a deleted ticket keeps its transitions, and they can't be
+# recomputed from the tickets.
+TICKET_TRANSITION_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_transitions_update
+    AFTER UPDATE OF status ON tickets WHEN OLD.status <> NEW.status BEGIN
+        INSERT INTO ticket_transitions (from_status, to_status, count)
+        VALUES (OLD.status, NEW.status, 1)
+        ON CONFLICT (from_status, to_status) DO UPDATE SET count = count + 1;
+    END
+    """,
+]
+
+# Length of the date prefix of every rollup period: the dates are stored as
+# "YYYY-MM-DD HH:MM:SS.ffffff" strings, so a bucket is a substr() of the date
+ROLLUP_BUCKETS = {StatsPeriod.hour: 13, StatsPeriod.day: 10}
+
+# The date of a ticket being closed (by an update, or created closed)
+CLOSED_AT = "coalesce({row}.updated_at, {row}.created_at)"
+
+
+def rollup_upsert(row: str, column: str, date: str, condition: str = "1") -> str:
+    return "\n".join(
+        f"""
+        INSERT INTO ticket_rollups (period, bucket, created, closed)
+        SELECT '{period.name}', substr({date.format(row=row)}, 1, {length}),
+            {int(column == "created")}, {int(column == "closed")}
+        WHERE {condition}
+        ON CONFLICT (period, bucket) DO UPDATE SET {column} = {column} + 1;"""
+        for period, length in ROLLUP_BUCKETS.items()
+    )
+
+
+# The rollups behind GET /tickets/stats are updated by triggers too, so every
+# write of the tickets table updates a few buckets in its own transaction. Like
+# the transitions, they count events: a creation, and a closing in the bucket
+# of its date; deleting the ticket later doesn't erase them.
+TICKET_ROLLUP_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_rollups_insert
+    AFTER INSERT ON tickets BEGIN
+        {rollup_upsert("NEW", "created", "{row}.created_at")}
+        {rollup_upsert("NEW", "closed", CLOSED_AT, "NEW.status = 'closed'")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_rollups_close
+    AFTER UPDATE OF status ON tickets
+    WHEN OLD.status <> 'closed' AND NEW.status = 'closed' BEGIN
+        {rollup_upsert("NEW", "closed", CLOSED_AT)}
+    END
+    """,
+]
+
+
+# Full-text index of the tickets titles and descriptions. It is an external
+# content table: the text is read from the tickets table, and the index is kept
+# in sync by triggers, matching the tickets by rowid. VACUUM can renumber the
+# rowids of the tickets table, so rebuild the index after running it with:
+# INSERT INTO tickets_fts(tickets_fts) VALUES('rebuild')
+TICKETS_FTS = """
+    CREATE VIRTUAL TABLE tickets_fts USING fts5(
+        title, description,
+        content='tickets', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+"""
+
+TICKETS_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_fts_insert
+    AFTER INSERT ON tickets BEGIN
+        INSERT INTO tickets_fts (rowid, title, description)
+        VALUES (NEW.rowid, NEW.title, NEW.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_fts_delete
+    AFTER DELETE ON tickets BEGIN
+        INSERT INTO tickets_fts (tickets_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_fts_update
+    AFTER UPDATE OF title, description ON tickets BEGIN
+        INSERT INTO tickets_fts (tickets_fts, rowid, title, description)
+        VALUES ('delete', OLD.rowid, OLD.title, OLD.description);
+        INSERT INTO tickets_fts (rowid, title, description)
+        VALUES (NEW.rowid, NEW.title, NEW.description);
+    END
+    """,
+]
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create the full-text index of the tickets, indexing the existing ones."""
+    exists = connection.execute(
+        text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tickets_fts'"
+        )
+    ).first()
+    if not exists:
+        connection.execute(text(TICKETS_FTS))
+        connection.execute(
+            text("INSERT INTO tickets_fts (tickets_fts) VALUES ('rebuild')")
+        )
+    for trigger in TICKETS_FTS_TRIGGERS:
+        connection.execute(text(trigger))
+
+
+def add_missing_columns(connection: Connection) -> None:
+    """Add the new columns to the tables of an existing database."""
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {
+            row[1] for row in connection.execute(text(f"PRAGMA table_info({table})"))
+        }
+        for column, definition in columns.items():
+            if column not in existing:
+                connection.execute(
+                    text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                )
+
+
+def rebuild_retyped_tables(connection: Connection) -> None:
+    """
+    Rebuild the tables of an existing database whose columns were declared with
+    another type: the rows are copied, with their rowids (which the full-text
+    index refers to), into the table created from the model. The triggers and
+    indexes of the old table are dropped, create_schema creates them again.
+    """
+    for table_name, column_names in RETYPED_COLUMNS.items():
+        table = Base.metadata.tables[table_name]
+        declared = {
+            row[1]: row[2]
+            for row in connection.execute(text(f"PRAGMA table_info({table_name})"))
+        }
+        expected = {
+            name: table.c[name].type.compile(dialect=connection.dialect)
+            for name in column_names
+        }
+        if all(declared.get(name, "").upper() == expected[name] for name in expected):
+            continue
+
+        for object_type, name in connection.execute(
+            text(
+                "SELECT type, name FROM sqlite_master WHERE tbl_name = :table "
+                "AND type IN ('trigger', 'index') AND sql IS NOT NULL"
+            ),
+            {"table": table_name},
+        ).all():
+            connection.execute(text(f"DROP {object_type.upper()} {name}"))
+        connection.execute(
+            text(f"ALTER TABLE {table_name} RENAME TO {table_name}_rebuild")
+        )
+        table.create(connection)
+        columns = ", ".join(name for name in declared if name in table.c)
+        connection.execute(
+            text(
+                f"INSERT INTO {table_name} (rowid, {columns}) "
+                f"SELECT rowid, {columns} FROM {table_name}_rebuild"
+            )
+        )
+        connection.execute(text(f"DROP TABLE {table_name}_rebuild"))
+
+
+def rebuild_ticket_counters(connection: Connection) -> None:
+    """Recount the tickets of every status (one scan of the status index)."""
+    connection.execute(text("DELETE FROM ticket_counters"))
+    connection.execute(
+        text(
+            "INSERT INTO ticket_counters (status, count) "
+            "SELECT status, count(*) FROM tickets GROUP BY status"
+        )
+    )
+    for status in TicketStatus:
+        connection.execute(
+            text(
+                "INSERT OR IGNORE INTO ticket_counters (status, count) "
+                "VALUES (:status, 0)"
+            ),
+            {"status": status.name},
+        )
+
+
+def rebuild_ticket_rollups(connection: Connection) -> None:
+    """
+    Recompute the created and closed tickets of every bucket from the tickets.
+
+    The result is approximate: the deleted tickets are no longer counted, and a
+    closed ticket counts in the bucket of its last update, not of its closing.
+    """
+    connection.execute(text("DELETE FROM ticket_rollups"))
+    for period, length in ROLLUP_BUCKETS.items():
+        connection.execute(
+            text(
+                "INSERT INTO ticket_rollups (period, bucket, created, closed) "
+                f"SELECT :period, substr(created_at, 1, {length}), count(*), 0 "
+                "FROM tickets GROUP BY 2"
+            ),
+            {"period": period.name},
+        )
+        connection.execute(
+            text(
+                "INSERT INTO ticket_rollups (period, bucket, created, closed) "
+                f"SELECT :period, substr({CLOSED_AT.format(row='tickets')}, 1, "
+                f"{length}), 0, count(*) FROM tickets WHERE status = 'closed' "
+                "GROUP BY 2 "
+                "ON CONFLICT (period, bucket) DO UPDATE SET closed = excluded.closed"
+            ),
+            {"period": period.name},
+        )
+
+
+def create_schema(connection: Connection) -> None:
+    """
+    Create the missing tables, columns, indexes, triggers and the full-text index.
+
+    `create_all` skips the tables that already exist together with their
+    columns and indexes, so the tables with retyped columns are rebuilt, and
+    the columns and indexes added to an existing table are created one by one.
+    The counters are rebuilt, in case the tickets were written without triggers,
+    and the rollups are computed once for the tickets created before them.
+    """
+    Base.metadata.create_all(connection)
+    rebuild_retyped_tables(connection)
+    add_missing_columns(connection)
+    for index_name in OBSOLETE_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    for trigger_name in OBSOLETE_TRIGGERS:
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {trigger_name}"))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    connection.execute(
+        text(
+            "INSERT OR IGNORE INTO tickets_version (id, nonce, counter) "
+            "VALUES (1, lower(hex(randomblob(8))), 0)"
+        )
+    )
+    for trigger in TICKET_TRIGGERS + TICKETS_VERSION_TRIGGERS:
+        connection.execute(text(trigger))
+    rollups_exist = connection.execute(
+        text("SELECT 1 FROM ticket_rollups LIMIT 1")
+    ).first()
+    for trigger in TICKET_ROLLUP_TRIGGERS + TICKET_TRANSITION_TRIGGERS:
+        connection.execute(text(trigger))
+    rebuild_ticket_counters(connection)
+    if not rollups_exist:
+        rebuild_ticket_rollups(connection)
+    create_search_index(connection)
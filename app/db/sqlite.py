@@ -1,27 +1,84 @@
 import asyncio
 
-from sqlalchemy import text
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.config.settings import SQLITE_DATABASE_URL
+from app.config.settings import (
+    SQLITE_DATABASE_URL,
+    SQLITE_PRAGMAS,
+    SQLITE_READ_MAX_OVERFLOW,
+    SQLITE_READ_POOL_SIZE,
+)
 
 
 class SqliteDatabase:
+    # Writer: a single serialized connection (SQLite has only one write lock)
     engine: AsyncEngine = None
     async_session: sessionmaker = None
+    # Readers: a pool of read-only connections, never queued behind writes
+    read_engine: AsyncEngine = None
+    read_session: sessionmaker = None
 
 
 database = SqliteDatabase()
 
 
+def is_memory_database(database_url: str) -> bool:
+    return ":memory:" in database_url or database_url.endswith("://")
+
+
+def build_engine(
+    database_url: str = SQLITE_DATABASE_URL,
+    pragmas: dict = None,
+    pool_size: int = 1,
+    max_overflow: int = 0,
+    read_only: bool = False,
+) -> AsyncEngine:
+    """
+    Create an async engine that applies the storage profile PRAGMAs
+    on every new SQLite connection.
+    """
+    pragmas = dict(SQLITE_PRAGMAS if pragmas is None else pragmas)
+    if read_only:
+        pragmas["query_only"] = "ON"
+    engine_options = {"future": True}
+    # The in-memory database lives in a single shared connection (StaticPool)
+    if not is_memory_database(database_url):
+        engine_options["pool_size"] = pool_size
+        engine_options["max_overflow"] = max_overflow
+    engine = create_async_engine(database_url, **engine_options)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas.items():
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        cursor.close()
+
+    return engine
+
+
 async def create_sqlite_connection(retries=10, delay=2):
     for attempt in range(retries):
         try:
-            database.engine = create_async_engine(SQLITE_DATABASE_URL, future=True)
+            database.engine = build_engine(pool_size=1, max_overflow=0)
+            if is_memory_database(SQLITE_DATABASE_URL):
+                # Every connection to ":memory:" opens a new empty database,
+                # so readers have to share the writer connection.
+                database.read_engine = database.engine
+            else:
+                database.read_engine = build_engine(
+                    pool_size=SQLITE_READ_POOL_SIZE,
+                    max_overflow=SQLITE_READ_MAX_OVERFLOW,
+                    read_only=True,
+                )
             database.async_session = sessionmaker(
                 database.engine, expire_on_commit=False, class_=AsyncSession
             )
+            database.read_session = sessionmaker(
+                database.read_engine, expire_on_commit=False, class_=AsyncSession
+            )
             # Test the connection with the SQLITE database
             async with database.engine.connect() as conn:
                 await conn.execute(text("SELECT 1"))
@@ -36,6 +93,8 @@ async def create_sqlite_connection(retries=10, delay=2):
 async def close_sqlite_connection():
     if database.engine:
         try:
+            if database.read_engine not in (None, database.engine):
+                await database.read_engine.dispose()
             await database.engine.dispose()
             print("The SQLITE connection is closed")
         except Exception as e:
@@ -48,3 +107,19 @@ async def get_db() -> AsyncSession:
         raise RuntimeError("SQLITE database is not connected")
     async with database.async_session() as session:
         yield session
+
+
+# Dependency of the routers that only read tickets (read-only connection pool)
+async def get_read_db() -> AsyncSession:
+    if not database.read_session:
+        raise RuntimeError("SQLITE database is not connected")
+    async with database.read_session() as session:
+        yield session
+
+
+# Dependency of the routers that write tickets (single writer connection)
+async def get_write_db() -> AsyncSession:
+    if not database.async_session:
+        raise RuntimeError("SQLITE database is not connected")
+    async with database.async_session() as session:
+        yield session
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 
+from app.config.settings import TICKETS_GROUP_COMMIT, TICKETS_WRITE_BEHIND
+from app.crud import group_commit, write_behind
+from app.db.schema import create_schema
 from app.db.sqlite import close_sqlite_connection, create_sqlite_connection, database
-from app.models.models import Base
 from app.routers import tickets_api
 
 app = FastAPI(
@@ -17,11 +19,20 @@ app = FastAPI(
 async def on_startup():
     await create_sqlite_connection()
     async with database.engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_schema)
+    if TICKETS_GROUP_COMMIT:
+        group_commit.start_group_commit(database.async_session)
+    if TICKETS_WRITE_BEHIND:
+        # Replays the writes left in the journal before serving requests
+        await write_behind.start_write_behind(
+            database.async_session, database.read_session
+        )
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
+    await write_behind.stop_write_behind()
+    await group_commit.stop_group_commit()
     await close_sqlite_connection()
 
 
@@ -1,26 +1,36 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, String, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text, Uuid
 from sqlalchemy.ext.declarative import declarative_base
 
-from app.schemas.tickets import TicketStatus
+from app.schemas.tickets import StatsPeriod, TicketStatus
 
 Base = declarative_base()
 
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Serve the stable (date, id) orderings of the keyset pagination,
+        # and the date ranges filters
+        Index("ix_tickets_created_at_id", "created_at", "id"),
+        Index("ix_tickets_updated_at_id", "updated_at", "id"),
+        # Serve the status filters (leftmost column) with the same orderings
+        Index("ix_tickets_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_tickets_status_updated_at_id", "status", "updated_at", "id"),
+    )
 
+    # CHAR(32) gives the hex IDs a TEXT affinity in SQLite (the UUID type name has
+    # a NUMERIC affinity, which stores IDs such as "1234e567..." as numbers)
     id = Column(
-        UUID(as_uuid=True),
+        Uuid(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
         unique=True,
         nullable=False,
     )
-    title = Column(String(100), nullable=False)
+    title = Column(String(100), nullable=False, index=True)
     description = Column(Text, nullable=False)
     status = Column(Enum(TicketStatus), nullable=False, default=TicketStatus.open)
     created_at = Column(
@@ -29,3 +39,75 @@ class Ticket(Base):
     updated_at = Column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Incremented by every update, checked by the conditional writes (If-Match)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+class IdempotencyKey(Base):
+    """
+    Response of a write sent with an Idempotency-Key header, returned again to
+    the retries of the write until it expires.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    # Hash of the request, to reject a key reused by a different request
+    fingerprint = Column(String(32), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class TicketCounter(Base):
+    """Number of tickets per status, maintained by triggers on the tickets table."""
+
+    __tablename__ = "ticket_counters"
+
+    status = Column(Enum(TicketStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class TicketsVersion(Base):
+    """
+    Version of the tickets data (a single row), bumped by triggers on every
+    write of the tickets table, including the writes of other processes.
+    """
+
+    __tablename__ = "tickets_version"
+
+    id = Column(Integer, primary_key=True)
+    # Drawn when the row is created: the versions of another database never
+    # match the ones of this database
+    nonce = Column(String(16), nullable=False)
+    counter = Column(Integer, nullable=False, default=0)
+
+
+class TicketRollup(Base):
+    """
+    Number of tickets created and closed per hour and per day, maintained by
+    triggers on the tickets table. They count the events: a ticket is counted in
+    the bucket of its creation and of its closing, even after it is deleted.
+    """
+
+    __tablename__ = "ticket_rollups"
+
+    period = Column(Enum(StatsPeriod), primary_key=True)
+    # The UTC date truncated to the period: "YYYY-MM-DD HH" or "YYYY-MM-DD"
+    bucket = Column(String(13), primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    closed = Column(Integer, nullable=False, default=0)
+
+
+class TicketTransition(Base):
+    """
+    Number of status changes of the tickets, per previous and new status,
+    counted by a trigger on the tickets table since the table was created.
+    """
+
+    __tablename__ = "ticket_transitions"
+
+    from_status = Column(Enum(TicketStatus), primary_key=True)
+    to_status = Column(Enum(TicketStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,87 @@
+import hashlib
+from typing import Any, List, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def encode_model(obj: Any):
+    # Called by orjson for the types it doesn't know, e.g. a Pydantic model
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized by orjson, which encodes the UUID, datetime and
+    enum values of the ticket columns natively (as Pydantic does in JSON mode).
+
+    A route returning this response directly skips the validation and the
+    serialization of its response_model: the content must already have the
+    shape of the response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=encode_model)
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def ticket_etag(ticket: dict) -> str:
+    """Strong ETag of a ticket: its version, incremented by every update."""
+    return f'"{ticket["version"]}"'
+
+
+def expected_versions(
+    if_match: Optional[str], version: Optional[int] = None
+) -> Optional[List[int]]:
+    """
+    The versions of the ticket accepted by a conditional write: the ETags of the
+    If-Match header and/or the version query parameter (both must match), or
+    None without precondition (or with If-Match: *). If-Match uses the strong
+    comparison, so a weak or unknown ETag doesn't match any version.
+    """
+    versions = None
+    if if_match is not None and if_match.strip() != "*":
+        versions = []
+        for tag in if_match.split(","):
+            tag = tag.strip()
+            if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+                versions.append(int(tag[1:-1]))
+    if version is not None:
+        versions = (
+            [version] if versions is None else [v for v in versions if v == version]
+        )
+    return versions
+
+
+def collection_etag(request: Request, version: str) -> str:
+    """
+    ETag of a list page: the version of the tickets data (bumped by every
+    write, see tickets_crud.get_data_version) and the query parameters of the page.
+    """
+    params = sorted(request.query_params.multi_items())
+    return make_etag(version, request.url.path, params)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match comparison (weak, as required for GET)."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -1,26 +1,122 @@
+from datetime import datetime
+from typing import Annotated, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud import tickets_crud
+from app.config.settings import TICKETS_BULK_MAX_ITEMS, TICKETS_STATS_MAX_BUCKETS
+from app.crud import (
+    exports,
+    group_commit,
+    idempotency,
+    imports,
+    jobs,
+    reports,
+    tickets_crud,
+    write_behind,
+)
+from app.crud.cache import (
+    idempotency_cache,
+    page_cache,
+    snapshot_cache,
+    ticket_cache,
+)
 from app.crud.exceptions import (
     AlreadyClosedError,
     DuplicateTitleException,
+    IdempotencyKeyReusedError,
     InvalidCloseTransitionError,
+    InvalidCursorError,
+    InvalidSearchQueryError,
+    MissingValueError,
     NotFoundError,
+    VersionConflictError,
+)
+from app.db.sqlite import database, get_read_db, get_write_db
+from app.routers.responses import (
+    FastJSONResponse,
+    collection_etag,
+    etag_matches,
+    expected_versions,
+    not_modified,
+    ticket_etag,
 )
-from app.db.sqlite import get_db
 from app.schemas.tickets import (
+    BacklogAgeReport,
+    ExportFormat,
+    StatsPeriod,
+    StatusTransitionsReport,
+    TicketAccepted,
+    TicketBatchGet,
+    TicketBatchGetResponse,
+    TicketBulkCreateResponse,
+    TicketBulkUpdate,
+    TicketBulkUpdateResponse,
+    TicketCacheStats,
     TicketCreate,
+    TicketFilter,
+    TicketImportResponse,
+    TicketJob,
     TicketOut,
+    TicketSelection,
+    TicketSort,
     TicketsResponseList,
+    TicketStats,
     TicketUpdate,
+    TimeToCloseReport,
+    WriteOperation,
 )
 
 router = APIRouter()
 
 
+def accepted(ticket: dict, operation: WriteOperation) -> FastJSONResponse:
+    # The write is queued by the write-behind mode, and applied later
+    return FastJSONResponse(
+        TicketAccepted(
+            id=ticket["id"], operation=operation, pending=write_behind.queue.pending
+        ),
+        status_code=202,
+    )
+
+
+async def idempotent_write(
+    request: Request, db: AsyncSession, key: str, write, status_code: int, **kwargs
+) -> Response:
+    # The retries of a write sent with the same Idempotency-Key get its response.
+    # The write isn't queued (write-behind mode), so the queued writes it may
+    # depend on (e.g. the creation of the ticket it closes) are applied first.
+    await write_behind.flush_write_behind()
+    fingerprint = idempotency.request_fingerprint(
+        request.method,
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        await request.body(),
+    )
+    stored, replayed = await idempotency.run_once(
+        db, key, fingerprint, write, status_code, **kwargs
+    )
+    return Response(
+        stored.response,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"} if replayed else None,
+    )
+
+
 @router.post(
     "/",
     summary="Create a new ticket",
@@ -28,17 +124,49 @@ router = APIRouter()
     "The ticket description and the status are optionals",
     response_model=TicketOut,
     status_code=201,
+    responses={202: {"model": TicketAccepted}},
 )
 async def create_new_ticket(
+    request: Request,
     ticket_in: TicketCreate,
     reject_duplicates: bool = Query(
         False, description="Used to avoid creating tickets with same title."
     ),
-    db: AsyncSession = Depends(get_db),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Unique key of the request: its retries with the same key get "
+        "the response of the first one, without writing again.",
+    ),
+    db: AsyncSession = Depends(get_write_db),
 ):
     try:
-        new_ticket = await tickets_crud.create_ticket(
-            db=db,
+        if idempotency_key:
+            return await idempotent_write(
+                request,
+                db,
+                idempotency_key,
+                tickets_crud.create_ticket,
+                201,
+                title=ticket_in.title,
+                description=ticket_in.description,
+                status=ticket_in.status,
+                reject_duplicates=reject_duplicates,
+            )
+        # reject_duplicates needs the database, so it isn't queued
+        if write_behind.queue is not None and not reject_duplicates:
+            ticket = write_behind.queue.create_ticket(
+                title=ticket_in.title,
+                description=ticket_in.description,
+                status=ticket_in.status,
+            )
+            return accepted(ticket, WriteOperation.create)
+        # The duplicates check sees the queued creations once they are applied
+        await write_behind.flush_write_behind()
+        new_ticket = await group_commit.write_ticket(
+            db,
+            tickets_crud.create_ticket,
             title=ticket_in.title,
             description=ticket_in.description,
             status=ticket_in.status,
@@ -49,45 +177,447 @@ async def create_new_ticket(
     except DuplicateTitleException as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    except (IdempotencyKeyReusedError, MissingValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Cannot create new ticket because of: {str(e)}"
         )
 
 
+@router.post(
+    "/bulk",
+    summary="Create several tickets",
+    description="Creating up to "
+    f"{TICKETS_BULK_MAX_ITEMS} tickets in one transaction. With "
+    "reject_duplicates, the tickets whose title is already used (in the "
+    "database, or by a previous ticket of the request) are rejected, and the "
+    "other ones are created. The result of each ticket is returned in the "
+    "order of the request.",
+    response_model=TicketBulkCreateResponse,
+)
+async def create_new_tickets(
+    tickets_in: List[TicketCreate] = Body(
+        ..., min_length=1, max_length=TICKETS_BULK_MAX_ITEMS
+    ),
+    reject_duplicates: bool = Query(
+        False, description="Used to avoid creating tickets with same title."
+    ),
+    db: AsyncSession = Depends(get_write_db),
+):
+    try:
+        # The duplicates check sees the queued creations (write-behind mode)
+        # once they are applied
+        if reject_duplicates:
+            await write_behind.flush_write_behind()
+        return await tickets_crud.create_tickets(
+            db=db, tickets=tickets_in, reject_duplicates=reject_duplicates
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot create the tickets because of: {str(e)}"
+        )
+
+
+@router.post(
+    "/import",
+    summary="Import tickets from NDJSON",
+    description="Import the tickets of an NDJSON request body (one ticket per line, "
+    "as for POST /tickets/). The body is parsed while it is received, and the "
+    "valid tickets are inserted in batches of TICKETS_IMPORT_BATCH_SIZE, each in "
+    "its own transaction. The response reports the number of imported and "
+    "rejected lines, the first rejected lines and why, and the rows per second.",
+    response_model=TicketImportResponse,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}}
+        }
+    },
+)
+async def import_tickets(
+    request: Request,
+    reject_duplicates: Optional[bool] = Query(
+        False, description="Reject the tickets whose title is already used"
+    ),
+    db: AsyncSession = Depends(get_write_db),
+):
+    try:
+        if reject_duplicates:
+            await write_behind.flush_write_behind()
+        return await imports.import_tickets(
+            db=db, chunks=request.stream(), reject_duplicates=reject_duplicates
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot import the tickets because of: {str(e)}"
+        )
+
+
+@router.patch(
+    "/bulk",
+    summary="Update several tickets",
+    description="Update the tickets selected by their ids, or by a filter "
+    "(e.g. status and created_before), in one set-based UPDATE. When the update "
+    "closes the tickets, only the open ones are closed. The response reports "
+    "the skipped tickets and why (not_found, already_closed or stalled). "
+    "A filter selection processes TICKETS_BULK_MAX_ITEMS tickets per request: "
+    "send the next_cursor of the response as cursor to process the next ones.",
+    response_model=TicketBulkUpdateResponse,
+)
+async def update_tickets(
+    bulk_update: TicketBulkUpdate,
+    db: AsyncSession = Depends(get_write_db),
+):
+    try:
+        # The queued writes (write-behind mode) are applied first
+        await write_behind.flush_write_behind()
+        return await tickets_crud.update_tickets(
+            db=db,
+            selection=TicketSelection(
+                ids=bulk_update.ids,
+                filter=bulk_update.filter,
+                cursor=bulk_update.cursor,
+            ),
+            update_data=bulk_update.update,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot update the tickets because of: {str(e)}"
+        )
+
+
+@router.patch(
+    "/bulk/close",
+    summary="Close several tickets",
+    description="Close the open tickets selected by their ids, or by a filter "
+    "(e.g. status and created_before), in one set-based UPDATE. The response "
+    "reports the skipped tickets and why (not_found, already_closed or stalled). "
+    "A filter selection processes TICKETS_BULK_MAX_ITEMS tickets per request: "
+    "send the next_cursor of the response as cursor to process the next ones.",
+    response_model=TicketBulkUpdateResponse,
+)
+async def close_tickets(
+    selection: TicketSelection,
+    db: AsyncSession = Depends(get_write_db),
+):
+    try:
+        await write_behind.flush_write_behind()
+        return await tickets_crud.close_tickets(db=db, selection=selection)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot close the tickets because of: {str(e)}"
+        )
+
+
 @router.get(
     "/",
     summary="List all tickets",
-    description="Listing all tickets. To specify how many tickets you would like "
-    "to get, you can use skip and limit parameters",
+    description="Listing all tickets, ordered by creation date by default. "
+    "The tickets can be filtered by status, creation and update dates ranges "
+    "and title prefix. To specify how many "
+    "tickets you would like to get, you can use skip and limit parameters. "
+    "To walk through the tickets, pass the next_cursor of a page as cursor to get "
+    "the next one: unlike skip, it costs the same for any page. "
+    "The page has an ETag, which changes with any write of the tickets: "
+    "send it in If-None-Match to get 304 Not Modified while it is unchanged.",
     response_model=TicketsResponseList,
 )
 async def list_tickets(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=0, le=100),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="The next_cursor of the previous page (skip is ignored)."
+    ),
+    include_total: bool = Query(
+        True, description="Set to false to skip the total number of tickets."
+    ),
+    filters: TicketFilter = Depends(),
+    sort: TicketSort = Query(
+        TicketSort.created_at,
+        description="Order of the tickets (prefix the date with - to get the "
+        "most recent tickets first).",
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
+    # The version of the data is read before the tickets: if they change
+    # during the query, the ETag is already outdated (never the other way)
+    try:
+        etag = collection_etag(request, await tickets_crud.get_data_version(db))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot get the tickets list, because of: {str(e)}"
+        )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    # The same page at the same data version: one primary key lookup, no scan
+    cached_page = page_cache.get(etag)
+    if cached_page is not None:
+        return Response(
+            cached_page, media_type="application/json", headers={"ETag": etag}
+        )
     try:
         tickets_list_from_db = await tickets_crud.get_all_tickets(
-            db=db, skip=skip, limit=limit
+            db=db,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            filters=filters,
+            sort=sort,
         )
-        return tickets_list_from_db
+        response = FastJSONResponse(tickets_list_from_db, headers={"ETag": etag})
+        page_cache.set(etag, response.body)
+        return response
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Cannot get the tickets list, because of: {str(e)}"
         )
 
 
+@router.get(
+    "/export",
+    summary="Export all tickets",
+    description="Stream all the tickets (or the filtered ones), ordered by creation "
+    "date, as NDJSON (one ticket per line) or CSV. The rows are read from a "
+    "server-side cursor, so the export runs in constant memory. "
+    "With compress=true the stream is gzip-compressed (Content-Encoding: gzip).",
+    response_class=StreamingResponse,
+)
+async def export_tickets(
+    export_format: ExportFormat = Query(
+        ExportFormat.ndjson, alias="format", description="ndjson or csv"
+    ),
+    filters: TicketFilter = Depends(),
+    compress: bool = Query(False, description="Gzip-compress the export"),
+):
+    headers = {
+        "Content-Disposition": f'attachment; filename="tickets.{export_format.value}"'
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        exports.export_tickets(
+            database.read_session,
+            export_format=export_format,
+            filters=filters,
+            compress=compress,
+        ),
+        media_type=exports.EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.get(
+    "/search",
+    summary="Search tickets",
+    description="Full-text search of the tickets titles and descriptions, "
+    "the best matches first. All the terms must match, and a term ending with * "
+    "matches the words starting with it (e.g. q=serv* down).",
+    response_model=TicketsResponseList,
+)
+async def search_tickets(
+    q: str = Query(..., min_length=1, max_length=200, description="Searched terms."),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=0, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        return await tickets_crud.search_tickets(db=db, query=q, skip=skip, limit=limit)
+    except InvalidSearchQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot search the tickets, because of: {str(e)}"
+        )
+
+
+@router.post(
+    "/batch-get",
+    summary="Get several tickets from their IDs",
+    description="Get up to TICKETS_BATCH_GET_MAX_IDS tickets with a single query, "
+    "instead of one GET /tickets/{ticket_id} per ID. "
+    "The IDs of the tickets that don't exist are returned in missing.",
+    response_model=TicketBatchGetResponse,
+)
+async def batch_get_tickets(
+    batch: TicketBatchGet,
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        # The tickets with queued writes (write-behind mode) are read from the queue
+        queued_tickets = {}
+        for ticket_id in batch.ids:
+            ticket = write_behind.queued_ticket(ticket_id)
+            if ticket is not None:
+                queued_tickets[ticket_id] = ticket
+        return await tickets_crud.get_tickets_by_ids(
+            db=db, ticket_ids=batch.ids, queued_tickets=queued_tickets
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Cannot get the tickets because of: {str(e)}"
+        )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    summary="Get the progress of a background job",
+    description="Get the state of a background job "
+    "(e.g. DELETE /tickets/?run_async=true), "
+    "and the number of tickets it processed so far.",
+    response_model=TicketJob,
+)
+async def get_job(job_id: UUID = Path(...)):
+    try:
+        return jobs.get_job(job_id)
+    except NotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get(
+    "/stats",
+    summary="Statistics of the tickets",
+    description="Number of tickets per status, and number of tickets created and "
+    "closed per hour or per day (the deleted tickets still count in the buckets "
+    "of their creation and closing). They are read from aggregates updated with "
+    "every write, so the cost depends on the number of buckets, not of tickets. "
+    "Only the buckets with tickets are returned, the most recent ones up to limit, "
+    "oldest first.",
+    response_model=TicketStats,
+)
+async def get_ticket_stats(
+    period: StatsPeriod = Query(StatsPeriod.day, description="hour or day"),
+    since: Optional[datetime] = Query(
+        None, description="Start from the bucket of this date."
+    ),
+    until: Optional[datetime] = Query(
+        None, description="End with the bucket of this date."
+    ),
+    limit: int = Query(48, ge=1, le=TICKETS_STATS_MAX_BUCKETS),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        return await tickets_crud.get_ticket_stats(
+            db=db, period=period, since=since, until=until, limit=limit
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Cannot get the tickets statistics, because of: {str(e)}",
+        )
+
+
+@router.get(
+    "/reports/time-to-close",
+    summary="Time to close percentiles",
+    description="Percentiles of the time between the creation and the last update "
+    "of the closed tickets, in seconds. The reports are computed with NumPy over a "
+    "columnar snapshot of the tickets, loaded once per version of the data.",
+    response_model=TimeToCloseReport,
+)
+async def get_time_to_close_report(
+    percentiles: List[Annotated[float, Field(ge=0, le=100)]] = Query(
+        [50, 90, 95, 99], description="The percentiles, between 0 and 100."
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        return await reports.get_time_to_close_report(db=db, percentiles=percentiles)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Cannot compute the time to close, because of: {str(e)}",
+        )
+
+
+@router.get(
+    "/reports/backlog-age",
+    summary="Backlog age histogram",
+    description="Number of open and stalled tickets per bucket of age (since their "
+    "creation). The buckets are bounded by the edges, in hours: the first one "
+    "starts at 0 and the last one holds the tickets older than the last edge.",
+    response_model=BacklogAgeReport,
+)
+async def get_backlog_age_report(
+    edges: List[Annotated[float, Field(gt=0)]] = Query(
+        [1, 24, 168, 720], description="The bounds of the buckets, in hours."
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        return await reports.get_backlog_age_report(db=db, edges=edges)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Cannot compute the backlog age, because of: {str(e)}",
+        )
+
+
+@router.get(
+    "/reports/status-transitions",
+    summary="Status transitions counts",
+    description="Number of status changes of the tickets, per previous and new "
+    "status, the most frequent first (a deleted ticket keeps its transitions).",
+    response_model=StatusTransitionsReport,
+)
+async def get_status_transitions_report(db: AsyncSession = Depends(get_read_db)):
+    try:
+        return await reports.get_status_transitions_report(db=db)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Cannot count the status transitions, because of: {str(e)}",
+        )
+
+
+@router.get(
+    "/cache/stats",
+    summary="Statistics of the tickets cache",
+    description="Size, hits and misses of the in-process caches of the tickets "
+    "read by GET /tickets/{ticket_id}, and of the GET /tickets/ pages.",
+    response_model=TicketCacheStats,
+)
+async def get_cache_stats():
+    return TicketCacheStats(
+        tickets=ticket_cache.stats(),
+        pages=page_cache.stats(),
+        idempotency=idempotency_cache.stats(),
+        reports=snapshot_cache.stats(),
+    )
+
+
 @router.get(
     "/{ticket_id}",
     summary="Get a ticket from its ID",
-    description="Get a ticket by its ID if it exists..",
+    description="Get a ticket by its ID if it exists.. "
+    "The ticket has an ETag (its version, incremented by every update): send it in "
+    "If-None-Match to get 304 Not Modified while it is unchanged.",
     response_model=TicketOut,
 )
-async def get_ticket(ticket_id: UUID = Path(...), db: AsyncSession = Depends(get_db)):
+async def get_ticket(
+    request: Request,
+    ticket_id: UUID = Path(...),
+    db: AsyncSession = Depends(get_read_db),
+):
     try:
-        ticket = await tickets_crud.get_ticket_by_id(db=db, ticket_id=str(ticket_id))
-        return ticket
+        # A ticket with queued writes (write-behind mode) is read from the queue
+        ticket = write_behind.queued_ticket(ticket_id)
+        if ticket is None:
+            ticket = await tickets_crud.get_ticket_by_id(
+                db=db, ticket_id=str(ticket_id)
+            )
+        etag = ticket_etag(ticket)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return FastJSONResponse(ticket, headers={"ETag": etag})
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -102,21 +632,42 @@ async def get_ticket(ticket_id: UUID = Path(...), db: AsyncSession = Depends(get
     summary="Update a ticket from its ID",
     description="Get an existing ticket by its ID.",
     response_model=TicketOut,
+    responses={202: {"model": TicketAccepted}},
 )
 async def update_ticket(
     update_data: TicketUpdate,
     ticket_id: UUID = Path(...),
-    db: AsyncSession = Depends(get_db),
+    if_match: Optional[str] = Header(
+        None,
+        alias="If-Match",
+        description="Update only if the ticket still has this ETag (its version).",
+    ),
+    version: Optional[int] = Query(
+        None, ge=1, description="Update only if the ticket still has this version."
+    ),
+    db: AsyncSession = Depends(get_write_db),
 ):
     try:
-        updated_ticket = await tickets_crud.update_ticket_by_id(
-            db=db,
+        versions = expected_versions(if_match, version)
+        if write_behind.queue is not None:
+            ticket = await write_behind.queue.update_ticket(
+                ticket_id=str(ticket_id),
+                update_data=update_data,
+                expected_versions=versions,
+            )
+            return accepted(ticket, WriteOperation.update)
+        updated_ticket = await group_commit.write_ticket(
+            db,
+            tickets_crud.update_ticket_by_id,
             update_data=update_data,
             ticket_id=str(ticket_id),
+            expected_versions=versions,
         )
         return updated_ticket
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -130,18 +681,60 @@ async def update_ticket(
     summary="Close a ticket",
     description="Close an existing ticket.",
     response_model=TicketOut,
+    responses={202: {"model": TicketAccepted}},
 )
-async def close_ticket(ticket_id: UUID = Path(...), db: AsyncSession = Depends(get_db)):
+async def close_ticket(
+    request: Request,
+    ticket_id: UUID = Path(...),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        max_length=255,
+        description="Unique key of the request: its retries with the same key get "
+        "the response of the first one, without writing again.",
+    ),
+    if_match: Optional[str] = Header(
+        None,
+        alias="If-Match",
+        description="Close only if the ticket still has this ETag (its version).",
+    ),
+    version: Optional[int] = Query(
+        None, ge=1, description="Close only if the ticket still has this version."
+    ),
+    db: AsyncSession = Depends(get_write_db),
+):
     try:
-        updated_ticket = await tickets_crud.close_ticket_by_id(
-            db=db,
+        versions = expected_versions(if_match, version)
+        if idempotency_key:
+            return await idempotent_write(
+                request,
+                db,
+                idempotency_key,
+                tickets_crud.close_ticket_by_id,
+                200,
+                ticket_id=str(ticket_id),
+                expected_versions=versions,
+            )
+        if write_behind.queue is not None:
+            ticket = await write_behind.queue.close_ticket(
+                ticket_id=str(ticket_id), expected_versions=versions
+            )
+            return accepted(ticket, WriteOperation.close)
+        updated_ticket = await group_commit.write_ticket(
+            db,
+            tickets_crud.close_ticket_by_id,
             ticket_id=str(ticket_id),
+            expected_versions=versions,
         )
         return updated_ticket
     except (InvalidCloseTransitionError, AlreadyClosedError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e))
+    except IdempotencyKeyReusedError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -158,13 +751,16 @@ async def close_ticket(ticket_id: UUID = Path(...), db: AsyncSession = Depends(g
 )
 async def delete_ticket(
     ticket_id: UUID = Path(...),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_write_db),
     force_delete: bool = Query(False, description="Forcefully remove this ticket"),
 ):
     try:
+        await write_behind.flush_write_behind()
         await tickets_crud.delete_ticket_by_id(
             db=db, ticket_id=str(ticket_id), force_delete=force_delete
         )
+        # A write queued during the delete doesn't bring the ticket back
+        write_behind.forget_ticket(ticket_id)
     except NotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except InvalidCloseTransitionError as e:
@@ -181,13 +777,26 @@ async def delete_ticket(
     "/",
     summary="Delete all tickets",
     description="Delete all closed tickets. "
-    "If force_delete=true, delete all tickets regardless of status.",
+    "If force_delete=true, delete all tickets regardless of status. "
+    "The tickets are deleted in batches (TICKETS_DELETE_BATCH_SIZE), and with "
+    "run_async=true in a background job whose progress is at /tickets/jobs/{job_id}.",
 )
 async def delete_all_tickets(
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_write_db),
     force_delete: bool = Query(False, description="Forcefully remove all tickets"),
+    run_async: bool = Query(
+        False, description="Delete the tickets in a background job (202 Accepted)"
+    ),
 ):
     try:
+        await write_behind.flush_write_behind()
+        if run_async:
+            job = jobs.start_delete_job(
+                database.async_session, force_delete=force_delete
+            )
+            response.status_code = 202
+            return job
         result = await tickets_crud.delete_tickets(db=db, force_delete=force_delete)
         if result["delete_count"] == 0:
             return {
@@ -1,9 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.config.settings import TICKETS_BATCH_GET_MAX_IDS, TICKETS_BULK_MAX_ITEMS
 
 
 class TicketStatus(str, Enum):
@@ -12,6 +14,31 @@ class TicketStatus(str, Enum):
     closed = "closed"
 
 
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class StatsPeriod(str, Enum):
+    hour = "hour"
+    day = "day"
+
+
+class TicketSort(str, Enum):
+    created_at = "created_at"
+    created_at_desc = "-created_at"
+    updated_at = "updated_at"
+    updated_at_desc = "-updated_at"
+
+    @property
+    def column(self) -> str:
+        return self.value.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.value.startswith("-")
+
+
 class TicketCreate(BaseModel):
     title: str = Field(
         ...,
@@ -68,11 +95,292 @@ class TicketOut(TicketCreate):
     updated_at: datetime = Field(
         ..., description="The ticket update date", examples=["2025-06-01"]
     )
+    version: int = Field(
+        1, description="The ticket version, incremented by every update", examples=[1]
+    )
 
 
 # This model is used to return a list of tickets
 class TicketsResponseList(BaseModel):
-    total: int
+    total: Optional[int] = Field(
+        None, description="Total number of tickets (None if include_total=false)"
+    )
     skip: int
     limit: int
     results: List[TicketOut]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor of the next page (None on the last page)",
+    )
+
+
+# This model is used to filter the tickets lists
+class TicketFilter(BaseModel):
+    status: Optional[TicketStatus] = Field(
+        None, description="Only the tickets with this status"
+    )
+    created_after: Optional[datetime] = Field(
+        None, description="Only the tickets created at or after this date"
+    )
+    created_before: Optional[datetime] = Field(
+        None, description="Only the tickets created before this date"
+    )
+    updated_after: Optional[datetime] = Field(
+        None, description="Only the tickets updated at or after this date"
+    )
+    updated_before: Optional[datetime] = Field(
+        None, description="Only the tickets updated before this date"
+    )
+    title_prefix: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=100,
+        description="Only the tickets whose title starts with this (case-sensitive)",
+    )
+
+    @field_validator(
+        "created_after", "created_before", "updated_after", "updated_before"
+    )
+    @classmethod
+    def to_naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        # The tickets dates are stored as naive UTC dates
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @property
+    def only_status(self) -> bool:
+        return self.model_dump(exclude_none=True).keys() <= {"status"}
+
+
+class BulkItemStatus(str, Enum):
+    created = "created"
+    duplicate = "duplicate"
+    invalid = "invalid"
+
+
+# This model is used to return the result of each ticket of a bulk creation
+class TicketBulkCreateItem(BaseModel):
+    index: int = Field(..., description="Position of the ticket in the request")
+    status: BulkItemStatus
+    ticket: Optional[TicketOut] = Field(None, description="The created ticket")
+    detail: Optional[str] = Field(None, description="Why the ticket was rejected")
+
+
+class TicketBulkCreateResponse(BaseModel):
+    created: int
+    rejected: int
+    results: List[TicketBulkCreateItem]
+
+
+# This model is used to select the tickets of a bulk update or close
+class TicketSelection(BaseModel):
+    ids: Optional[List[UUID]] = Field(
+        None,
+        min_length=1,
+        max_length=TICKETS_BULK_MAX_ITEMS,
+        description="The IDs of the tickets",
+    )
+    filter: Optional[TicketFilter] = Field(
+        None, description="The filters of the tickets (instead of their IDs)"
+    )
+    cursor: Optional[str] = Field(
+        None,
+        description="The next_cursor of the previous response, to continue with "
+        "the next tickets matching the filter",
+    )
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Select the tickets either by ids or by filter")
+        if self.filter is not None and not self.filter.model_dump(exclude_none=True):
+            raise ValueError("The filter must have at least one criterion")
+        if self.cursor is not None and self.filter is None:
+            raise ValueError("The cursor continues a selection by filter")
+        return self
+
+
+class TicketBulkUpdate(TicketSelection):
+    update: TicketUpdate = Field(..., description="The new data of the tickets")
+
+    @model_validator(mode="after")
+    def check_update(self):
+        if not self.update.model_dump(exclude_none=True):
+            raise ValueError("The update must have at least one field")
+        return self
+
+
+class SkipReason(str, Enum):
+    not_found = "not_found"
+    already_closed = "already_closed"
+    stalled = "stalled"
+
+
+class TicketSkipped(BaseModel):
+    id: UUID
+    reason: SkipReason
+
+
+class TicketBulkUpdateResponse(BaseModel):
+    updated: int
+    updated_ids: List[UUID]
+    skipped: List[TicketSkipped]
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Set when more tickets match the filter: send it as cursor "
+        "to process the next ones",
+    )
+
+
+class TicketBatchGet(BaseModel):
+    ids: List[UUID] = Field(
+        ...,
+        min_length=1,
+        max_length=TICKETS_BATCH_GET_MAX_IDS,
+        description="The IDs of the tickets",
+    )
+
+
+class TicketBatchGetResponse(BaseModel):
+    results: List[TicketOut]
+    missing: List[UUID]
+
+
+class JobState(str, Enum):
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class TicketJob(BaseModel):
+    """Progress of a background job on the tickets (e.g. a mass deletion)."""
+
+    id: UUID
+    state: JobState = JobState.running
+    deleted: int = 0
+    total_count: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class TicketImportRejectedLine(BaseModel):
+    line: int = Field(..., description="The line number (from 1)")
+    detail: str
+
+
+class TicketImportResponse(BaseModel):
+    lines: int = Field(..., description="Number of non-empty lines read")
+    imported: int
+    rejected: int
+    rejected_lines: List[TicketImportRejectedLine] = Field(
+        ..., description="The first rejected lines, and why"
+    )
+    seconds: float
+    rows_per_second: float
+
+
+class CacheStats(BaseModel):
+    enabled: bool
+    size: int = Field(..., description="Number of cached entries")
+    max_size: int
+    ttl: float = Field(..., description="Time to live of an entry, in seconds")
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: Optional[float] = None
+
+
+class TicketCacheStats(BaseModel):
+    tickets: CacheStats = Field(..., description="The tickets read by ID")
+    pages: CacheStats = Field(..., description="The pages of the tickets list")
+    idempotency: CacheStats = Field(
+        ..., description="The responses stored for the Idempotency-Key headers"
+    )
+    reports: CacheStats = Field(
+        ..., description="The columnar snapshot of the tickets of the reports"
+    )
+
+
+class WriteOperation(str, Enum):
+    create = "create"
+    update = "update"
+    close = "close"
+
+
+class TicketWrite(BaseModel):
+    """A ticket write of the write-behind journal, with the values it sets."""
+
+    seq: int = Field(0, description="Position of the write in the journal")
+    operation: WriteOperation
+    id: UUID
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TicketStatus] = None
+    created_at: Optional[datetime] = None
+    updated_at: datetime
+    version: Optional[int] = None
+
+
+class TicketAccepted(BaseModel):
+    """A write queued by the write-behind mode, applied to the database later."""
+
+    id: UUID
+    operation: WriteOperation
+    pending: int = Field(..., description="Number of writes waiting to be applied")
+
+
+class TicketStatsBucket(BaseModel):
+    start: datetime = Field(..., description="The start of the hour or the day (UTC)")
+    created: int = Field(..., description="Number of tickets created")
+    closed: int = Field(
+        ..., description="Number of tickets closed (including the deleted ones since)"
+    )
+
+
+class TicketStats(BaseModel):
+    total: int
+    by_status: Dict[TicketStatus, int]
+    period: StatsPeriod
+    buckets: List[TicketStatsBucket] = Field(
+        ..., description="The buckets with tickets, the oldest first"
+    )
+
+
+class TimeToClosePercentile(BaseModel):
+    percentile: float
+    seconds: float
+
+
+class TimeToCloseReport(BaseModel):
+    closed: int = Field(..., description="Number of closed tickets")
+    mean_seconds: Optional[float] = None
+    max_seconds: Optional[float] = None
+    percentiles: List[TimeToClosePercentile] = Field(
+        ..., description="Time from the creation to the last update of the tickets"
+    )
+
+
+class BacklogAgeBucket(BaseModel):
+    min_hours: float
+    max_hours: Optional[float] = Field(None, description="None for the last bucket")
+    open: int
+    stalled: int
+
+
+class BacklogAgeReport(BaseModel):
+    as_of: datetime = Field(..., description="The date the ages are computed at (UTC)")
+    total: int = Field(..., description="Number of open and stalled tickets")
+    buckets: List[BacklogAgeBucket]
+
+
+class StatusTransitionCount(BaseModel):
+    from_status: TicketStatus
+    to_status: TicketStatus
+    count: int
+
+
+class StatusTransitionsReport(BaseModel):
+    total: int
+    transitions: List[StatusTransitionCount]
@@ -0,0 +1,77 @@
+"""
+Throughput of the bulk ticket creation compared to looping the single create.
+
+Creates the same tickets in a fresh file database, once with one
+`create_ticket` call per ticket and once with `create_tickets` batches,
+with and without reject_duplicates, and reports the tickets per second.
+
+Usage:
+    python benchmarks/bench_bulk_create.py --tickets 20000 --batch 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.crud import tickets_crud
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+from app.schemas.tickets import TicketCreate
+
+
+async def run_mode(mode: str, tickets: list, batch: int, reject: bool) -> float:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+
+        start = time.perf_counter()
+        async with session_factory() as db:
+            if mode == "single":
+                for ticket in tickets:
+                    await tickets_crud.create_ticket(
+                        db,
+                        title=ticket.title,
+                        description=ticket.description,
+                        reject_duplicates=reject,
+                    )
+            else:
+                for i in range(0, len(tickets), batch):
+                    await tickets_crud.create_tickets(
+                        db, tickets=tickets[i : i + batch], reject_duplicates=reject
+                    )
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+    return len(tickets) / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    tickets = [
+        TicketCreate(title=f"ticket {i}", description="benchmark")
+        for i in range(args.tickets)
+    ]
+    print(f"{'mode':<8}{'reject_duplicates':>20}{'tickets/s':>12}")
+    for reject in (False, True):
+        for mode in ("single", "bulk"):
+            throughput = await run_mode(mode, tickets, args.batch, reject)
+            print(f"{mode:<8}{str(reject):>20}{throughput:>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,101 @@
+"""
+Throughput and memory of the streaming export of the tickets.
+
+Fills a fresh file database with tickets, then consumes the NDJSON and CSV
+exports (plain and gzip-compressed) and reports the rows per second and the
+growth of the RSS of the process during the export (sampled at every chunk,
+Linux only), which must stay flat as the number of rows grows. (The first
+export also maps the pages of the database file, see the mmap_size PRAGMA.)
+
+Usage:
+    python benchmarks/bench_export.py --rows 5000000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.crud import exports
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+from app.models.models import Ticket
+from app.schemas.tickets import ExportFormat, TicketStatus
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb() -> float:
+    # The second field of statm is the resident set size, in pages
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE / 2**20
+
+
+async def fill_table(session_factory, rows: int):
+    now = datetime.utcnow()
+    batch = 20000
+    async with session_factory() as db:
+        for start in range(0, rows, batch):
+            await db.execute(
+                insert(Ticket),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "title": f"ticket {i}",
+                        "description": "benchmark",
+                        "status": TicketStatus.open,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(start, min(start + batch, rows))
+                ],
+            )
+            await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        await fill_table(session_factory, args.rows)
+
+        print(f"{'format':<8}{'gzip':>6}{'rows/s':>12}{'MB':>10}{'RSS +MB':>10}")
+        for export_format in ExportFormat:
+            for compress in (False, True):
+                rss_before = rss_peak = rss_mb()
+                size = 0
+                start = time.perf_counter()
+                async for chunk in exports.export_tickets(
+                    session_factory, export_format=export_format, compress=compress
+                ):
+                    size += len(chunk)
+                    rss_peak = max(rss_peak, rss_mb())
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{export_format.value:<8}{str(compress):>6}"
+                    f"{args.rows / elapsed:>12.0f}{size / 2**20:>10.1f}"
+                    f"{rss_peak - rss_before:>10.1f}"
+                )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
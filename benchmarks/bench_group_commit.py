@@ -0,0 +1,124 @@
+"""
+Throughput of the single-ticket writes: per write, group commit, write-behind.
+
+Creates tickets concurrently against a fresh file database with a single writer
+connection, like the API: once committing every write, once coalescing the
+concurrent writes into shared transactions (group_commit.write_ticket), and once
+journaling them for the write-behind drainer (write_behind). Reports the
+acknowledged writes per second, and for write-behind the time to apply the
+journal to the database.
+
+Usage:
+    python benchmarks/bench_group_commit.py --tickets 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.config.settings import SQLITE_STORAGE_PROFILES
+from app.crud import group_commit, tickets_crud, write_behind
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+
+
+async def run(
+    profile: str, mode: str, tickets: int, concurrency: int, interval_ms: float
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url, pragmas=SQLITE_STORAGE_PROFILES[profile])
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        writer = queue = None
+        if mode == "group commit":
+            writer = group_commit.start_group_commit(
+                session_factory, interval=interval_ms / 1000, max_batch=concurrency
+            )
+        elif mode == "write-behind":
+            queue = await write_behind.start_write_behind(
+                session_factory,
+                session_factory,
+                path=os.path.join(tmp_dir, "bench.journal"),
+            )
+
+        todo = asyncio.Queue()
+        for i in range(tickets):
+            todo.put_nowait(i)
+
+        async def worker():
+            while not todo.empty():
+                i = todo.get_nowait()
+                if write_behind.queue is not None:
+                    write_behind.queue.create_ticket(
+                        title=f"ticket {i}", description="benchmark"
+                    )
+                    await asyncio.sleep(0)
+                    continue
+                async with session_factory() as db:
+                    await group_commit.write_ticket(
+                        db,
+                        tickets_crud.create_ticket,
+                        title=f"ticket {i}",
+                        description="benchmark",
+                    )
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        await group_commit.stop_group_commit()
+        await write_behind.stop_write_behind()
+        drained = time.perf_counter() - start
+        await engine.dispose()
+
+    transactions = tickets
+    if writer:
+        transactions = writer.batches
+    elif queue:
+        transactions = "-"
+    return {
+        "mode": mode,
+        "elapsed": elapsed,
+        "throughput": tickets / elapsed,
+        "transactions": transactions,
+        "drained": drained,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument(
+        "--profile", choices=list(SQLITE_STORAGE_PROFILES), default="production"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':<14}{'seconds':>10}{'writes/s':>12}{'transactions':>14}"
+        f"{'applied after':>15}"
+    )
+    for mode in ("per write", "group commit", "write-behind"):
+        result = await run(
+            args.profile, mode, args.tickets, args.concurrency, args.interval_ms
+        )
+        print(
+            f"{result['mode']:<14}{result['elapsed']:>10.2f}"
+            f"{result['throughput']:>12.0f}{result['transactions']:>14}"
+            f"{result['drained']:>14.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Create and bulk-delete latency as the tickets table grows, with and without
+the secondary indexes of the Ticket model.
+
+For every table size, the table is filled with open tickets (plus a few closed
+ones), then the script measures the average latency of `create_ticket` with
+`reject_duplicates=True` and of `delete_tickets` (closed tickets only).
+
+Usage:
+    python benchmarks/bench_indexes.py --sizes 10000 100000 500000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.crud import tickets_crud
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+from app.models.models import Ticket
+from app.schemas.tickets import TicketStatus
+
+CREATES = 200
+CLOSED_PER_DELETE = 100
+DELETES = 5
+
+
+async def fill_table(session_factory, size: int):
+    now = datetime.utcnow()
+    batch = 10000
+    async with session_factory() as db:
+        for start in range(0, size, batch):
+            await db.execute(
+                insert(Ticket),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "title": f"ticket {i}",
+                        "description": "benchmark",
+                        "status": TicketStatus.open,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for i in range(start, min(start + batch, size))
+                ],
+            )
+        await db.commit()
+
+
+async def run_size(size: int, indexed: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+            if not indexed:
+                for index in Ticket.__table__.indexes:
+                    await conn.execute(text(f"DROP INDEX {index.name}"))
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        await fill_table(session_factory, size)
+
+        start = time.perf_counter()
+        for i in range(CREATES):
+            async with session_factory() as db:
+                await tickets_crud.create_ticket(
+                    db,
+                    title=f"new ticket {i}",
+                    description="benchmark",
+                    reject_duplicates=True,
+                )
+        create_latency = (time.perf_counter() - start) / CREATES
+
+        delete_latency = 0.0
+        for _ in range(DELETES):
+            async with session_factory() as db:
+                for i in range(CLOSED_PER_DELETE):
+                    await tickets_crud.create_ticket(
+                        db,
+                        title=f"closed {i}",
+                        description="benchmark",
+                        status=TicketStatus.closed,
+                    )
+                start = time.perf_counter()
+                await tickets_crud.delete_tickets(db)
+                delete_latency += time.perf_counter() - start
+        await engine.dispose()
+
+    return {
+        "create_ms": create_latency * 1000,
+        "delete_ms": delete_latency / DELETES * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'indexes':>10}{'create ms':>12}{'delete ms':>12}")
+    for size in args.sizes:
+        for indexed in (False, True):
+            result = await run_size(size, indexed)
+            print(
+                f"{size:>10}{'yes' if indexed else 'no':>10}"
+                f"{result['create_ms']:>12.3f}{result['delete_ms']:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
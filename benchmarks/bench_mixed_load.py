@@ -0,0 +1,113 @@
+"""
+GET latency under bursts of writes, with and without the writer/reader split.
+
+Readers fetch single tickets in a loop while writers create tickets in bursts.
+In "shared" mode every session comes from one engine (the pre-split layout),
+in "split" mode reads use the read-only pool and writes the single writer.
+
+Usage:
+    python benchmarks/bench_mixed_load.py --seconds 5 --readers 20 --writers 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.config.settings import SQLITE_READ_MAX_OVERFLOW, SQLITE_READ_POOL_SIZE
+from app.crud import tickets_crud
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+
+
+async def run_mode(mode: str, seconds: float, readers: int, writers: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        pool_size = SQLITE_READ_POOL_SIZE + SQLITE_READ_MAX_OVERFLOW
+        if mode == "split":
+            write_engine = build_engine(url)
+            read_engine = build_engine(url, pool_size=pool_size, read_only=True)
+        else:
+            write_engine = read_engine = build_engine(url, pool_size=pool_size)
+        async with write_engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        write_session = sessionmaker(
+            write_engine, expire_on_commit=False, class_=AsyncSession
+        )
+        read_session = sessionmaker(
+            read_engine, expire_on_commit=False, class_=AsyncSession
+        )
+
+        ticket_ids = []
+        async with write_session() as db:
+            for i in range(200):
+                ticket = await tickets_crud.create_ticket(
+                    db, title=f"seed {i}", description="benchmark"
+                )
+                ticket_ids.append(str(ticket.id))
+
+        deadline = time.perf_counter() + seconds
+        latencies = []
+
+        async def reader():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                async with read_session() as db:
+                    await tickets_crud.get_ticket_by_id(db, random.choice(ticket_ids))
+                latencies.append(time.perf_counter() - start)
+
+        async def writer(worker: int):
+            i = 0
+            while time.perf_counter() < deadline:
+                # Bursts of writes separated by short pauses
+                for _ in range(20):
+                    async with write_session() as db:
+                        await tickets_crud.create_ticket(
+                            db, title=f"ticket {worker}-{i}", description="benchmark"
+                        )
+                    i += 1
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(
+            *(reader() for _ in range(readers)),
+            *(writer(worker) for worker in range(writers)),
+        )
+        if read_engine is not write_engine:
+            await read_engine.dispose()
+        await write_engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "mode": mode,
+        "reads": len(latencies),
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=20)
+    parser.add_argument("--writers", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8}{'reads':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode in ("shared", "split"):
+        result = await run_mode(mode, args.seconds, args.readers, args.writers)
+        print(
+            f"{result['mode']:<8}{result['reads']:>8}"
+            f"{result['p50']:>10.2f}{result['p99']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+Time to close percentiles of GET /tickets/reports/time-to-close.
+
+Compares, on the same tickets:
+- "orm": ORM instances iterated in Python, percentiles by statistics.quantiles;
+- "snapshot": the raw columns loaded into NumPy arrays, then np.percentile
+  (the first report of a data version);
+- "cached": the report on the snapshot already loaded for the data version.
+
+Usage:
+    python benchmarks/bench_reports.py --rows 200000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.crud import reports
+from app.crud.cache import snapshot_cache
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+from app.models.models import Ticket
+from app.schemas.tickets import TicketStatus
+
+PERCENTILES = [50, 90, 95, 99]
+
+
+async def orm_report(db) -> list:
+    result = await db.execute(select(Ticket))
+    seconds = [
+        (ticket.updated_at - ticket.created_at).total_seconds()
+        for ticket in result.scalars()
+        if ticket.status == TicketStatus.closed
+    ]
+    quantiles = statistics.quantiles(seconds, n=100, method="inclusive")
+    return [quantiles[percentile - 1] for percentile in PERCENTILES]
+
+
+async def snapshot_report(db):
+    snapshot_cache.clear()  # as for a new data version: the snapshot is loaded again
+    return await reports.get_time_to_close_report(db, PERCENTILES)
+
+
+async def cached_report(db):
+    return await reports.get_time_to_close_report(db, PERCENTILES)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        start = datetime(2024, 1, 1)
+        async with session_factory() as db:
+            for offset in range(0, args.rows, 10000):
+                tickets = []
+                for i in range(offset, min(offset + 10000, args.rows)):
+                    created_at = start + timedelta(minutes=i)
+                    tickets.append(
+                        {
+                            "title": f"ticket {i}",
+                            "description": "benchmark",
+                            "status": random.choice(list(TicketStatus)),
+                            "created_at": created_at,
+                            "updated_at": created_at
+                            + timedelta(seconds=random.expovariate(1 / 3600)),
+                        }
+                    )
+                await db.execute(insert(Ticket), tickets)
+            await db.commit()
+
+        print(f"{'path':<10}{'ms/report':>12}")
+        for name, report in (
+            ("orm", orm_report),
+            ("snapshot", snapshot_report),
+            ("cached", cached_report),
+        ):
+            async with session_factory() as db:
+                await report(db)  # warm up
+                start_time = time.perf_counter()
+                for _ in range(args.rounds):
+                    await report(db)
+                elapsed = time.perf_counter() - start_time
+            print(f"{name:<10}{elapsed / args.rounds * 1000:>12.1f}")
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
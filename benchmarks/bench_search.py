@@ -0,0 +1,110 @@
+"""
+Latency of the full-text search of tickets on a large corpus.
+
+Fills a fresh file database with random tickets (titles and descriptions drawn
+from a fixed vocabulary), then measures the latency of `search_tickets` for
+single terms, several terms and prefix queries.
+
+Usage:
+    python benchmarks/bench_search.py --rows 1000000 --queries 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.crud import tickets_crud
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+from app.models.models import Ticket
+from app.schemas.tickets import TicketStatus
+
+random.seed(42)
+SYLLABLES = ["ba", "ce", "di", "fo", "gu", "ka", "le", "mi", "no", "pu", "ra", "se"]
+VOCABULARY = list(
+    {"".join(random.choices(SYLLABLES, k=random.randint(2, 4))) for _ in range(20000)}
+)
+
+
+def random_words(count: int) -> str:
+    return " ".join(random.choices(VOCABULARY, k=count))
+
+
+async def fill_table(session_factory, rows: int):
+    now = datetime.utcnow()
+    batch = 20000
+    async with session_factory() as db:
+        for start in range(0, rows, batch):
+            await db.execute(
+                insert(Ticket),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "title": random_words(4),
+                        "description": random_words(20),
+                        "status": TicketStatus.open,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for _ in range(min(batch, rows - start))
+                ],
+            )
+        await db.commit()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        start = time.perf_counter()
+        await fill_table(session_factory, args.rows)
+        print(f"Indexed {args.rows} tickets in {time.perf_counter() - start:.1f}s")
+
+        query_kinds = {
+            "one term": lambda: random.choice(VOCABULARY),
+            "two terms": lambda: random_words(2),
+            # The beginning of a word, as typed in a search-as-you-type box
+            "prefix": lambda: random.choice(VOCABULARY)[:-1] + "*",
+        }
+        print(f"{'query':<12}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for kind, make_query in query_kinds.items():
+            latencies = []
+            for _ in range(args.queries):
+                query = make_query()
+                start = time.perf_counter()
+                async with session_factory() as db:
+                    await tickets_crud.search_tickets(db, query=query, limit=20)
+                latencies.append((time.perf_counter() - start) * 1000)
+            # Inclusive: the percentiles stay within the measured latencies
+            quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+            print(
+                f"{kind:<12}{quantiles[49]:>10.2f}{quantiles[98]:>10.2f}"
+                f"{max(latencies):>10.2f}"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
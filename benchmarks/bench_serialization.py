@@ -0,0 +1,96 @@
+"""
+Per-row cost of reading and serializing the tickets of GET /tickets/.
+
+Compares, on the same page of tickets:
+- "orm": the previous path, ORM instances converted by TicketOut.from_orm,
+  then validated again and serialized against the response_model (as FastAPI
+  does for a route returning a Pydantic model), then encoded with json;
+- "columns": the fast path, plain column tuples turned into dicts by
+  get_all_tickets and encoded by FastJSONResponse (orjson).
+
+Usage:
+    python benchmarks/bench_serialization.py --rows 100 --rounds 200
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.crud import tickets_crud
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+from app.models.models import Ticket
+from app.routers.responses import FastJSONResponse
+from app.schemas.tickets import TicketCreate, TicketOut, TicketsResponseList
+
+
+async def orm_page(db, rows: int) -> bytes:
+    result = await db.execute(select(Ticket).order_by(Ticket.created_at).limit(rows))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # from_orm is deprecated
+        page = TicketsResponseList(
+            total=rows,
+            skip=0,
+            limit=rows,
+            results=[TicketOut.from_orm(ticket) for ticket in result.scalars()],
+        )
+    # The response_model validation and serialization of FastAPI
+    validated = TicketsResponseList.model_validate(page.model_dump())
+    return json.dumps(validated.model_dump(mode="json")).encode()
+
+
+async def columns_page(db, rows: int) -> bytes:
+    page = await tickets_crud.get_all_tickets(db, limit=rows, include_total=False)
+    return FastJSONResponse(page).body
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url)
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        async with session_factory() as db:
+            await tickets_crud.create_tickets(
+                db,
+                [
+                    TicketCreate(title=f"ticket {i}", description="benchmark")
+                    for i in range(args.rows)
+                ],
+            )
+
+        print(f"{'path':<10}{'us/row':>10}{'pages/s':>10}")
+        for name, read_page in (("orm", orm_page), ("columns", columns_page)):
+            async with session_factory() as db:
+                await read_page(db, args.rows)  # warm up
+                start = time.perf_counter()
+                for _ in range(args.rounds):
+                    await read_page(db, args.rows)
+                elapsed = time.perf_counter() - start
+            print(
+                f"{name:<10}{elapsed / args.rounds / args.rows * 1e6:>10.2f}"
+                f"{args.rounds / elapsed:>10.0f}"
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
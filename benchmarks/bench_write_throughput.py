@@ -0,0 +1,85 @@
+"""
+Write throughput of the SQLite storage profiles.
+
+Creates tickets concurrently against a fresh file database, once per storage
+profile, and reports the committed tickets per second and the number of
+failed writes ("database is locked").
+
+Usage:
+    python benchmarks/bench_write_throughput.py --tickets 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from app.config.settings import SQLITE_STORAGE_PROFILES
+from app.crud import tickets_crud
+from app.db.schema import create_schema
+from app.db.sqlite import build_engine
+
+
+async def run_profile(profile: str, tickets: int, concurrency: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+        engine = build_engine(url, pragmas=SQLITE_STORAGE_PROFILES[profile])
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        session_factory = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+
+        queue = asyncio.Queue()
+        for i in range(tickets):
+            queue.put_nowait(i)
+        errors = 0
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                i = queue.get_nowait()
+                async with session_factory() as db:
+                    try:
+                        await tickets_crud.create_ticket(
+                            db, title=f"ticket {i}", description="benchmark"
+                        )
+                    except Exception:
+                        errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        await engine.dispose()
+
+    return {
+        "profile": profile,
+        "elapsed": elapsed,
+        "throughput": (tickets - errors) / elapsed,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12}{'seconds':>10}{'tickets/s':>12}{'errors':>8}")
+    for profile in SQLITE_STORAGE_PROFILES:
+        result = await run_profile(profile, args.tickets, args.concurrency)
+        print(
+            f"{result['profile']:<12}{result['elapsed']:>10.2f}"
+            f"{result['throughput']:>12.0f}{result['errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
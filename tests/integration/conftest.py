@@ -1,12 +1,14 @@
 import asyncio
 import os
 import sys
+from contextlib import contextmanager
 
 import pytest
+from sqlalchemy import event
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db.schema import create_schema
 from app.db.sqlite import create_sqlite_connection, database
-from app.models.models import Base
 
 
 @pytest.fixture
@@ -14,6 +16,32 @@ def ticket_id() -> str:
     return "e8a69b44-98dc-4fc1-9f24-b764fd8c89a2"
 
 
+@pytest.fixture
+def count_statements():
+    """
+    Context manager collecting the SQL statements executed on the database
+    (by the writer and the readers) within its block.
+    """
+
+    @contextmanager
+    def collect_statements():
+        statements = []
+        engines = {database.engine.sync_engine, database.read_engine.sync_engine}
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            for engine in engines:
+                event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return collect_statements
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_database_sync():
     asyncio.run(setup_database())
@@ -22,4 +50,4 @@ def setup_database_sync():
 async def setup_database():
     await create_sqlite_connection()
     async with database.engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_schema)
@@ -0,0 +1,37 @@
+import os
+import sys
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_batch_get_tickets_with_one_query(count_statements):
+    missing_id = str(uuid.uuid4())
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/bulk",
+            json=[
+                {"title": f"Batch get {i}", "description": "Batch"} for i in range(3)
+            ],
+        )
+        tickets = [item["ticket"] for item in created.json()["results"]]
+        ids = [tickets[2]["id"], missing_id, tickets[0]["id"], tickets[2]["id"]]
+        with count_statements() as statements:
+            response = await client.post("/tickets/batch-get", json={"ids": ids})
+        for ticket in tickets:
+            await client.delete(
+                f"/tickets/{ticket['id']}", params={"force_delete": True}
+            )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [tickets[2], tickets[0]],
+        "missing": [missing_id],
+    }
+    assert len(statements) == 1
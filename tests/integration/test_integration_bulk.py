@@ -0,0 +1,114 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tickets_with_reject_duplicates():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        existing = await client.post(
+            "/tickets/", json={"title": "Bulk existing", "description": "Already"}
+        )
+        response = await client.post(
+            "/tickets/bulk?reject_duplicates=true",
+            json=[
+                {"title": "Bulk first", "description": "Created"},
+                {"title": "Bulk existing", "description": "Rejected (table)"},
+                {"title": "Bulk first", "description": "Rejected (batch)"},
+                {"title": "Bulk second", "description": "Created", "status": "closed"},
+            ],
+        )
+        created_ids = [
+            item["ticket"]["id"]
+            for item in response.json()["results"]
+            if item["status"] == "created"
+        ]
+        get_ticket = await client.get(f"/tickets/{created_ids[1]}")
+        listed = await client.get("/tickets/", params={"title_prefix": "Bulk"})
+        searched = await client.get("/tickets/search", params={"q": "bulk second"})
+        for ticket_id in created_ids + [existing.json()["id"]]:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+    data = response.json()
+    assert response.status_code == 200
+    assert (data["created"], data["rejected"]) == (2, 2)
+    assert [item["status"] for item in data["results"]] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "created",
+    ]
+    assert data["results"][1]["detail"] == (
+        "A ticket with the title: Bulk existing, already exists."
+    )
+    assert get_ticket.json() == data["results"][3]["ticket"]
+    assert listed.json()["total"] == 3
+    assert [t["id"] for t in searched.json()["results"]] == [created_ids[1]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tickets_allows_duplicates_by_default():
+    tickets = [{"title": "Bulk same", "description": "Same title"}] * 3
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/tickets/bulk", json=tickets)
+        for item in response.json()["results"]:
+            await client.delete(
+                f"/tickets/{item['ticket']['id']}", params={"force_delete": True}
+            )
+
+    assert response.json()["created"] == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_tickets_without_description():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        single = await client.post("/tickets/", json={"title": "Bulk nodesc"})
+        response = await client.post(
+            "/tickets/bulk?reject_duplicates=true",
+            json=[
+                {"title": "Bulk nodesc"},
+                {"title": "Bulk nodesc", "description": "Created"},
+            ],
+        )
+        for item in response.json()["results"]:
+            if item["ticket"]:
+                await client.delete(
+                    f"/tickets/{item['ticket']['id']}", params={"force_delete": True}
+                )
+
+    assert single.status_code == 422
+    assert "description" in single.json()["detail"]
+    data = response.json()
+    assert response.status_code == 200
+    assert (data["created"], data["rejected"]) == (1, 1)
+    assert [item["status"] for item in data["results"]] == ["invalid", "created"]
+    assert "description" in data["results"][0]["detail"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_duplicates_check_holds_the_write_lock(count_statements):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with count_statements() as statements:
+            response = await client.post(
+                "/tickets/bulk",
+                params={"reject_duplicates": True},
+                json=[{"title": "Locked check", "description": "Checked"}],
+            )
+        await client.delete(
+            f"/tickets/{response.json()['results'][0]['ticket']['id']}",
+            params={"force_delete": True},
+        )
+
+    # The transaction starts with the write lock, before the duplicates check
+    check = next(i for i, s in enumerate(statements) if "WHERE tickets.title IN" in s)
+    assert statements.index("BEGIN IMMEDIATE") < check
+    assert response.json()["created"] == 1
@@ -0,0 +1,133 @@
+import os
+import sys
+import uuid
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud import tickets_crud
+from app.db.sqlite import database
+from app.main import app
+from app.schemas.tickets import TicketFilter, TicketSelection, TicketUpdate
+
+
+async def create_tickets(client, statuses):
+    response = await client.post(
+        "/tickets/bulk",
+        json=[
+            {"title": f"Bulk update {i}", "description": "Bulk", "status": status}
+            for i, status in enumerate(statuses)
+        ],
+    )
+    return [item["ticket"]["id"] for item in response.json()["results"]]
+
+
+async def delete_tickets(client, ticket_ids):
+    for ticket_id in ticket_ids:
+        await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+
+@pytest.mark.asyncio
+async def test_bulk_close_tickets_by_ids_reports_skipped(count_statements):
+    missing_id = str(uuid.uuid4())
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = await create_tickets(client, ["open", "open", "closed", "stalled"])
+        with count_statements() as statements:
+            response = await client.patch(
+                "/tickets/bulk/close", json={"ids": ids + [missing_id]}
+            )
+        statuses = [(await client.get(f"/tickets/{i}")).json()["status"] for i in ids]
+        await delete_tickets(client, ids)
+
+    data = response.json()
+    assert response.status_code == 200
+    assert data["updated"] == 2
+    assert sorted(data["updated_ids"]) == sorted(ids[:2])
+    assert data["skipped"] == [
+        {"id": ids[2], "reason": "already_closed"},
+        {"id": ids[3], "reason": "stalled"},
+        {"id": missing_id, "reason": "not_found"},
+    ]
+    assert statuses == ["closed", "closed", "closed", "stalled"]
+    # One UPDATE for the whole set, plus one lookup of the skipped tickets
+    assert len([s for s in statements if s.startswith("UPDATE tickets")]) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_close_tickets_by_filter():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = await create_tickets(client, ["open", "open", "stalled"])
+        response = await client.patch(
+            "/tickets/bulk/close", json={"filter": {"title_prefix": "Bulk update"}}
+        )
+        counts = await client.get(
+            "/tickets/", params={"status": "closed", "title_prefix": "Bulk update"}
+        )
+        await delete_tickets(client, ids)
+
+    data = response.json()
+    assert data["updated"] == 2
+    assert data["skipped"] == [{"id": ids[2], "reason": "stalled"}]
+    assert counts.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tickets_by_filter():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = await create_tickets(client, ["open", "open", "closed"])
+        response = await client.patch(
+            "/tickets/bulk",
+            json={
+                "filter": {"status": "open", "title_prefix": "Bulk update"},
+                "update": {"status": "stalled", "description": "Waiting"},
+            },
+        )
+        tickets = [(await client.get(f"/tickets/{i}")).json() for i in ids]
+        await delete_tickets(client, ids)
+
+    data = response.json()
+    assert data["updated"] == 2
+    assert data["skipped"] == []
+    assert [t["status"] for t in tickets] == ["stalled", "stalled", "closed"]
+    assert [t["description"] for t in tickets] == ["Waiting", "Waiting", "Bulk"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_close_tickets_by_filter_in_bounded_batches():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = await create_tickets(
+            client, ["open", "closed", "open", "stalled", "open"]
+        )
+        responses = []
+        selection = TicketSelection(filter=TicketFilter(title_prefix="Bulk update"))
+        while True:
+            async with database.async_session() as db:
+                response = await tickets_crud.update_tickets(
+                    db, selection, TicketUpdate(status="closed"), max_items=2
+                )
+            responses.append(response)
+            if response.next_cursor is None:
+                break
+            selection = TicketSelection(
+                filter=selection.filter, cursor=response.next_cursor
+            )
+        invalid_cursor = await client.patch(
+            "/tickets/bulk/close",
+            json={"filter": {"title_prefix": "Bulk update"}, "cursor": "invalid"},
+        )
+        await delete_tickets(client, ids)
+
+    assert [len(r.updated_ids) + len(r.skipped) for r in responses] == [2, 2, 1]
+    assert sorted(str(i) for r in responses for i in r.updated_ids) == sorted(
+        [ids[0], ids[2], ids[4]]
+    )
+    assert [(str(s.id), s.reason.value) for r in responses for s in r.skipped] == [
+        (ids[1], "already_closed"),
+        (ids[3], "stalled"),
+    ]
+    assert invalid_cursor.status_code == 400
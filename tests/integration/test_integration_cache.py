@@ -0,0 +1,66 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud.cache import ticket_cache
+from app.main import app
+
+
+def selects(statements):
+    return [s for s in statements if s.startswith("SELECT")]
+
+
+@pytest.mark.asyncio
+async def test_cached_ticket_is_invalidated_by_writes(count_statements):
+    if not ticket_cache.enabled:
+        pytest.skip("The tickets cache is disabled")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "Cached ticket", "description": "Hot"}
+        )
+        url = f"/tickets/{created.json()['id']}"
+        with count_statements() as statements:
+            first = await client.get(url)
+            second = await client.get(url)
+        first_reads = len(selects(statements))
+
+        await client.put(url, json={"description": "Edited"})
+        edited = await client.get(url)
+        await client.patch(f"{url}/close")
+        closed = await client.get(url)
+        await client.delete(url)
+        deleted = await client.get(url)
+        stats = await client.get("/tickets/cache/stats")
+
+    assert first.json() == second.json()
+    assert first_reads == 1
+    assert edited.json()["description"] == "Edited"
+    assert closed.json()["status"] == "closed"
+    assert deleted.status_code == 404
+    assert stats.json()["tickets"]["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_cached_tickets_are_invalidated_by_bulk_writes():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/bulk",
+            json=[
+                {"title": f"Cached bulk {i}", "description": "Hot"} for i in range(2)
+            ],
+        )
+        ids = [item["ticket"]["id"] for item in created.json()["results"]]
+        for ticket_id in ids:
+            await client.get(f"/tickets/{ticket_id}")
+        await client.patch("/tickets/bulk/close", json={"ids": ids})
+        closed = [(await client.get(f"/tickets/{i}")).json()["status"] for i in ids]
+        await client.delete("/tickets/")
+        deleted = [(await client.get(f"/tickets/{i}")).status_code for i in ids]
+
+    assert closed == ["closed", "closed"]
+    assert deleted == [404, 404]
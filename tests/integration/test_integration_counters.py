@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db.sqlite import database
+from app.main import app
+
+
+async def counters_and_counts():
+    async with database.engine.connect() as conn:
+        counters = await conn.execute(text("SELECT status, count FROM ticket_counters"))
+        counts = await conn.execute(
+            text("SELECT status, count(*) FROM tickets GROUP BY status")
+        )
+    counts = dict(counts.fetchall())
+    return {
+        status: count for status, count in counters if count or status in counts
+    }, counts
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_every_write():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = []
+        for status in ("open", "open", "stalled", "closed"):
+            response = await client.post(
+                "/tickets/",
+                json={"title": f"Counted {status}", "description": "Counters"},
+            )
+            ids.append(response.json()["id"])
+            if status != "open":
+                await client.put(f"/tickets/{ids[-1]}", json={"status": status})
+        await client.patch(f"/tickets/{ids[0]}/close")
+        await client.delete(f"/tickets/{ids[0]}")
+        listed = await client.get("/tickets/")
+        counters, counts = await counters_and_counts()
+        deleted = await client.delete("/tickets/", params={"force_delete": True})
+        counters_after_delete, _ = await counters_and_counts()
+
+    assert counters == counts
+    assert listed.json()["total"] == sum(counts.values())
+    assert deleted.json()["message"].endswith(" 0 remaining tickets.")
+    assert counters_after_delete == {}
+
+
+@pytest.mark.asyncio
+async def test_list_tickets_without_count(count_statements):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with count_statements() as statements:
+            with_total = await client.get("/tickets/")
+        without_total = await client.get("/tickets/", params={"include_total": False})
+
+    assert with_total.json()["total"] == 0
+    assert without_total.json()["total"] is None
+    assert not any("count(*)" in statement for statement in statements)
@@ -0,0 +1,49 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_with_reject_duplicates():
+    ticket_data = {"title": "Concurrent unique title", "description": "Race"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(
+            *(
+                client.post("/tickets/?reject_duplicates=True", json=ticket_data)
+                for _ in range(10)
+            )
+        )
+        created = [r for r in responses if r.status_code == 201]
+        get_ticket = await client.get(f"/tickets/{created[0].json()['id']}")
+        await client.delete(
+            f"/tickets/{created[0].json()['id']}", params={"force_delete": True}
+        )
+
+    assert len(created) == 1
+    assert sorted(r.status_code for r in responses) == [201] + [400] * 9
+    assert get_ticket.status_code == 200
+    assert get_ticket.json() == created[0].json()
+
+
+@pytest.mark.asyncio
+async def test_duplicates_allowed_without_reject_duplicates():
+    ticket_data = {"title": "Duplicated title", "description": "Allowed"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/tickets/", json=ticket_data)
+        second = await client.post("/tickets/", json=ticket_data)
+        for response in (first, second):
+            await client.delete(
+                f"/tickets/{response.json()['id']}", params={"force_delete": True}
+            )
+
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert first.json()["id"] != second.json()["id"]
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import update
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db.sqlite import database
+from app.main import app
+from app.models.models import Ticket
+
+
+@pytest.mark.asyncio
+async def test_etags_change_with_the_tickets():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "ETag ticket", "description": "Polled"}
+        )
+        url = f"/tickets/{created.json()['id']}"
+        params = {"title_prefix": "ETag"}
+
+        ticket = await client.get(url)
+        page = await client.get("/tickets/", params=params)
+        unchanged_ticket = await client.get(
+            url, headers={"If-None-Match": ticket.headers["etag"]}
+        )
+        unchanged_page = await client.get(
+            "/tickets/", params=params, headers={"If-None-Match": page.headers["etag"]}
+        )
+
+        await client.put(url, json={"description": "Edited"})
+        changed_ticket = await client.get(
+            url, headers={"If-None-Match": ticket.headers["etag"]}
+        )
+        changed_page = await client.get(
+            "/tickets/", params=params, headers={"If-None-Match": page.headers["etag"]}
+        )
+        await client.delete(url, params={"force_delete": True})
+
+    assert (unchanged_ticket.status_code, unchanged_page.status_code) == (304, 304)
+    assert changed_ticket.status_code == 200
+    assert changed_ticket.json()["description"] == "Edited"
+    assert changed_ticket.headers["etag"] != ticket.headers["etag"]
+    assert changed_page.status_code == 200
+    assert changed_page.json()["results"][0]["description"] == "Edited"
+
+
+@pytest.mark.asyncio
+async def test_list_etags_change_with_a_write_outside_the_api():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "ETag outside", "description": "Polled"}
+        )
+        params = {"title_prefix": "ETag outside"}
+        page = await client.get("/tickets/", params=params)
+        # As another process would, without the crud functions of the API
+        async with database.engine.begin() as conn:
+            await conn.execute(
+                update(Ticket)
+                .where(Ticket.title == "ETag outside")
+                .values(description="Edited outside")
+            )
+        changed_page = await client.get(
+            "/tickets/", params=params, headers={"If-None-Match": page.headers["etag"]}
+        )
+        await client.delete(
+            f"/tickets/{created.json()['id']}", params={"force_delete": True}
+        )
+
+    assert changed_page.status_code == 200
+    assert changed_page.headers["etag"] != page.headers["etag"]
+    assert changed_page.json()["results"][0]["description"] == "Edited outside"
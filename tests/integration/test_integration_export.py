@@ -0,0 +1,98 @@
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud import exports
+from app.db.sqlite import database
+from app.main import app
+from app.schemas.tickets import ExportFormat, TicketFilter
+
+
+async def create_tickets(client):
+    response = await client.post(
+        "/tickets/bulk",
+        json=[
+            {
+                "title": f"Export {i}",
+                "description": "Export, with a comma",
+                "status": "closed" if i % 2 else "open",
+            }
+            for i in range(5)
+        ],
+    )
+    return [item["ticket"] for item in response.json()["results"]]
+
+
+async def delete_tickets(client, tickets):
+    for ticket in tickets:
+        await client.delete(f"/tickets/{ticket['id']}", params={"force_delete": True})
+
+
+@pytest.mark.asyncio
+async def test_export_tickets_ndjson():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        export_tickets = await create_tickets(client)
+        response = await client.get(
+            "/tickets/export", params={"title_prefix": "Export"}
+        )
+        await delete_tickets(client, export_tickets)
+
+    assert response.status_code == 200
+    assert [json.loads(line) for line in response.text.splitlines()] == export_tickets
+
+
+@pytest.mark.asyncio
+async def test_export_tickets_csv_filtered():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        export_tickets = await create_tickets(client)
+        response = await client.get(
+            "/tickets/export",
+            params={"format": "csv", "title_prefix": "Export", "status": "closed"},
+        )
+        await delete_tickets(client, export_tickets)
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [t["id"] for t in export_tickets[1::2]]
+    assert rows[0]["description"] == "Export, with a comma"
+    assert rows[0]["status"] == "closed"
+    assert rows[0]["version"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_export_tickets_gzip_in_chunks(monkeypatch):
+    # Several database chunks, encoded into one gzip stream
+    chunk_sizes = []
+    stream_tickets = exports.tickets_crud.stream_tickets
+
+    async def stream_small_chunks(db, filters):
+        async for rows in stream_tickets(db, filters=filters, chunk_size=2):
+            chunk_sizes.append(len(rows))
+            yield rows
+
+    monkeypatch.setattr(exports.tickets_crud, "stream_tickets", stream_small_chunks)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        export_tickets = await create_tickets(client)
+        chunks = [
+            chunk
+            async for chunk in exports.export_tickets(
+                database.read_session,
+                export_format=ExportFormat.ndjson,
+                filters=TicketFilter(title_prefix="Export"),
+                compress=True,
+            )
+        ]
+        await delete_tickets(client, export_tickets)
+
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    assert [json.loads(line) for line in lines] == export_tickets
+    assert chunk_sizes == [2, 2, 1]
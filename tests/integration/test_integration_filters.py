@@ -0,0 +1,175 @@
+import os
+import sys
+from contextlib import asynccontextmanager
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db.sqlite import database
+from app.main import app
+
+
+@asynccontextmanager
+async def tickets_client():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created_ids = []
+        for i, status in enumerate(["open", "stalled", "closed"] * 4):
+            response = await client.post(
+                "/tickets/",
+                json={
+                    "title": f"Filter {status} {i:02d}",
+                    "description": "Filters",
+                    "status": status,
+                },
+            )
+            created_ids.append(response.json()["id"])
+        yield client, created_ids
+        for ticket_id in created_ids:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+
+async def list_query_plan(client, params: dict) -> str:
+    """List tickets with the given params and explain the tickets SELECT."""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        if statement.startswith("SELECT") and "LIMIT" in statement:
+            queries.append((statement, parameters))
+
+    engine = database.read_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = await client.get("/tickets/", params=params)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert response.status_code == 200
+
+    statement, parameters = queries[0]
+    async with database.engine.connect() as conn:
+        rows = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return " ".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_filter_tickets_by_status_and_title_prefix():
+    async with tickets_client() as (client, created_ids):
+        by_status = await client.get(
+            "/tickets/", params={"status": "stalled", "limit": 100}
+        )
+        by_prefix = await client.get(
+            "/tickets/", params={"title_prefix": "Filter closed", "limit": 100}
+        )
+
+    assert by_status.json()["total"] == 4
+    assert {t["status"] for t in by_status.json()["results"]} == {"stalled"}
+    assert by_prefix.json()["total"] == 4
+    assert all(
+        t["title"].startswith("Filter closed") for t in by_prefix.json()["results"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_filter_tickets_by_title_prefix_ending_with_max_character():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/",
+            json={"title": "Max \U0010ffff\U0010ffffz", "description": "Prefix"},
+        )
+        max_prefix = await client.get(
+            "/tickets/", params={"title_prefix": "Max \U0010ffff"}
+        )
+        only_max = await client.get("/tickets/", params={"title_prefix": "\U0010ffff"})
+        before_surrogates = await client.get(
+            "/tickets/", params={"title_prefix": "\ud7ff"}
+        )
+        await client.delete(
+            f"/tickets/{created.json()['id']}", params={"force_delete": True}
+        )
+
+    assert max_prefix.status_code == 200
+    assert [t["title"] for t in max_prefix.json()["results"]] == [
+        "Max \U0010ffff\U0010ffffz"
+    ]
+    assert only_max.status_code == 200
+    assert only_max.json()["results"] == []
+    assert before_surrogates.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_filter_tickets_by_dates_and_sort_descending():
+    async with tickets_client() as (client, created_ids):
+        first = await client.get(f"/tickets/{created_ids[0]}")
+        last = await client.get(f"/tickets/{created_ids[-1]}")
+        pages = [
+            await client.get(
+                "/tickets/",
+                params={
+                    "created_after": first.json()["created_at"],
+                    "created_before": last.json()["created_at"],
+                    "sort": "-created_at",
+                    "limit": 5,
+                },
+            )
+        ]
+        while pages[-1].json()["next_cursor"]:
+            pages.append(
+                await client.get(
+                    "/tickets/",
+                    params={
+                        "created_after": first.json()["created_at"],
+                        "created_before": last.json()["created_at"],
+                        "sort": "-created_at",
+                        "limit": 5,
+                        "cursor": pages[-1].json()["next_cursor"],
+                    },
+                )
+            )
+        wrong_sort = await client.get(
+            "/tickets/",
+            params={"sort": "updated_at", "cursor": pages[0].json()["next_cursor"]},
+        )
+
+    listed_ids = [t["id"] for page in pages for t in page.json()["results"]]
+    # created_before is exclusive: the last created ticket is not listed
+    assert listed_ids == list(reversed(created_ids[:-1]))
+    assert pages[0].json()["total"] == len(created_ids) - 1
+    assert wrong_sort.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params, index",
+    [
+        ({"status": "open"}, "ix_tickets_status_created_at_id"),
+        ({"sort": "-updated_at"}, "ix_tickets_updated_at_id"),
+        (
+            {"status": "closed", "sort": "-updated_at"},
+            "ix_tickets_status_updated_at_id",
+        ),
+        (
+            {
+                "created_after": "2025-01-01T00:00:00",
+                "created_before": "2025-02-01T00:00:00",
+            },
+            "ix_tickets_created_at_id",
+        ),
+    ],
+)
+async def test_filters_and_sorts_are_served_by_indexes(params, index):
+    async with tickets_client() as (client, _):
+        plan = await list_query_plan(client, params)
+
+    assert f"USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_title_prefix_is_served_by_index():
+    async with tickets_client() as (client, _):
+        plan = await list_query_plan(client, {"title_prefix": "Filter"})
+
+    assert "SEARCH tickets USING INDEX ix_tickets_title (title>? AND title<?)" in plan
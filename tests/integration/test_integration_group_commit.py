@@ -0,0 +1,57 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud import group_commit
+from app.db.sqlite import database
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_committed_together():
+    writer = group_commit.start_group_commit(database.async_session, interval=0.05)
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await asyncio.gather(
+                *(
+                    client.post(
+                        "/tickets/",
+                        json={"title": f"Group commit {i}", "description": "Batch"},
+                    )
+                    for i in range(10)
+                )
+            )
+            ids = [response.json()["id"] for response in created]
+            duplicate, updated, closed, missing = await asyncio.gather(
+                client.post(
+                    "/tickets/?reject_duplicates=true",
+                    json={"title": "Group commit 0", "description": "Batch"},
+                ),
+                client.put(f"/tickets/{ids[0]}", json={"description": "Edited"}),
+                client.patch(f"/tickets/{ids[1]}/close"),
+                client.put(
+                    "/tickets/00000000-0000-0000-0000-000000000000",
+                    json={"description": "Nobody"},
+                ),
+            )
+            fetched = await client.get(f"/tickets/{ids[0]}")
+            for ticket_id in ids:
+                await client.delete(f"/tickets/{ticket_id}?force_delete=true")
+    finally:
+        await group_commit.stop_group_commit()
+
+    assert all(response.status_code == 201 for response in created)
+    assert len(set(ids)) == 10
+    assert duplicate.status_code == 400
+    assert updated.json()["description"] == "Edited"
+    assert closed.json()["status"] == "closed"
+    assert missing.status_code == 404
+    assert fetched.json()["description"] == "Edited"
+    # 14 writes in (much) fewer transactions
+    assert writer.writes == 14
+    assert writer.batches < writer.writes
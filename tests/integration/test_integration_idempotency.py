@@ -0,0 +1,77 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud.cache import idempotency_cache
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_retried_create_returns_the_first_ticket(count_statements):
+    ticket_data = {"title": "Idempotent create", "description": "Retried"}
+    headers = {"Idempotency-Key": "create-retried"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/tickets/", json=ticket_data, headers=headers)
+        cached_retry = await client.post("/tickets/", json=ticket_data, headers=headers)
+        idempotency_cache.clear()
+        with count_statements() as statements:
+            stored_retry = await client.post(
+                "/tickets/", json=ticket_data, headers=headers
+            )
+        reused = await client.post(
+            "/tickets/", json={**ticket_data, "title": "Another"}, headers=headers
+        )
+        listed = await client.get("/tickets/?title_prefix=Idempotent create")
+        await client.delete(f"/tickets/{first.json()['id']}?force_delete=true")
+
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+    for retry in (cached_retry, stored_retry):
+        assert retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+    # Without the cache, the retry reads the idempotency_keys table only
+    assert len(statements) == 1
+    assert "idempotency_keys" in statements[0]
+    assert "tickets " not in statements[0]
+    assert reused.status_code == 422
+    assert listed.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retried_close_returns_the_first_response():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "Idempotent close", "description": "Retried"}
+        )
+        url = f"/tickets/{created.json()['id']}"
+        headers = {"Idempotency-Key": "close-retried"}
+        first = await client.patch(f"{url}/close", headers=headers)
+        retry = await client.patch(f"{url}/close", headers=headers)
+        without_key = await client.patch(f"{url}/close")
+        await client.delete(f"{url}?force_delete=true")
+
+    assert first.status_code == 200
+    assert first.json()["status"] == "closed"
+    assert retry.status_code == 200
+    assert retry.json() == first.json()
+    assert without_key.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_failed_write_does_not_store_its_key():
+    headers = {"Idempotency-Key": "close-missing"}
+    url = "/tickets/00000000-0000-0000-0000-000000000000/close"
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.patch(url, headers=headers)
+        retry = await client.patch(url, headers=headers)
+
+    assert first.status_code == 404
+    assert retry.status_code == 404
+    assert "Idempotent-Replayed" not in retry.headers
@@ -0,0 +1,105 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import cli
+from app.main import app
+
+
+async def delete_imported_tickets(client, prefix):
+    listed = await client.get(
+        "/tickets/", params={"title_prefix": prefix, "limit": 100}
+    )
+    for ticket in listed.json()["results"]:
+        await client.delete(f"/tickets/{ticket['id']}", params={"force_delete": True})
+    return listed.json()
+
+
+@pytest.mark.asyncio
+async def test_import_tickets_in_batches():
+    lines = [
+        json.dumps({"title": f"Import {i}", "description": "Imported"})
+        for i in range(5)
+    ]
+    lines[1] = json.dumps({"title": "Import 0", "description": "Duplicate"})
+    lines.insert(3, '{"title": "Im"}')
+    lines.insert(4, "")
+    lines.append("not json")
+    body = "\n".join(lines).encode()
+
+    async def chunked_body():
+        for i in range(0, len(body), 7):
+            yield body[i : i + 7]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/tickets/import",
+            params={"reject_duplicates": True},
+            content=chunked_body(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        listed = await delete_imported_tickets(client, "Import ")
+
+    data = response.json()
+    assert response.status_code == 200
+    assert (data["lines"], data["imported"], data["rejected"]) == (7, 4, 3)
+    assert [rejected["line"] for rejected in data["rejected_lines"]] == [2, 4, 8]
+    assert "already exists" in data["rejected_lines"][0]["detail"]
+    assert data["rejected_lines"][1]["detail"].startswith("title:")
+    assert data["rejected_lines"][2]["detail"].startswith("Invalid JSON")
+    assert data["rows_per_second"] > 0
+    assert [t["title"] for t in listed["results"]] == [
+        "Import 0",
+        "Import 2",
+        "Import 3",
+        "Import 4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_tickets_file_with_cli():
+    file = io.BytesIO(
+        b'{"title": "Cli import 1", "description": "From a file", "status": "closed"}\n'
+        b'{"title": "Cli import 2", "description": "From the CLI"}\n'
+    )
+
+    result = await cli.import_file(file, batch_size=1)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        listed = await delete_imported_tickets(client, "Cli import")
+
+    assert (result.imported, result.rejected) == (2, 0)
+    assert [t["status"] for t in listed["results"]] == ["closed", "open"]
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_lines_without_description():
+    body = (
+        b'{"title": "Nodesc import 1", "description": "First batch"}\n'
+        b'{"title": "Nodesc import 2"}\n'
+        b'{"title": "Nodesc import 3", "description": "Last batch"}\n'
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/tickets/import",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        listed = await delete_imported_tickets(client, "Nodesc import")
+
+    data = response.json()
+    assert response.status_code == 200
+    assert (data["lines"], data["imported"], data["rejected"]) == (3, 2, 1)
+    assert data["rejected_lines"][0]["line"] == 2
+    assert "description" in data["rejected_lines"][0]["detail"]
+    assert [t["title"] for t in listed["results"]] == [
+        "Nodesc import 1",
+        "Nodesc import 3",
+    ]
@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db.schema import create_schema
+from app.db.sqlite import database
+
+
+async def query_plan(conn, query: str) -> str:
+    rows = await conn.execute(text(f"EXPLAIN QUERY PLAN {query}"))
+    return " ".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_title_lookup_uses_index():
+    async with database.engine.connect() as conn:
+        plan = await query_plan(conn, "SELECT id FROM tickets WHERE title = 'abc'")
+
+    assert "USING INDEX ix_tickets_title" in plan
+
+
+@pytest.mark.asyncio
+async def test_status_filter_uses_index():
+    async with database.engine.connect() as conn:
+        plan = await query_plan(
+            conn,
+            "SELECT id FROM tickets WHERE status = 'closed' ORDER BY created_at",
+        )
+
+    assert "INDEX ix_tickets_status_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_missing_indexes_are_created_on_existing_table():
+    async with database.engine.begin() as conn:
+        await conn.execute(text("DROP INDEX ix_tickets_title"))
+        await conn.run_sync(create_schema)
+        indexes = await conn.execute(text("PRAGMA index_list('tickets')"))
+
+    assert "ix_tickets_title" in {row[1] for row in indexes}
@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud import tickets_crud
+from app.db.sqlite import database
+from app.main import app
+
+
+async def create_tickets(client, count, status):
+    await client.post(
+        "/tickets/bulk",
+        json=[
+            {"title": f"Mass delete {i}", "description": "Mass", "status": status}
+            for i in range(count)
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_tickets_in_batches(count_statements):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await create_tickets(client, 25, "closed")
+        await create_tickets(client, 3, "open")
+        async with database.async_session() as db:
+            progress = []
+            with count_statements() as statements:
+                result = await tickets_crud.delete_tickets(
+                    db, batch_size=10, on_progress=progress.append
+                )
+        remaining = await client.get("/tickets/", params={"title_prefix": "Mass"})
+        await client.delete("/tickets/", params={"force_delete": True})
+
+    assert result["delete_count"] == 25
+    assert progress == [10, 20, 25]
+    # One bounded DELETE per batch
+    assert len([s for s in statements if s.startswith("DELETE")]) == 3
+    assert remaining.json()["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_delete_tickets_async_job():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await create_tickets(client, 30, "closed")
+        response = await client.delete("/tickets/", params={"run_async": True})
+        job_id = response.json()["id"]
+        for _ in range(100):
+            job = (await client.get(f"/tickets/jobs/{job_id}")).json()
+            if job["state"] != "running":
+                break
+            await asyncio.sleep(0.01)
+        remaining = await client.get(
+            "/tickets/", params={"title_prefix": "Mass", "status": "closed"}
+        )
+
+    assert response.status_code == 202
+    assert job["state"] == "done"
+    assert job["deleted"] == 30
+    assert job["finished_at"] is not None
+    assert remaining.json()["total"] == 0
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud.cache import page_cache
+from app.db.sqlite import database
+from app.main import app
+from app.models.models import Ticket
+
+
+@pytest.mark.asyncio
+async def test_list_pages_are_cached_until_a_write(count_statements):
+    if not page_cache.enabled:
+        pytest.skip("The pages cache is disabled")
+    params = {"title_prefix": "Page cache", "limit": 5}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "Page cache 1", "description": "Listed"}
+        )
+        first = await client.get("/tickets/", params=params)
+        with count_statements() as statements:
+            cached = await client.get("/tickets/", params=params)
+        await client.post(
+            "/tickets/", json={"title": "Page cache 2", "description": "Listed"}
+        )
+        after_write = await client.get("/tickets/", params=params)
+        stats = await client.get("/tickets/cache/stats")
+        for ticket in after_write.json()["results"]:
+            await client.delete(
+                f"/tickets/{ticket['id']}", params={"force_delete": True}
+            )
+
+    assert created.status_code == 201
+    assert cached.content == first.content
+    # Only the primary key lookup of the data version
+    assert len(statements) == 1
+    assert "FROM tickets_version" in statements[0]
+    assert first.json()["total"] == 1
+    assert after_write.json()["total"] == 2
+    assert stats.json()["pages"]["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_list_pages_are_outdated_by_a_write_outside_the_api():
+    if not page_cache.enabled:
+        pytest.skip("The pages cache is disabled")
+    params = {"title_prefix": "Outside write", "limit": 5}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.post(
+            "/tickets/", json={"title": "Outside write 1", "description": "API"}
+        )
+        first = await client.get("/tickets/", params=params)
+        # As the import CLI would, without the crud functions of the API
+        async with database.engine.begin() as conn:
+            await conn.execute(
+                insert(Ticket), {"title": "Outside write 2", "description": "SQL"}
+            )
+        after_write = await client.get("/tickets/", params=params)
+        for ticket in after_write.json()["results"]:
+            await client.delete(
+                f"/tickets/{ticket['id']}", params={"force_delete": True}
+            )
+
+    assert first.json()["total"] == 1
+    assert after_write.headers["etag"] != first.headers["etag"]
+    assert after_write.json()["total"] == 2
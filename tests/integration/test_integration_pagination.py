@@ -0,0 +1,68 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db.sqlite import database
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_walk_tickets_with_cursor():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created_ids = []
+        for i in range(25):
+            response = await client.post(
+                "/tickets/", json={"title": f"Page ticket {i}", "description": "Cursor"}
+            )
+            created_ids.append(response.json()["id"])
+
+        pages = []
+        response = await client.get("/tickets/", params={"limit": 10})
+        pages.append(response.json())
+        while pages[-1]["next_cursor"]:
+            response = await client.get(
+                "/tickets/", params={"limit": 10, "cursor": pages[-1]["next_cursor"]}
+            )
+            pages.append(response.json())
+
+        for ticket_id in created_ids:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+    listed_ids = [ticket["id"] for page in pages for ticket in page["results"]]
+    assert [ticket_id for ticket_id in listed_ids if ticket_id in created_ids] == (
+        created_ids
+    )
+    assert len(listed_ids) == len(set(listed_ids))
+    assert len(listed_ids) == pages[0]["total"]
+    assert pages[-1]["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_list_tickets_with_invalid_cursor():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/tickets/", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert "Invalid pagination cursor" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_page_seeks_in_index():
+    async with database.engine.connect() as conn:
+        rows = await conn.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT * FROM tickets "
+                "WHERE (created_at, id) > ('2025-01-01 00:00:00.000000', 'a') "
+                "ORDER BY created_at, id LIMIT 10"
+            )
+        )
+        plan = " ".join(row[-1] for row in rows)
+
+    assert "SEARCH tickets USING INDEX ix_tickets_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,94 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud import reports
+from app.db.sqlite import database
+from app.main import app
+
+
+def transition_counts(report):
+    return {
+        (transition["from_status"], transition["to_status"]): transition["count"]
+        for transition in report["transitions"]
+    }
+
+
+@pytest.mark.asyncio
+async def test_reports_follow_the_writes(count_statements):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        transitions_before = await client.get("/tickets/reports/status-transitions")
+        ids = []
+        for i in range(3):
+            response = await client.post(
+                "/tickets/", json={"title": f"Report {i}", "description": "Reports"}
+            )
+            ids.append(response.json()["id"])
+        await client.patch(f"/tickets/{ids[0]}/close")
+        await client.put(f"/tickets/{ids[1]}", json={"status": "stalled"})
+        await client.put(f"/tickets/{ids[1]}", json={"status": "open"})
+
+        time_to_close = await client.get(
+            "/tickets/reports/time-to-close", params={"percentiles": [50, 100]}
+        )
+        with count_statements() as statements:
+            backlog = await client.get("/tickets/reports/backlog-age")
+        await client.put(f"/tickets/{ids[2]}", json={"status": "stalled"})
+        backlog_after_write = await client.get(
+            "/tickets/reports/backlog-age", params={"edges": [1]}
+        )
+        transitions = await client.get("/tickets/reports/status-transitions")
+        for ticket_id in ids:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+        transitions_after_delete = await client.get(
+            "/tickets/reports/status-transitions"
+        )
+
+    report = time_to_close.json()
+    assert time_to_close.status_code == 200
+    assert report["closed"] == 1
+    assert [p["percentile"] for p in report["percentiles"]] == [50, 100]
+    assert 0 <= report["percentiles"][0]["seconds"] < 60
+    # The snapshot of the data version was loaded by the previous report: only
+    # the version is read
+    assert all("FROM tickets_version" in statement for statement in statements)
+    assert [(b["open"], b["stalled"]) for b in backlog.json()["buckets"]][0] == (2, 0)
+    assert backlog.json()["total"] == 2
+    assert [
+        (b["open"], b["stalled"]) for b in backlog_after_write.json()["buckets"]
+    ] == [(1, 1), (0, 0)]
+    counts = transition_counts(transitions.json())
+    before = transition_counts(transitions_before.json())
+    for transition, added in {
+        ("open", "closed"): 1,
+        ("open", "stalled"): 2,
+        ("stalled", "open"): 1,
+    }.items():
+        assert counts[transition] - before.get(transition, 0) == added
+    assert transition_counts(transitions_after_delete.json()) == counts
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_loaded_in_chunks():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = []
+        for i in range(5):
+            response = await client.post(
+                "/tickets/", json={"title": f"Snapshot {i}", "description": "Chunks"}
+            )
+            ids.append(response.json()["id"])
+        async with database.read_session() as db:
+            chunked = await reports.load_snapshot(db, chunk_size=2)
+            whole = await reports.load_snapshot(db, chunk_size=10000)
+        for ticket_id in ids:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+    assert chunked.status.size >= 5
+    for chunked_column, whole_column in zip(chunked, whole):
+        np.testing.assert_array_equal(chunked_column, whole_column)
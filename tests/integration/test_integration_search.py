@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.main import app
+
+
+async def search(client, q: str) -> list:
+    response = await client.get("/tickets/search", params={"q": q})
+    assert response.status_code == 200
+    return [ticket["title"] for ticket in response.json()["results"]]
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_ranking_prefix_and_sync():
+    tickets = [
+        {"title": "Database migration", "description": "Move the server tables"},
+        {"title": "Server down", "description": "The API server is not responding"},
+        {"title": "Login issue", "description": "Cannot login with valid credentials"},
+    ]
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        ids = []
+        for ticket in tickets:
+            response = await client.post("/tickets/", json=ticket)
+            ids.append(response.json()["id"])
+
+        by_word = await search(client, "server")
+        by_prefix = await search(client, "cred*")
+        by_two_terms = await search(client, "server responding")
+        with_syntax = await search(client, 'server" OR -login (')
+
+        await client.put(f"/tickets/{ids[2]}", json={"title": "Password reset"})
+        after_update = await search(client, "password")
+        old_title = await search(client, "login issue")
+        await client.delete(f"/tickets/{ids[1]}", params={"force_delete": True})
+        after_delete = await search(client, "server")
+
+        for ticket_id in (ids[0], ids[2]):
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+    # A title match ranks above a description match
+    assert by_word == ["Server down", "Database migration"]
+    assert by_prefix == ["Login issue"]
+    assert by_two_terms == ["Server down"]
+    assert with_syntax == []
+    assert after_update == ["Password reset"]
+    assert old_title == []
+    assert after_delete == ["Database migration"]
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_without_terms():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/tickets/search", params={"q": '** ""'})
+
+    assert response.status_code == 400
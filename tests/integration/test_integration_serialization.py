@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.main import app
+from app.schemas.tickets import TicketOut, TicketsResponseList
+
+
+@pytest.mark.asyncio
+async def test_fast_path_has_the_json_of_the_response_models():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/bulk",
+            json=[
+                {"title": "Serialized 1", "description": "Fast path"},
+                {"title": "Serialized 2", "description": "Ünïcode", "status": "closed"},
+            ],
+        )
+        ticket_ids = [item["ticket"]["id"] for item in created.json()["results"]]
+        get_ticket = await client.get(f"/tickets/{ticket_ids[1]}")
+        listed = await client.get(
+            "/tickets/", params={"title_prefix": "Serialized", "limit": 1}
+        )
+        for ticket_id in ticket_ids:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+
+    # The same bytes as the serialization of the response models
+    ticket = TicketOut.model_validate_json(get_ticket.content)
+    assert get_ticket.content == ticket.model_dump_json().encode()
+    assert get_ticket.json() == created.json()["results"][1]["ticket"]
+    tickets_list = TicketsResponseList.model_validate_json(listed.content)
+    assert listed.content == tickets_list.model_dump_json().encode()
+    assert listed.json()["next_cursor"] is not None
+    assert get_ticket.headers["content-type"] == "application/json"
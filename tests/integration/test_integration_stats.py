@@ -0,0 +1,135 @@
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app import cli
+from app.db.schema import rebuild_ticket_rollups
+from app.db.sqlite import database
+from app.main import app
+
+
+async def nonzero_rollups():
+    async with database.engine.connect() as conn:
+        result = await conn.execute(
+            text(
+                "SELECT period, bucket, created, closed FROM ticket_rollups "
+                "WHERE created <> 0 OR closed <> 0 ORDER BY period, bucket"
+            )
+        )
+    return result.fetchall()
+
+
+def bucket_totals(stats):
+    return (
+        sum(bucket["created"] for bucket in stats["buckets"]),
+        sum(bucket["closed"] for bucket in stats["buckets"]),
+    )
+
+
+def bucket_counts(stats):
+    return {
+        bucket["start"]: (bucket["created"], bucket["closed"])
+        for bucket in stats["buckets"]
+    }
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_every_write():
+    since = datetime.utcnow().isoformat()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        before = await client.get(
+            "/tickets/stats", params={"period": "hour", "since": since}
+        )
+        days_before = await client.get("/tickets/stats", params={"since": since})
+        ids = []
+        for i in range(4):
+            response = await client.post(
+                "/tickets/", json={"title": f"Stats {i}", "description": "Stats"}
+            )
+            ids.append(response.json()["id"])
+        await client.patch(f"/tickets/{ids[0]}/close")
+        await client.patch(f"/tickets/{ids[1]}/close")
+        await client.put(f"/tickets/{ids[1]}", json={"description": "Still closed"})
+        await client.put(f"/tickets/{ids[2]}", json={"status": "stalled"})
+        await client.delete(f"/tickets/{ids[3]}", params={"force_delete": True})
+        hours = await client.get(
+            "/tickets/stats", params={"period": "hour", "since": since}
+        )
+        days = await client.get("/tickets/stats", params={"since": since})
+        for ticket_id in ids[:3]:
+            await client.delete(f"/tickets/{ticket_id}", params={"force_delete": True})
+        after = await client.get(
+            "/tickets/stats", params={"period": "hour", "since": since}
+        )
+        incremental = await nonzero_rollups()
+        async with database.engine.begin() as conn:
+            await conn.run_sync(rebuild_ticket_rollups)
+        rebuilt = await nonzero_rollups()
+
+    stats = hours.json()
+    assert hours.status_code == 200
+    assert stats["period"] == "hour"
+    assert stats["by_status"]["closed"] - before.json()["by_status"]["closed"] == 2
+    assert stats["by_status"]["stalled"] - before.json()["by_status"]["stalled"] == 1
+    assert stats["total"] == sum(stats["by_status"].values())
+    # The deleted ticket still counts as created
+    created, closed = bucket_totals(stats)
+    created_before, closed_before = bucket_totals(before.json())
+    assert (created - created_before, closed - closed_before) == (4, 2)
+    assert bucket_totals(days.json())[0] - bucket_totals(days_before.json())[0] == 4
+    # Deleting the tickets doesn't erase their history
+    assert bucket_counts(after.json()) == bucket_counts(stats)
+    # The rebuild only counts the remaining tickets
+    assert sum(rollup.created for rollup in rebuilt) < sum(
+        rollup.created for rollup in incremental
+    )
+
+
+@pytest.mark.asyncio
+async def test_stats_buckets_limit():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/tickets/", json={"title": "Stats limit", "description": "Stats"}
+        )
+        latest = await client.get(
+            "/tickets/stats", params={"period": "hour", "limit": 1}
+        )
+        too_many = await client.get("/tickets/stats", params={"limit": 0})
+        await client.delete(
+            f"/tickets/{response.json()['id']}", params={"force_delete": True}
+        )
+
+    buckets = latest.json()["buckets"]
+    assert len(buckets) == 1
+    assert buckets[0]["created"] >= 1
+    assert datetime.fromisoformat(buckets[0]["start"]).minute == 0
+    assert too_many.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_rebuild_stats_with_cli(capsys):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/tickets/", json={"title": "Stats rebuild", "description": "Stats"}
+        )
+        async with database.engine.begin() as conn:
+            await conn.execute(text("DELETE FROM ticket_rollups"))
+        emptied = await client.get("/tickets/stats")
+        await cli.run_rebuild_stats(None)
+        rebuilt = await client.get("/tickets/stats")
+        await client.delete(
+            f"/tickets/{response.json()['id']}", params={"force_delete": True}
+        )
+
+    assert emptied.json()["buckets"] == []
+    assert rebuilt.json()["buckets"][-1]["created"] >= 1
+    output = capsys.readouterr().out
+    assert "day: " in output and "hour: " in output
@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.config.settings import SQLITE_PRAGMAS
+from app.db.sqlite import database
+
+
+@pytest.mark.asyncio
+async def test_storage_profile_pragmas_are_applied():
+    async with database.engine.connect() as conn:
+        busy_timeout = await conn.scalar(text("PRAGMA busy_timeout"))
+        temp_store = await conn.scalar(text("PRAGMA temp_store"))
+
+    assert busy_timeout == int(SQLITE_PRAGMAS.get("busy_timeout", 0))
+    # temp_store=MEMORY is reported as 2
+    assert temp_store == (2 if SQLITE_PRAGMAS.get("temp_store") == "MEMORY" else 0)
+
+
+@pytest.mark.asyncio
+async def test_read_engine_rejects_writes():
+    if database.read_engine is database.engine:
+        pytest.skip("The in-memory database shares the writer connection")
+
+    async with database.read_engine.connect() as conn:
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.execute(text("DELETE FROM tickets"))
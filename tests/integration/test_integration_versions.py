@@ -0,0 +1,137 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.db import schema
+from app.db.schema import create_schema
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_do_not_lose_writes(count_statements):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "Versioned ticket", "description": "v1"}
+        )
+        url = f"/tickets/{created.json()['id']}"
+        etag = (await client.get(url)).headers["etag"]
+
+        # Two clients read version 1, then both update it
+        with count_statements() as statements:
+            first = await client.put(
+                url, json={"description": "first"}, headers={"If-Match": etag}
+            )
+        second = await client.put(
+            url, json={"description": "second"}, headers={"If-Match": etag}
+        )
+        current = await client.get(url)
+        retried = await client.put(
+            url,
+            json={"description": "second"},
+            headers={"If-Match": current.headers["etag"]},
+        )
+        stale_close = await client.patch(f"{url}/close?version=1")
+        closed = await client.patch(f"{url}/close?version=3")
+        missing = await client.put(
+            "/tickets/00000000-0000-0000-0000-000000000000",
+            json={"description": "Nobody"},
+            headers={"If-Match": '"1"'},
+        )
+        await client.delete(f"{url}?force_delete=true")
+
+    assert created.json()["version"] == 1
+    assert etag == '"1"'
+    assert first.status_code == 200
+    assert first.json()["version"] == 2
+    # The precondition is checked by the UPDATE itself
+    assert len(statements) == 1
+    assert second.status_code == 412
+    assert current.json()["description"] == "first"
+    assert retried.json()["version"] == 3
+    assert stale_close.status_code == 412
+    assert closed.json()["status"] == "closed"
+    assert closed.json()["version"] == 4
+    assert missing.status_code == 404
+
+
+def test_version_column_is_added_to_existing_tables(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE tickets (id CHAR(32) PRIMARY KEY, title VARCHAR(100) "
+                "NOT NULL, description TEXT NOT NULL, status VARCHAR(7) NOT NULL, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO tickets VALUES ('0123456789abcdef0123456789abcdef', "
+                "'Old ticket', 'Before versions', 'open', '2025-01-01', '2025-01-01')"
+            )
+        )
+    with engine.begin() as conn:
+        create_schema(conn)
+        version = conn.execute(text("SELECT version FROM tickets")).scalar_one()
+    engine.dispose()
+
+    assert version == 1
+
+
+def test_tickets_table_with_numeric_ids_is_rebuilt(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE tickets (id UUID NOT NULL PRIMARY KEY, title "
+                "VARCHAR(100) NOT NULL, description TEXT NOT NULL, status VARCHAR(7) "
+                "NOT NULL, created_at DATETIME NOT NULL, updated_at DATETIME)"
+            )
+        )
+        # The database of a previous release: indexes, triggers, full-text index
+        monkeypatch.setattr(schema, "RETYPED_COLUMNS", {})
+        create_schema(conn)
+        conn.execute(
+            text(
+                "INSERT INTO tickets (id, title, description, status, created_at) "
+                "VALUES ('0123456789abcdef0123456789abcdef', 'Old ticket', "
+                "'Searchable', 'open', '2025-01-01 00:00:00.000000')"
+            )
+        )
+    monkeypatch.undo()
+    with engine.begin() as conn:
+        create_schema(conn)
+        id_type = conn.execute(
+            text("SELECT type FROM pragma_table_info('tickets') WHERE name = 'id'")
+        ).scalar_one()
+        conn.execute(
+            text(
+                "INSERT INTO tickets (id, title, description, status, created_at) "
+                "VALUES ('1234e567000000000000000000000000', 'New ticket', "
+                "'After the rebuild', 'open', '2025-01-02 00:00:00.000000')"
+            )
+        )
+        ids = conn.execute(text("SELECT id, typeof(id) FROM tickets")).all()
+        found = conn.execute(
+            text(
+                "SELECT tickets.title FROM tickets_fts JOIN tickets "
+                "ON tickets.rowid = tickets_fts.rowid WHERE tickets_fts MATCH 'search*'"
+            )
+        ).scalar_one()
+        count = conn.execute(
+            text("SELECT count FROM ticket_counters WHERE status = 'open'")
+        ).scalar_one()
+    engine.dispose()
+
+    assert id_type == "CHAR(32)"
+    assert ids == [
+        ("0123456789abcdef0123456789abcdef", "text"),
+        ("1234e567000000000000000000000000", "text"),
+    ]
+    assert found == "Old ticket"
+    assert count == 2
@@ -0,0 +1,314 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import IntegrityError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.crud import tickets_crud, write_behind
+from app.crud.exceptions import AlreadyClosedError, VersionConflictError
+from app.db.sqlite import database
+from app.main import app
+from app.schemas.tickets import TicketUpdate, TicketWrite, WriteOperation
+
+
+async def start_queue(journal_path):
+    # A long interval, so the writes are only applied by flush()
+    return await write_behind.start_write_behind(
+        database.async_session, database.read_session, path=journal_path, interval=60
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_are_read_back_then_applied(tmp_path):
+    queue = await start_queue(str(tmp_path / "tickets.journal"))
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post(
+                "/tickets/", json={"title": "Write behind", "description": "Queued"}
+            )
+            url = f"/tickets/{created.json()['id']}"
+            queued = await client.get(url)
+            listed = await client.get("/tickets/?title_prefix=Write behind")
+            updated = await client.put(url, json={"description": "Edited"})
+            closed = await client.patch(f"{url}/close")
+            closed_again = await client.patch(f"{url}/close")
+            missing = await client.put(
+                "/tickets/00000000-0000-0000-0000-000000000000",
+                json={"description": "Nobody"},
+            )
+            read_back = await client.get(url)
+
+            pending = queue.pending
+            await queue.flush()
+            applied = await client.get(url)
+            await client.delete(f"{url}?force_delete=true")
+    finally:
+        await write_behind.stop_write_behind()
+
+    assert created.status_code == 202
+    assert created.json()["operation"] == "create"
+    assert queued.json()["title"] == "Write behind"
+    # Only the reads by ID see the queued writes
+    assert listed.json()["total"] == 0
+    assert updated.status_code == 202
+    assert closed.status_code == 202
+    assert closed_again.status_code == 400
+    assert missing.status_code == 404
+    assert read_back.json()["description"] == "Edited"
+    assert read_back.json()["status"] == "closed"
+    assert pending == 3
+    assert applied.json() == read_back.json()
+
+
+@pytest.mark.asyncio
+async def test_journal_is_replayed_after_a_crash(tmp_path):
+    journal_path = str(tmp_path / "tickets.journal")
+    queue = await start_queue(journal_path)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "Crash replay", "description": "Journaled"}
+        )
+        url = f"/tickets/{created.json()['id']}"
+        await client.put(url, json={"description": "Edited"})
+        # Crash: the drainer dies without applying the journal
+        queue.task.cancel()
+        queue.file.close()
+        write_behind.queue = None
+        lost = await client.get(url)
+
+        replayed = await start_queue(journal_path)
+        await write_behind.stop_write_behind()
+        recovered = await client.get(url)
+        await client.delete(f"{url}?force_delete=true")
+
+    assert lost.status_code == 404
+    assert replayed.replayed == 2
+    assert recovered.json()["description"] == "Edited"
+
+
+@pytest.mark.asyncio
+async def test_writes_are_checked_then_kept_until_applied(tmp_path, monkeypatch):
+    queue = await start_queue(str(tmp_path / "tickets.journal"))
+    apply_ticket_writes = tickets_crud.apply_ticket_writes
+
+    async def rejected_writes(db, writes):
+        raise IntegrityError("INSERT", {}, Exception("rejected"))
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            invalid = await client.post("/tickets/", json={"title": "No description"})
+            created = await client.post(
+                "/tickets/", json={"title": "Kept queued", "description": "Queued"}
+            )
+            ticket_id = created.json()["id"]
+            batch = await client.post("/tickets/batch-get", json={"ids": [ticket_id]})
+
+            monkeypatch.setattr(tickets_crud, "apply_ticket_writes", rejected_writes)
+            with pytest.raises(IntegrityError):
+                await queue.flush()
+            pending = queue.pending
+            still_queued = await client.get(f"/tickets/{ticket_id}")
+
+            monkeypatch.setattr(
+                tickets_crud, "apply_ticket_writes", apply_ticket_writes
+            )
+            await queue.flush()
+            applied = await client.get(f"/tickets/{ticket_id}")
+            await client.delete(f"/tickets/{ticket_id}?force_delete=true")
+    finally:
+        await write_behind.stop_write_behind()
+
+    assert invalid.status_code == 422
+    assert "description" in invalid.json()["detail"]
+    assert [ticket["id"] for ticket in batch.json()["results"]] == [ticket_id]
+    assert batch.json()["missing"] == []
+    assert pending == 1
+    assert still_queued.json()["title"] == "Kept queued"
+    assert applied.status_code == 200
+    assert queue.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_idempotent_writes_apply_the_queued_writes_first(tmp_path):
+    queue = await start_queue(str(tmp_path / "tickets.journal"))
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post(
+                "/tickets/", json={"title": "Queued then keyed", "description": "1"}
+            )
+            url = f"/tickets/{created.json()['id']}"
+            await client.put(url, json={"description": "2"})
+            closed = await client.patch(
+                f"{url}/close",
+                headers={"Idempotency-Key": f"close-{created.json()['id']}"},
+            )
+            await client.delete(f"{url}?force_delete=true")
+    finally:
+        await write_behind.stop_write_behind()
+
+    assert closed.status_code == 200
+    assert closed.json()["description"] == "2"
+    assert closed.json()["version"] == 3
+    assert queue.pending == 0
+
+
+async def create_stored_ticket(client, title):
+    response = await client.post(
+        "/tickets/", json={"title": title, "description": "Stored"}
+    )
+    await write_behind.flush_write_behind()
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_writes_checked_during_a_drain_read_the_ticket_again(
+    tmp_path, monkeypatch
+):
+    queue = await start_queue(str(tmp_path / "tickets.journal"))
+    get_ticket_by_id = tickets_crud.get_ticket_by_id
+    racing = []
+
+    async def read_during_a_drain(db, ticket_id):
+        ticket = await get_ticket_by_id(db, ticket_id)
+        # Another write of the ticket is queued and drained during the read
+        while racing:
+            await racing.pop()()
+            await queue.flush()
+        return ticket
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            ticket_id = await create_stored_ticket(client, "Drain race")
+            monkeypatch.setattr(tickets_crud, "get_ticket_by_id", read_during_a_drain)
+
+            racing.append(
+                lambda: queue.update_ticket(
+                    ticket_id, TicketUpdate(title="Drain B"), [1]
+                )
+            )
+            with pytest.raises(VersionConflictError):
+                await queue.update_ticket(
+                    ticket_id, TicketUpdate(description="Drain A"), [1]
+                )
+            racing.append(lambda: queue.close_ticket(ticket_id))
+            with pytest.raises(AlreadyClosedError):
+                await queue.close_ticket(ticket_id)
+
+            monkeypatch.setattr(tickets_crud, "get_ticket_by_id", get_ticket_by_id)
+            stored = await client.get(f"/tickets/{ticket_id}")
+            await client.delete(f"/tickets/{ticket_id}?force_delete=true")
+    finally:
+        await write_behind.stop_write_behind()
+
+    assert stored.json()["title"] == "Drain B"
+    assert stored.json()["description"] == "Stored"
+    assert stored.json()["status"] == "closed"
+    assert stored.json()["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_outdated_writes_are_skipped():
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post(
+            "/tickets/", json={"title": "Outdated write", "description": "Stored"}
+        )
+        ticket_id = created.json()["id"]
+        await client.put(f"/tickets/{ticket_id}", json={"description": "Newer"})
+        # Queued against version 1, while the ticket is at version 2
+        outdated = TicketWrite(
+            operation=WriteOperation.update,
+            id=ticket_id,
+            description="Outdated",
+            updated_at=created.json()["created_at"],
+            version=2,
+        )
+        async with database.async_session() as db:
+            applied = await tickets_crud.apply_ticket_writes(db, [outdated])
+        stored = await client.get(f"/tickets/{ticket_id}")
+        await client.delete(f"/tickets/{ticket_id}?force_delete=true")
+
+    assert applied == 0
+    assert stored.json()["description"] == "Newer"
+    assert stored.json()["version"] == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_queued_during_a_delete_are_forgotten(tmp_path, monkeypatch):
+    queue = await start_queue(str(tmp_path / "tickets.journal"))
+    delete_ticket_by_id = tickets_crud.delete_ticket_by_id
+
+    async def delete_after_a_write(db, ticket_id, force_delete=False):
+        # The write is queued after the flush of the delete, before its commit
+        await queue.update_ticket(ticket_id, TicketUpdate(description="Late"))
+        await delete_ticket_by_id(db, ticket_id, force_delete=force_delete)
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            ticket_id = await create_stored_ticket(client, "Deleted while queued")
+            monkeypatch.setattr(
+                tickets_crud, "delete_ticket_by_id", delete_after_a_write
+            )
+            deleted = await client.delete(f"/tickets/{ticket_id}?force_delete=true")
+            monkeypatch.setattr(
+                tickets_crud, "delete_ticket_by_id", delete_ticket_by_id
+            )
+            read_back = await client.get(f"/tickets/{ticket_id}")
+            late_write = await client.put(
+                f"/tickets/{ticket_id}", json={"description": "Later"}
+            )
+            await queue.flush()
+            applied = await client.get(f"/tickets/{ticket_id}")
+    finally:
+        await write_behind.stop_write_behind()
+
+    assert deleted.status_code == 204
+    assert read_back.status_code == 404
+    assert late_write.status_code == 404
+    assert applied.status_code == 404
+    assert queue.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicates_checks_see_the_queued_creations(tmp_path):
+    queue = await start_queue(str(tmp_path / "tickets.journal"))
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            created = await client.post(
+                "/tickets/", json={"title": "Queued title", "description": "Queued"}
+            )
+            bulk = await client.post(
+                "/tickets/bulk",
+                params={"reject_duplicates": True},
+                json=[{"title": "Queued title", "description": "Bulk"}],
+            )
+            await client.post(
+                "/tickets/", json={"title": "Queued import", "description": "Queued"}
+            )
+            imported = await client.post(
+                "/tickets/import",
+                params={"reject_duplicates": True},
+                content=b'{"title": "Queued import", "description": "Imported"}\n',
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            listed = await client.get("/tickets/", params={"title_prefix": "Queued "})
+            for ticket in listed.json()["results"]:
+                await client.delete(f"/tickets/{ticket['id']}?force_delete=true")
+    finally:
+        await write_behind.stop_write_behind()
+
+    assert created.status_code == 202
+    assert bulk.json()["results"][0]["status"] == "duplicate"
+    assert imported.json()["imported"] == 0
+    assert imported.json()["rejected"] == 1
+    assert listed.json()["total"] == 2
+    assert queue.pending == 0
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_each_write_is_a_single_statement(count_statements):
+    ticket_data = {"title": "Single statement", "description": "RETURNING"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with count_statements() as create_statements:
+            created = await client.post("/tickets/", json=ticket_data)
+        ticket_id = created.json()["id"]
+        with count_statements() as update_statements:
+            updated = await client.put(f"/tickets/{ticket_id}", json={"title": "New"})
+        with count_statements() as close_statements:
+            closed = await client.patch(f"/tickets/{ticket_id}/close")
+        with count_statements() as delete_statements:
+            deleted = await client.delete(f"/tickets/{ticket_id}")
+
+    assert created.status_code == 201
+    assert updated.json()["title"] == "New"
+    assert updated.json()["updated_at"] > created.json()["updated_at"]
+    assert closed.json()["status"] == "closed"
+    assert deleted.status_code == 204
+    for statements in (
+        create_statements,
+        update_statements,
+        close_statements,
+        delete_statements,
+    ):
+        assert len(statements) == 1
+        assert "RETURNING" in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_close_and_delete_transition_errors():
+    ticket_data = {"title": "Stalled", "description": "Guards", "status": "stalled"}
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        created = await client.post("/tickets/", json=ticket_data)
+        ticket_id = created.json()["id"]
+        closed = await client.patch(f"/tickets/{ticket_id}/close")
+        deleted = await client.delete(f"/tickets/{ticket_id}")
+        forced = await client.delete(
+            f"/tickets/{ticket_id}", params={"force_delete": True}
+        )
+        not_found = await client.delete(
+            f"/tickets/{ticket_id}", params={"force_delete": True}
+        )
+        get_ticket = await client.get(f"/tickets/{ticket_id}")
+
+    assert closed.status_code == 400
+    assert closed.json()["detail"] == "Cannot close a stalled ticket."
+    assert deleted.status_code == 400
+    assert deleted.json()["detail"] == "Cannot delete not closed ticket."
+    assert forced.status_code == 204
+    assert not_found.status_code == 404
+    assert get_ticket.status_code == 404
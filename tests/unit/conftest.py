@@ -1,13 +1,19 @@
 import os
 import sys
 from datetime import datetime
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 from uuid import UUID
 
 import pytest
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
-from app.db.sqlite import get_db
+from app.crud.cache import (
+    idempotency_cache,
+    page_cache,
+    snapshot_cache,
+    ticket_cache,
+)
+from app.db.sqlite import get_db, get_read_db, get_write_db
 from app.main import app
 from app.schemas.tickets import TicketOut, TicketsResponseList
 
@@ -67,6 +73,7 @@ def fake_created_ticket(ticket_id):
         "description": "This is a test ticket.",
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
+        "version": 1,
     }
 
 
@@ -89,10 +96,34 @@ def override_get_db(mock_session):
     Automatically override FastAPI's get_db dependency with the mocked session.
     """
     app.dependency_overrides[get_db] = lambda: mock_session
+    app.dependency_overrides[get_read_db] = lambda: mock_session
+    app.dependency_overrides[get_write_db] = lambda: mock_session
     yield
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    Start every test with empty caches of tickets, pages, idempotency keys and
+    reports snapshots.
+    """
+    for cache in (ticket_cache, page_cache, idempotency_cache, snapshot_cache):
+        cache.clear()
+        cache.reset_stats()
+
+
+@pytest.fixture(autouse=True)
+def data_version():
+    """
+    Mocked version of the tickets data: set its return value to simulate a write.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_data_version", new=AsyncMock(return_value="1")
+    ) as mocked_version:
+        yield mocked_version
+
+
 @pytest.fixture
 def fake_tickets_list(ticket_id, ticket_id_2):
     return TicketsResponseList(
@@ -0,0 +1,78 @@
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config.settings import TICKETS_BATCH_GET_MAX_IDS
+from app.main import app
+from app.schemas.tickets import TicketBatchGetResponse, TicketOut
+
+
+@pytest.mark.asyncio
+async def test_batch_get_tickets_success(mock_session, ticket_id, fake_created_ticket):
+    """
+    Test getting several tickets by their IDs, with a missing one.
+    """
+    missing_id = uuid.uuid4()
+    fake_response = TicketBatchGetResponse(
+        results=[TicketOut(**fake_created_ticket)], missing=[missing_id]
+    )
+    with patch(
+        "app.crud.tickets_crud.get_tickets_by_ids",
+        new=AsyncMock(return_value=fake_response),
+    ) as mocked_get:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/batch-get", json={"ids": [ticket_id, str(missing_id)]}
+            )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"][0]["title"] == fake_created_ticket["title"]
+    assert data["missing"] == [str(missing_id)]
+    mocked_get.assert_awaited_once_with(
+        db=mock_session,
+        ticket_ids=[uuid.UUID(ticket_id), missing_id],
+        queued_tickets={},
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "ids",
+    [
+        [],
+        ["not-a-uuid"],
+        [str(uuid.uuid4()) for _ in range(TICKETS_BATCH_GET_MAX_IDS + 1)],
+    ],
+)
+async def test_batch_get_tickets_invalid_ids(ids):
+    """
+    Test getting no tickets, too many tickets, or with an invalid ID.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/tickets/batch-get", json={"ids": ids})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_get_tickets_server_side_error(ticket_id):
+    """
+    Test getting several tickets with server error.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_tickets_by_ids",
+        new=AsyncMock(side_effect=Exception("DB failure")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/batch-get", json={"ids": [ticket_id]}
+            )
+
+    assert response.status_code == 500
+    assert "Cannot get the tickets" in response.json()["detail"]
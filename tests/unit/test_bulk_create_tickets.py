@@ -0,0 +1,112 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.config.settings import TICKETS_BULK_MAX_ITEMS
+from app.main import app
+from app.schemas.tickets import (
+    BulkItemStatus,
+    TicketBulkCreateItem,
+    TicketBulkCreateResponse,
+    TicketCreate,
+    TicketOut,
+)
+
+
+@pytest.fixture
+def fake_bulk_created_tickets(fake_created_ticket):
+    return TicketBulkCreateResponse(
+        created=1,
+        rejected=1,
+        results=[
+            TicketBulkCreateItem(
+                index=0,
+                status=BulkItemStatus.created,
+                ticket=TicketOut(**fake_created_ticket),
+            ),
+            TicketBulkCreateItem(
+                index=1,
+                status=BulkItemStatus.duplicate,
+                detail="A ticket with the title: New Ticket, already exists.",
+            ),
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tickets_success(
+    mock_session, ticket_input, fake_bulk_created_tickets
+):
+    """
+    Test creating several tickets with valid data.
+    """
+    with patch(
+        "app.crud.tickets_crud.create_tickets",
+        new=AsyncMock(return_value=fake_bulk_created_tickets),
+    ) as mocked_create:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/bulk?reject_duplicates=true",
+                json=[ticket_input, ticket_input],
+            )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 1
+    assert data["rejected"] == 1
+    assert data["results"][0]["ticket"]["title"] == ticket_input["title"]
+    assert data["results"][1]["status"] == "duplicate"
+    mocked_create.assert_awaited_once_with(
+        db=mock_session,
+        tickets=[TicketCreate(**ticket_input), TicketCreate(**ticket_input)],
+        reject_duplicates=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tickets_too_many(ticket_input):
+    """
+    Test creating more tickets than allowed in one request.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/tickets/bulk", json=[ticket_input] * (TICKETS_BULK_MAX_ITEMS + 1)
+        )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tickets_empty_or_invalid(ticket_input, short_title_ticket):
+    """
+    Test creating an empty list of tickets, or with an invalid ticket.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        empty = await client.post("/tickets/bulk", json=[])
+        invalid = await client.post(
+            "/tickets/bulk", json=[ticket_input, short_title_ticket]
+        )
+
+    assert empty.status_code == 422
+    assert invalid.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_tickets_server_side_error(ticket_input):
+    """
+    Test creating several tickets with server error.
+    """
+    with patch(
+        "app.crud.tickets_crud.create_tickets",
+        new=AsyncMock(side_effect=Exception("DB failure")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/tickets/bulk", json=[ticket_input])
+
+    assert response.status_code == 500
+    assert "Cannot create the tickets" in response.json()["detail"]
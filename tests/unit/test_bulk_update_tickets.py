@@ -0,0 +1,134 @@
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.schemas.tickets import (
+    SkipReason,
+    TicketBulkUpdateResponse,
+    TicketFilter,
+    TicketSelection,
+    TicketSkipped,
+    TicketStatus,
+    TicketUpdate,
+)
+
+
+@pytest.fixture
+def fake_bulk_updated_tickets():
+    return TicketBulkUpdateResponse(
+        updated=1,
+        updated_ids=[uuid.uuid4()],
+        skipped=[TicketSkipped(id=uuid.uuid4(), reason=SkipReason.already_closed)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tickets_by_ids(mock_session, fake_bulk_updated_tickets):
+    """
+    Test updating several tickets selected by their IDs.
+    """
+    ids = [str(uuid.uuid4()), str(uuid.uuid4())]
+    with patch(
+        "app.crud.tickets_crud.update_tickets",
+        new=AsyncMock(return_value=fake_bulk_updated_tickets),
+    ) as mocked_update:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.patch(
+                "/tickets/bulk",
+                json={"ids": ids, "update": {"status": "stalled"}},
+            )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["updated"] == 1
+    assert data["skipped"][0]["reason"] == "already_closed"
+    mocked_update.assert_awaited_once_with(
+        db=mock_session,
+        selection=TicketSelection(ids=ids),
+        update_data=TicketUpdate(status=TicketStatus.stalled),
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_close_tickets_by_filter(mock_session, fake_bulk_updated_tickets):
+    """
+    Test closing several tickets selected by a filter.
+    """
+    with patch(
+        "app.crud.tickets_crud.close_tickets",
+        new=AsyncMock(return_value=fake_bulk_updated_tickets),
+    ) as mocked_close:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.patch(
+                "/tickets/bulk/close",
+                json={"filter": {"status": "open", "title_prefix": "Old"}},
+            )
+
+    assert response.status_code == 200
+    mocked_close.assert_awaited_once_with(
+        db=mock_session,
+        selection=TicketSelection(
+            filter=TicketFilter(status=TicketStatus.open, title_prefix="Old")
+        ),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        {},
+        {"ids": []},
+        {"filter": {}},
+        {"ids": [str(uuid.uuid4())], "filter": {"status": "open"}},
+        {"ids": ["not-a-uuid"]},
+        {"ids": [str(uuid.uuid4())], "cursor": "WyJyb3dpZCIsIDFd"},
+    ],
+)
+async def test_bulk_close_tickets_invalid_selection(body):
+    """
+    Test closing several tickets without exactly one valid selection.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.patch("/tickets/bulk/close", json=body)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_tickets_empty_update():
+    """
+    Test updating several tickets without any field to update.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.patch(
+            "/tickets/bulk", json={"ids": [str(uuid.uuid4())], "update": {}}
+        )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_close_tickets_server_side_error():
+    """
+    Test closing several tickets with server error.
+    """
+    with patch(
+        "app.crud.tickets_crud.close_tickets",
+        new=AsyncMock(side_effect=Exception("DB failure")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.patch(
+                "/tickets/bulk/close", json={"ids": [str(uuid.uuid4())]}
+            )
+
+    assert response.status_code == 500
+    assert "Cannot close the tickets" in response.json()["detail"]
@@ -1,10 +1,13 @@
-from unittest.mock import ANY, AsyncMock, patch
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import ANY, AsyncMock, Mock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
 from app.crud.exceptions import InvalidCloseTransitionError, NotFoundError
 from app.main import app
+from app.schemas.tickets import TicketJob
 
 
 @pytest.mark.asyncio
@@ -132,3 +135,43 @@ async def test_delete_all_tickets_server_error():
     assert response.status_code == 500
     assert "Cannot delete tickets" in response.json()["detail"]
     mock_delete.assert_awaited_once_with(db=ANY, force_delete=False)
+
+
+@pytest.mark.asyncio
+async def test_delete_all_tickets_async_job():
+    """
+    Testing delete_all_tickets in a background job.
+    """
+    job = TicketJob(id=uuid.uuid4(), created_at=datetime.now(timezone.utc))
+    with patch(
+        "app.crud.jobs.start_delete_job", new=Mock(return_value=job)
+    ) as mock_start:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.delete(
+                "/tickets/", params={"run_async": True, "force_delete": True}
+            )
+
+    assert response.status_code == 202
+    assert response.json()["id"] == str(job.id)
+    assert response.json()["state"] == "running"
+    mock_start.assert_called_once_with(ANY, force_delete=True)
+
+
+@pytest.mark.asyncio
+async def test_get_job_progress():
+    """
+    Testing the progress of a background job, and of an unknown job.
+    """
+    job = TicketJob(
+        id=uuid.uuid4(), created_at=datetime.now(timezone.utc), deleted=2000
+    )
+    with patch.dict("app.crud.jobs.jobs", {job.id: job}):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"/tickets/jobs/{job.id}")
+            unknown = await client.get(f"/tickets/jobs/{uuid.uuid4()}")
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == 2000
+    assert unknown.status_code == 404
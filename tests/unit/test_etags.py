@@ -0,0 +1,87 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.routers.responses import expected_versions
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_not_modified(ticket_id, fake_created_ticket):
+    """
+    Test getting a ticket with the ETag of its current version.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_ticket_by_id",
+        new=AsyncMock(return_value=fake_created_ticket),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(f"/tickets/{ticket_id}")
+            etag = response.headers["etag"]
+            not_modified = await client.get(
+                f"/tickets/{ticket_id}", headers={"If-None-Match": etag}
+            )
+            weak_in_list = await client.get(
+                f"/tickets/{ticket_id}",
+                headers={"If-None-Match": f'"other", W/{etag}'},
+            )
+            other = await client.get(
+                f"/tickets/{ticket_id}", headers={"If-None-Match": '"other"'}
+            )
+
+    assert response.status_code == 200
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert weak_in_list.status_code == 304
+    assert other.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_list_tickets_not_modified(fake_tickets_list, data_version):
+    """
+    Test listing tickets with the ETag of the page, before and after a write.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_all_tickets",
+        new=AsyncMock(return_value=fake_tickets_list),
+    ) as mocked_get:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/", params={"limit": 10})
+            etag = response.headers["etag"]
+            not_modified = await client.get(
+                "/tickets/", params={"limit": 10}, headers={"If-None-Match": etag}
+            )
+            other_page = await client.get(
+                "/tickets/", params={"limit": 5}, headers={"If-None-Match": etag}
+            )
+            data_version.return_value = "2"
+            after_write = await client.get(
+                "/tickets/", params={"limit": 10}, headers={"If-None-Match": etag}
+            )
+
+    assert not_modified.status_code == 304
+    assert other_page.status_code == 200
+    assert after_write.status_code == 200
+    assert after_write.headers["etag"] != etag
+    # The 304 doesn't query the database
+    assert mocked_get.await_count == 3
+
+
+def test_expected_versions_of_if_match():
+    """
+    Test the versions accepted by the If-Match header and the version parameter.
+    """
+    assert expected_versions(None) is None
+    assert expected_versions("*") is None
+    assert expected_versions('"3"') == [3]
+    assert expected_versions('"3", "5"') == [3, 5]
+    # If-Match uses the strong comparison
+    assert expected_versions('W/"3"') == []
+    assert expected_versions('"other"') == []
+    assert expected_versions(None, version=3) == [3]
+    assert expected_versions('"3", "5"', version=5) == [5]
+    assert expected_versions('"3"', version=5) == []
@@ -0,0 +1,77 @@
+import gzip
+from unittest.mock import Mock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.schemas.tickets import ExportFormat, TicketFilter, TicketStatus
+
+
+async def fake_export():
+    yield b'{"title": "First"}\n'
+    yield b'{"title": "Second"}\n'
+
+
+async def fake_compressed_export():
+    yield gzip.compress(b"title\nFirst\n")
+
+
+@pytest.mark.asyncio
+async def test_export_tickets_ndjson():
+    """
+    Test exporting the tickets as NDJSON, with a filter.
+    """
+    with patch(
+        "app.crud.exports.export_tickets", new=Mock(return_value=fake_export())
+    ) as mocked_export:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/export", params={"status": "open"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "tickets.ndjson" in response.headers["content-disposition"]
+    assert response.text.splitlines() == ['{"title": "First"}', '{"title": "Second"}']
+    _, kwargs = mocked_export.call_args
+    assert kwargs == {
+        "export_format": ExportFormat.ndjson,
+        "filters": TicketFilter(status=TicketStatus.open),
+        "compress": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_tickets_csv_compressed():
+    """
+    Test exporting the tickets as a gzip-compressed CSV.
+    """
+    with patch(
+        "app.crud.exports.export_tickets",
+        new=Mock(return_value=fake_compressed_export()),
+    ) as mocked_export:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/tickets/export", params={"format": "csv", "compress": True}
+            )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text == "title\nFirst\n"
+    _, kwargs = mocked_export.call_args
+    assert kwargs["export_format"] == ExportFormat.csv
+    assert kwargs["compress"] is True
+
+
+@pytest.mark.asyncio
+async def test_export_tickets_invalid_format():
+    """
+    Test exporting the tickets in an unknown format.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/tickets/export", params={"format": "xml"})
+
+    assert response.status_code == 422
@@ -0,0 +1,77 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.crud.exceptions import NotFoundError
+from app.crud.group_commit import GroupCommitWriter
+
+
+def session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+async def write(db, ticket_id, commit=True):
+    if ticket_id == "missing":
+        raise NotFoundError("Ticket", ticket_id)
+    return SimpleNamespace(id=ticket_id, commit=commit)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(mock_session):
+    writer = GroupCommitWriter(session_factory(mock_session), interval=0.05)
+    writer.start()
+    with patch("app.crud.tickets_crud.tickets_written") as mocked_written:
+        results = await asyncio.gather(
+            *(writer.submit(write, ticket_id=i) for i in range(5)),
+            writer.submit(write, ticket_id="missing"),
+            return_exceptions=True,
+        )
+    await writer.stop()
+
+    assert [result.id for result in results[:5]] == list(range(5))
+    assert all(result.commit is False for result in results[:5])
+    assert isinstance(results[5], NotFoundError)
+    mock_session.commit.assert_awaited_once()
+    mocked_written.assert_called_once_with(0, 1, 2, 3, 4)
+    assert (writer.batches, writer.writes) == (1, 6)
+
+
+@pytest.mark.asyncio
+async def test_batch_is_flushed_at_max_batch(mock_session):
+    writer = GroupCommitWriter(session_factory(mock_session), interval=10, max_batch=2)
+    writer.start()
+    with patch("app.crud.tickets_crud.tickets_written"):
+        results = await asyncio.wait_for(
+            asyncio.gather(*(writer.submit(write, ticket_id=i) for i in range(4))), 1
+        )
+    await writer.stop()
+
+    assert [result.id for result in results] == [0, 1, 2, 3]
+    assert mock_session.commit.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_one_write_at_a_time(mock_session):
+    failing = AsyncMock(side_effect=RuntimeError("disk I/O error"))
+    writer = GroupCommitWriter(session_factory(mock_session), interval=0.05)
+    writer.start()
+    with patch("app.crud.tickets_crud.tickets_written"):
+        results = await asyncio.gather(
+            writer.submit(write, ticket_id=1),
+            writer.submit(failing, ticket_id=2),
+            return_exceptions=True,
+        )
+    await writer.stop()
+
+    assert results[0].id == 1
+    # Retried in its own transaction, committed by the write itself
+    assert results[0].commit is True
+    assert isinstance(results[1], RuntimeError)
+    assert failing.await_count == 2
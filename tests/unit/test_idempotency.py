@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.crud.idempotency import StoredResponse
+from app.main import app
+from app.schemas.tickets import TicketOut
+
+
+def stored_response(fingerprint: str, response: str) -> StoredResponse:
+    return StoredResponse(
+        fingerprint=fingerprint,
+        status_code=201,
+        response=response,
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_request_writes_and_stores_the_response(
+    ticket_input, fake_created_ticket, mock_session
+):
+    ticket = TicketOut.model_validate(fake_created_ticket)
+    with (
+        patch(
+            "app.crud.idempotency.get_stored_response", new=AsyncMock(return_value=None)
+        ),
+        patch(
+            "app.crud.tickets_crud.create_ticket", new=AsyncMock(return_value=ticket)
+        ) as mocked_create,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/", json=ticket_input, headers={"Idempotency-Key": "key-1"}
+            )
+
+    assert response.status_code == 201
+    assert response.json()["id"] == str(ticket.id)
+    assert "Idempotent-Replayed" not in response.headers
+    # The ticket and its key are committed together
+    _, kwargs = mocked_create.call_args
+    assert kwargs["commit"] is False
+    assert kwargs["title"] == ticket_input["title"]
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_retry_gets_the_stored_response(ticket_input):
+    with (
+        patch("app.crud.idempotency.request_fingerprint", return_value="fingerprint"),
+        patch(
+            "app.crud.idempotency.get_stored_response",
+            new=AsyncMock(
+                return_value=stored_response("fingerprint", '{"id": "first"}')
+            ),
+        ),
+        patch("app.crud.tickets_crud.create_ticket", new=AsyncMock()) as mocked_create,
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/", json=ticket_input, headers={"Idempotency-Key": "key-1"}
+            )
+
+    assert response.status_code == 201
+    assert response.json() == {"id": "first"}
+    assert response.headers["Idempotent-Replayed"] == "true"
+    mocked_create.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_key_reused_by_another_request(ticket_input):
+    with patch(
+        "app.crud.idempotency.get_stored_response",
+        new=AsyncMock(return_value=stored_response("other request", "{}")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/", json=ticket_input, headers={"Idempotency-Key": "key-1"}
+            )
+
+    assert response.status_code == 422
+    assert "already used by a different request" in response.json()["detail"]
@@ -0,0 +1,85 @@
+from unittest.mock import ANY, AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.crud.imports import iter_lines
+from app.main import app
+from app.schemas.tickets import TicketImportRejectedLine, TicketImportResponse
+
+
+async def as_stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_import_tickets_success(mock_session):
+    """
+    Test importing tickets from an NDJSON body.
+    """
+    report = TicketImportResponse(
+        lines=2,
+        imported=1,
+        rejected=1,
+        rejected_lines=[TicketImportRejectedLine(line=2, detail="Invalid JSON")],
+        seconds=0.1,
+        rows_per_second=10.0,
+    )
+    with patch(
+        "app.crud.imports.import_tickets", new=AsyncMock(return_value=report)
+    ) as mocked_import:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/tickets/import?reject_duplicates=true",
+                content=b'{"title": "New Ticket"}\nnot json\n',
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+
+    assert response.status_code == 200
+    assert response.json() == report.model_dump()
+    mocked_import.assert_awaited_once_with(
+        db=mock_session, chunks=ANY, reject_duplicates=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_import_tickets_server_side_error():
+    """
+    Test importing tickets with server error.
+    """
+    with patch(
+        "app.crud.imports.import_tickets",
+        new=AsyncMock(side_effect=Exception("DB failure")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/tickets/import", content=b"{}\n")
+
+    assert response.status_code == 500
+    assert "Cannot import the tickets" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_across_chunks():
+    """
+    Test splitting a stream into lines, when the lines span several chunks.
+    """
+    stream = as_stream(b'{"a": 1}\n{"b"', b": 2}\n", b"\n", b'{"c": 3}')
+
+    lines = [line async for line in iter_lines(stream)]
+
+    assert lines == [b'{"a": 1}', b'{"b": 2}', b"", b'{"c": 3}']
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_too_long():
+    """
+    Test skipping the lines longer than the maximum, without buffering them.
+    """
+    stream = as_stream(b"short\n" + b"x" * 6, b"x" * 6, b"x\nend")
+
+    lines = [line async for line in iter_lines(stream, max_line_bytes=8)]
+
+    assert lines == [b"short", None, b"end"]
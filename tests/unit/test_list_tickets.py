@@ -4,7 +4,9 @@ from unittest.mock import AsyncMock, patch
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.crud.exceptions import InvalidCursorError
 from app.main import app
+from app.schemas.tickets import TicketFilter, TicketSort
 
 
 @pytest.mark.asyncio
@@ -24,7 +26,15 @@ async def test_list_tickets_success(mock_session, fake_tickets_list):
     assert response.status_code == 200
     assert response.json()["total"] == 2
     assert response.json() == json.loads(fake_tickets_list.json())
-    mocked_get.assert_awaited_once_with(db=mock_session, skip=0, limit=10)
+    mocked_get.assert_awaited_once_with(
+        db=mock_session,
+        skip=0,
+        limit=10,
+        cursor=None,
+        include_total=True,
+        filters=TicketFilter(),
+        sort=TicketSort.created_at,
+    )
 
 
 @pytest.mark.asyncio
@@ -43,7 +53,15 @@ async def test_list_tickets_empty(mock_session, fake_empty_tickets_list):
     assert response.status_code == 200
     assert response.json()["results"] == []
     assert response.json()["total"] == 0
-    mocked_get.assert_awaited_once_with(db=mock_session, skip=0, limit=10)
+    mocked_get.assert_awaited_once_with(
+        db=mock_session,
+        skip=0,
+        limit=10,
+        cursor=None,
+        include_total=True,
+        filters=TicketFilter(),
+        sort=TicketSort.created_at,
+    )
 
 
 @pytest.mark.asyncio
@@ -79,3 +97,70 @@ async def test_list_tickets_server_side_error(mock_session):
     assert response.status_code == 500
     assert "Cannot get the tickets list" in response.json()["detail"]
     mocked_get.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_list_tickets_with_cursor(mock_session, fake_tickets_list):
+    """
+    Test listing tickets from a pagination cursor.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_all_tickets",
+        new=AsyncMock(return_value=fake_tickets_list),
+    ) as mocked_get:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/tickets/", params={"limit": 10, "cursor": "abc"}
+            )
+
+    assert response.status_code == 200
+    mocked_get.assert_awaited_once_with(
+        db=mock_session,
+        skip=0,
+        limit=10,
+        cursor="abc",
+        include_total=True,
+        filters=TicketFilter(),
+        sort=TicketSort.created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_tickets_invalid_cursor():
+    """
+    Test listing tickets with an invalid pagination cursor.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_all_tickets",
+        new=AsyncMock(side_effect=InvalidCursorError("Invalid pagination cursor")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/", params={"cursor": "abc"})
+
+    assert response.status_code == 400
+    assert "Invalid pagination cursor" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_list_tickets_page_cache(fake_tickets_list, data_version):
+    """
+    Test that an identical page is served from the cache until the next write.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_all_tickets",
+        new=AsyncMock(return_value=fake_tickets_list),
+    ) as mocked_get:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/tickets/", params={"limit": 10})
+            cached = await client.get("/tickets/", params={"limit": 10})
+            data_version.return_value = "2"
+            after_write = await client.get("/tickets/", params={"limit": 10})
+
+    assert cached.status_code == 200
+    assert cached.content == first.content
+    assert cached.headers["etag"] == first.headers["etag"]
+    assert after_write.headers["etag"] != first.headers["etag"]
+    assert mocked_get.await_count == 2
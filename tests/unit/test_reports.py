@@ -0,0 +1,103 @@
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.crud import reports
+from app.main import app
+from app.schemas.tickets import TimeToClosePercentile, TimeToCloseReport
+
+ROWS = [
+    ("closed", "2024-05-01 10:00:00.000000", "2024-05-01 11:00:00.000000"),
+    ("closed", "2024-05-01 10:00:00.000000", "2024-05-01 13:00:00.000000"),
+    ("open", "2024-05-01 11:30:00.000000", "2024-05-01 11:30:00.000000"),
+    ("open", "2024-04-01 12:00:00.000000", "2024-04-01 12:00:00.000000"),
+    ("stalled", "2024-04-30 13:00:00.000000", "2024-05-01 09:00:00.000000"),
+]
+
+
+def test_time_to_close():
+    """
+    Test the percentiles of the time to close, on the closed tickets only.
+    """
+    report = reports.time_to_close(reports.build_snapshot(ROWS), [0, 50, 100])
+
+    assert report.closed == 2
+    assert report.mean_seconds == 7200
+    assert report.max_seconds == 10800
+    assert [p.seconds for p in report.percentiles] == [3600, 7200, 10800]
+
+
+def test_time_to_close_without_closed_tickets():
+    """
+    Test the time to close when no ticket is closed.
+    """
+    report = reports.time_to_close(reports.build_snapshot([]), [50])
+
+    assert report.closed == 0
+    assert report.mean_seconds is None
+    assert report.percentiles == []
+
+
+def test_backlog_age():
+    """
+    Test the histogram of the age of the open and stalled tickets.
+    """
+    now = datetime(2024, 5, 1, 12, 0)
+    report = reports.backlog_age(reports.build_snapshot(ROWS), [24, 1], now)
+
+    assert report.total == 3
+    assert [(b.min_hours, b.max_hours) for b in report.buckets] == [
+        (0, 1),
+        (1, 24),
+        (24, None),
+    ]
+    assert [(b.open, b.stalled) for b in report.buckets] == [(1, 0), (0, 1), (1, 0)]
+
+
+@pytest.mark.asyncio
+async def test_get_time_to_close_report():
+    """
+    Test the time to close route with custom percentiles.
+    """
+    report = TimeToCloseReport(
+        closed=1,
+        mean_seconds=60,
+        max_seconds=60,
+        percentiles=[TimeToClosePercentile(percentile=75, seconds=60)],
+    )
+    with patch(
+        "app.crud.reports.get_time_to_close_report",
+        new=AsyncMock(return_value=report),
+    ) as get_report:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/tickets/reports/time-to-close", params={"percentiles": [75]}
+            )
+            invalid = await client.get(
+                "/tickets/reports/time-to-close", params={"percentiles": [101]}
+            )
+
+    assert response.status_code == 200
+    assert response.json()["percentiles"] == [{"percentile": 75, "seconds": 60}]
+    assert get_report.call_args.kwargs["percentiles"] == [75]
+    assert invalid.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_backlog_age_report_error():
+    """
+    Test the backlog age route when the database fails.
+    """
+    with patch(
+        "app.crud.reports.get_backlog_age_report",
+        new=AsyncMock(side_effect=Exception("Database error")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/reports/backlog-age")
+
+    assert response.status_code == 500
+    assert "Database error" in response.json()["detail"]
@@ -0,0 +1,74 @@
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.crud.exceptions import InvalidSearchQueryError
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_success(mock_session, fake_tickets_list):
+    """
+    Test searching tickets successfully.
+    """
+    with patch(
+        "app.crud.tickets_crud.search_tickets",
+        new=AsyncMock(return_value=fake_tickets_list),
+    ) as mocked_search:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/search", params={"q": "feature*"})
+
+    assert response.status_code == 200
+    assert response.json() == json.loads(fake_tickets_list.model_dump_json())
+    mocked_search.assert_awaited_once_with(
+        db=mock_session, query="feature*", skip=0, limit=10
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_missing_query():
+    """
+    Test searching tickets without the q parameter.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/tickets/search")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_invalid_query():
+    """
+    Test searching tickets with a query without any term.
+    """
+    with patch(
+        "app.crud.tickets_crud.search_tickets",
+        new=AsyncMock(side_effect=InvalidSearchQueryError("The query has no term")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/search", params={"q": "***"})
+
+    assert response.status_code == 400
+    assert "no term" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_server_side_error():
+    """
+    Test server error during tickets search.
+    """
+    with patch(
+        "app.crud.tickets_crud.search_tickets",
+        new=AsyncMock(side_effect=Exception("DB failure")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/search", params={"q": "backend"})
+
+    assert response.status_code == 500
+    assert "Cannot search the tickets" in response.json()["detail"]
@@ -0,0 +1,26 @@
+import pytest
+
+from app.config.settings import get_positive_int
+
+
+def test_positive_int_setting(monkeypatch):
+    """
+    Test reading a batch size from the environment, or its default.
+    """
+    monkeypatch.setenv("TICKETS_TEST_BATCH_SIZE", "20")
+
+    assert get_positive_int("TICKETS_TEST_BATCH_SIZE", "1000") == 20
+    assert get_positive_int("TICKETS_TEST_MISSING_SIZE", "1000") == 1000
+
+
+@pytest.mark.parametrize("value", ["0", "-5"])
+def test_positive_int_setting_below_one(monkeypatch, value):
+    """
+    Test that a batch size below 1 is rejected when the settings load.
+    """
+    monkeypatch.setenv("TICKETS_DELETE_BATCH_SIZE", value)
+
+    with pytest.raises(
+        ValueError, match="TICKETS_DELETE_BATCH_SIZE must be at least 1"
+    ):
+        get_positive_int("TICKETS_DELETE_BATCH_SIZE", "1000")
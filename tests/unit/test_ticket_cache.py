@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.crud.cache import LRUCache, ticket_cache
+from app.main import app
+
+
+def test_cache_evicts_the_least_recently_used():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats().evictions == 1
+
+
+def test_cache_expires_after_ttl():
+    """
+    Test that an entry older than the TTL is a miss.
+    """
+    cache = LRUCache(max_size=10, ttl=5)
+    with patch("app.crud.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1)
+    with patch("app.crud.cache.time.monotonic", return_value=104.0):
+        assert cache.get("a") == 1
+    with patch("app.crud.cache.time.monotonic", return_value=106.0):
+        assert cache.get("a") is None
+
+    assert (cache.hits, cache.misses, cache.stats().size) == (1, 1, 0)
+
+
+def test_cache_ignores_values_read_before_an_invalidation():
+    """
+    Test that a value read before an invalidation (a racing write) isn't cached.
+    """
+    cache = LRUCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.set("a", "old value", generation)
+
+    assert cache.get("a") is None
+
+
+def test_cache_disabled():
+    """
+    Test that a disabled cache never stores anything.
+    """
+    cache = LRUCache(max_size=10, ttl=60, enabled=False)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats().enabled is False
+
+
+@pytest.mark.asyncio
+async def test_get_cache_stats():
+    """
+    Test getting the statistics of the tickets cache.
+    """
+    ticket_cache.set("a", {"title": "Cached"})
+    ticket_cache.get("a")
+    ticket_cache.get("b")
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/tickets/cache/stats")
+
+    assert response.status_code == 200
+    data = response.json()["tickets"]
+    assert (data["size"], data["hits"], data["misses"]) == (1, 1, 1)
+    assert data["hit_ratio"] == 0.5
+    assert response.json()["pages"]["size"] == 0
@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.schemas.tickets import StatsPeriod, TicketStats, TicketStatsBucket
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_stats():
+    """
+    Test getting the tickets statistics per hour, from a date.
+    """
+    stats = TicketStats(
+        total=3,
+        by_status={"open": 2, "closed": 1, "stalled": 0},
+        period=StatsPeriod.hour,
+        buckets=[
+            TicketStatsBucket(start="2024-05-01T10:00:00", created=2, closed=0),
+            TicketStatsBucket(start="2024-05-01T11:00:00", created=1, closed=1),
+        ],
+    )
+    with patch(
+        "app.crud.tickets_crud.get_ticket_stats", new=AsyncMock(return_value=stats)
+    ) as get_ticket_stats:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get(
+                "/tickets/stats",
+                params={"period": "hour", "since": "2024-05-01T10:30:00Z"},
+            )
+
+    assert response.status_code == 200
+    assert response.json()["by_status"] == {"open": 2, "closed": 1, "stalled": 0}
+    assert [bucket["created"] for bucket in response.json()["buckets"]] == [2, 1]
+    kwargs = get_ticket_stats.call_args.kwargs
+    assert kwargs["period"] == StatsPeriod.hour
+    assert kwargs["since"].hour == 10
+    assert kwargs["limit"] == 48
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_stats_invalid_period():
+    """
+    Test getting the tickets statistics with an unknown period.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/tickets/stats", params={"period": "week"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_stats_error():
+    """
+    Test getting the tickets statistics when the database fails.
+    """
+    with patch(
+        "app.crud.tickets_crud.get_ticket_stats",
+        new=AsyncMock(side_effect=Exception("Database error")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/tickets/stats")
+
+    assert response.status_code == 500
+    assert "Database error" in response.json()["detail"]
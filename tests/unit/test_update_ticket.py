@@ -7,6 +7,7 @@ from app.crud.exceptions import (
     AlreadyClosedError,
     InvalidCloseTransitionError,
     NotFoundError,
+    VersionConflictError,
 )
 from app.main import app
 
@@ -212,3 +213,66 @@ async def test_close_ticket_server_error(ticket_id):
 
     assert response.status_code == 500
     assert "Cannot close the ticket" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_update_ticket_if_match(
+    ticket_id, ticket_update_data, fake_updated_ticket
+):
+    """
+    Testing updating a ticket with an If-Match precondition.
+    """
+    with patch(
+        "app.crud.tickets_crud.update_ticket_by_id",
+        new=AsyncMock(return_value=fake_updated_ticket),
+    ) as mocked_update:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.put(
+                f"/tickets/{ticket_id}",
+                json=ticket_update_data,
+                headers={"If-Match": '"3"'},
+            )
+
+    assert response.status_code == 200
+    _, kwargs = mocked_update.call_args
+    assert kwargs["expected_versions"] == [3]
+
+
+@pytest.mark.asyncio
+async def test_update_ticket_version_conflict(ticket_id, ticket_update_data):
+    """
+    Testing updating a ticket modified since the expected version.
+    """
+    with patch(
+        "app.crud.tickets_crud.update_ticket_by_id",
+        new=AsyncMock(side_effect=VersionConflictError("its version is 4.")),
+    ):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.put(
+                f"/tickets/{ticket_id}?version=3", json=ticket_update_data
+            )
+
+    assert response.status_code == 412
+    assert "its version is 4." in response.text
+
+
+@pytest.mark.asyncio
+async def test_close_ticket_version_conflict(ticket_id):
+    """
+    Testing closing a ticket modified since the expected version.
+    """
+    with patch(
+        "app.crud.tickets_crud.close_ticket_by_id",
+        new=AsyncMock(side_effect=VersionConflictError("its version is 2.")),
+    ) as mocked_close:
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.patch(
+                f"/tickets/{ticket_id}/close", headers={"If-Match": '"1"'}
+            )
+
+    assert response.status_code == 412
+    _, kwargs = mocked_close.call_args
+    assert kwargs["expected_versions"] == [1]
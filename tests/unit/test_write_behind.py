@@ -0,0 +1,89 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.crud.exceptions import AlreadyClosedError
+from app.crud.write_behind import WriteBehindQueue
+from app.schemas.tickets import TicketStatus, TicketUpdate, TicketWrite
+
+
+def session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+def make_queue(mock_session, tmp_path) -> WriteBehindQueue:
+    # A long interval, so the writes are only applied by flush()
+    return WriteBehindQueue(
+        session_factory(mock_session),
+        session_factory(mock_session),
+        path=str(tmp_path / "tickets.journal"),
+        interval=60,
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_are_journaled_then_applied(mock_session, tmp_path):
+    queue = make_queue(mock_session, tmp_path)
+    with patch(
+        "app.crud.tickets_crud.apply_ticket_writes", new=AsyncMock()
+    ) as mocked_apply:
+        await queue.start()
+        ticket = queue.create_ticket(title="Queued", description="Later")
+        ticket_id = str(ticket["id"])
+        await queue.update_ticket(ticket_id, TicketUpdate(description="Edited"))
+        await queue.close_ticket(ticket_id)
+
+        journal = (tmp_path / "tickets.journal").read_text().splitlines()
+        queued = queue.get_ticket(ticket["id"])
+        with pytest.raises(AlreadyClosedError):
+            await queue.close_ticket(ticket_id)
+        await queue.flush()
+        await queue.stop()
+
+    assert len(journal) == 3
+    assert queued["description"] == "Edited"
+    assert queued["status"] == TicketStatus.closed
+    (_, writes), _ = mocked_apply.call_args
+    assert [write.operation.value for write in writes] == ["create", "update", "close"]
+    assert queue.get_ticket(ticket["id"]) is None
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_journal_is_replayed_at_startup(mock_session, tmp_path):
+    draining = TicketWrite(
+        seq=1, operation="create", id=uuid4(), title="First", updated_at="2025-01-01"
+    )
+    journal = TicketWrite(
+        seq=2,
+        operation="close",
+        id=draining.id,
+        status="closed",
+        updated_at="2025-01-02",
+    )
+    (tmp_path / "tickets.journal.draining").write_text(
+        draining.model_dump_json() + "\n"
+    )
+    # The last line was torn by a crash
+    (tmp_path / "tickets.journal").write_text(
+        journal.model_dump_json() + '\n{"seq": 3, '
+    )
+
+    queue = make_queue(mock_session, tmp_path)
+    with patch(
+        "app.crud.tickets_crud.apply_ticket_writes", new=AsyncMock()
+    ) as mocked_apply:
+        await queue.start()
+        await queue.stop()
+
+    mocked_apply.assert_awaited_once()
+    (_, writes), _ = mocked_apply.call_args
+    assert writes == [draining, journal]
+    assert queue.replayed == 2
+    assert list(tmp_path.iterdir()) == []